@@ -0,0 +1,105 @@
+"""
+benchmark for the throughput of the legacy codegen (AST to IRnode).
+
+times the codegen phase and the legacy IR optimizer for a set of contracts,
+excluding parsing and semantic analysis, and reports the number of IR nodes
+generated per second. run with:
+
+    python tests/benchmarks/codegen.py [--gas-estimates] [files...]
+"""
+
+import argparse
+import time
+import warnings
+from pathlib import Path
+
+from vyper.codegen.ir_node import IRnode
+from vyper.compiler.phases import CompilerData
+from vyper.compiler.settings import Settings, anchor_settings
+from vyper.ir import optimizer
+
+_ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_FILES = [
+    "examples/auctions/blind_auction.vy",
+    "examples/tokens/ERC20.vy",
+    "examples/tokens/ERC721.vy",
+    "tests/functional/examples/thirdparty/curvefi/CurveStableSwapMetaNG.vy",
+    "tests/functional/examples/thirdparty/yearnfi/VaultV2.vy",
+    "tests/functional/examples/thirdparty/yearnfi/VaultV3.vy",
+]
+
+
+def _count_nodes(ir: IRnode) -> int:
+    ret = 0
+    stack = [ir]
+    while stack:
+        node = stack.pop()
+        ret += 1
+        stack.extend(node.args)
+    return ret
+
+
+def _codegen(compiler_data: CompilerData, gas_estimates: bool):
+    from vyper.codegen import core, module
+    from vyper.ir.compile_ir import reset_symbols
+
+    core.reset_names()
+    reset_symbols()
+
+    t0 = time.perf_counter()
+    with anchor_settings(compiler_data.settings):
+        ir, ir_runtime = module.generate_ir_for_module(compiler_data.global_ctx)
+    t1 = time.perf_counter()
+    ir = optimizer.optimize(ir)
+    ir_runtime = optimizer.optimize(ir_runtime)
+    t2 = time.perf_counter()
+    if gas_estimates:
+        _ = ir.gas, ir_runtime.gas
+        for fn_t in compiler_data.function_signatures.values():
+            _ = fn_t._ir_info.gas_estimate
+    t3 = time.perf_counter()
+
+    return (t1 - t0, t2 - t1, t3 - t2), _count_nodes(ir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=5, help="best of n runs")
+    parser.add_argument(
+        "--gas-estimates", action="store_true", help="also compute the gas estimates"
+    )
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    print(
+        f"{'contract':<28}{'nodes':>9}{'codegen (s)':>13}{'optimizer (s)':>15}"
+        f"{'gas (s)':>10}{'nodes/s':>11}"
+    )
+    for file in args.files:
+        path = Path(file)
+        if not path.is_absolute() and not path.exists():
+            path = _ROOT / path
+        compiler_data = CompilerData(path.read_text(), settings=Settings())
+        # run parsing and semantic analysis outside of the timed region
+        _ = compiler_data.global_ctx
+
+        best = None
+        for _ in range(args.repeat):
+            times, n_nodes = _codegen(compiler_data, args.gas_estimates)
+            if best is None or sum(times) < sum(best):
+                best = times
+        assert best is not None
+
+        codegen_time, optimizer_time, gas_time = best
+        throughput = n_nodes / (codegen_time + optimizer_time)
+        print(
+            f"{path.name:<28}{n_nodes:>9}{codegen_time:>13.4f}{optimizer_time:>15.4f}"
+            f"{gas_time:>10.4f}{throughput:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+benchmark for the venom dominator tree analysis on large generated CFGs.
+
+compares `DominatorTreeAnalysis` against the previous, set-based
+algorithm (iteratively intersecting the full dominator sets of all
+predecessors). run with:
+
+    python tests/benchmarks/dominator_tree.py
+"""
+
+import argparse
+import time
+
+from vyper.utils import OrderedSet
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, IRAnalysesCache
+from vyper.venom.basicblock import IRBasicBlock, IRLabel, IRLiteral
+from vyper.venom.context import IRContext
+from vyper.venom.function import IRFunction
+
+
+def _finish_bb(fn: IRFunction, label: IRLabel, outs: list[IRLabel]):
+    bb = fn.get_basic_block(label.value)
+    if len(outs) == 0:
+        bb.append_instruction("stop")
+    elif len(outs) == 1:
+        bb.append_instruction("jmp", outs[0])
+    else:
+        bb.append_instruction("jnz", IRLiteral(1), outs[0], outs[1])
+
+
+def _make_fn(edges: dict[int, list[int]]) -> IRFunction:
+    ctx = IRContext()
+    labels = {i: IRLabel(f"bb{i}") for i in edges}
+    fn = ctx.create_function("bb0")
+    for i in edges:
+        if i != 0:
+            fn.append_basic_block(IRBasicBlock(labels[i], fn))
+    for i, outs in edges.items():
+        _finish_bb(fn, labels[i], [labels[j] for j in outs])
+    return fn
+
+
+def selector_table(n: int) -> IRFunction:
+    # a linear selector table: a chain of comparisons, each of which
+    # jumps into a function body, and all bodies join at a common exit.
+    edges: dict[int, list[int]] = {}
+    exit_bb = 2 * n + 1
+    for i in range(n):
+        test, body = 2 * i, 2 * i + 1
+        edges[test] = [body, test + 2 if i < n - 1 else exit_bb]
+        edges[body] = [exit_bb]
+    edges[exit_bb] = []
+    return _make_fn(edges)
+
+
+def loop_nest(n: int) -> IRFunction:
+    # a chain of loops (as produced by heavily inlined code), each with an
+    # early exit to the end of the function.
+    edges: dict[int, list[int]] = {}
+    exit_bb = 3 * n
+    for i in range(n):
+        head, body, latch = 3 * i, 3 * i + 1, 3 * i + 2
+        edges[head] = [body, exit_bb]
+        edges[body] = [latch]
+        edges[latch] = [head, latch + 1]
+    edges[exit_bb] = []
+    return _make_fn(edges)
+
+
+def _set_based_dominators(fn: IRFunction):
+    # the previous algorithm, for comparison
+    ac = IRAnalysesCache(fn)
+    cfg = ac.request_analysis(CFGAnalysis)
+    basic_blocks = list(cfg.dfs_post_walk)
+    entry = fn.entry
+    dominators = {bb: OrderedSet(basic_blocks) for bb in basic_blocks}
+    dominators[entry] = OrderedSet([entry])
+    changed = True
+    while changed:
+        changed = False
+        for bb in basic_blocks:
+            if bb == entry:
+                continue
+            preds = cfg.cfg_in(bb)
+            new_dominators = OrderedSet.intersection(*[dominators[pred] for pred in preds])
+            new_dominators.add(bb)
+            if new_dominators != dominators[bb]:
+                dominators[bb] = new_dominators
+                changed = True
+
+    post_order = {bb: idx for idx, bb in enumerate(basic_blocks)}
+    idoms = {entry: entry}
+    for bb in basic_blocks:
+        if bb == entry:
+            continue
+        idoms[bb] = sorted(dominators[bb], key=lambda x: post_order[x])[1]
+    return idoms
+
+
+def _dominator_tree(fn: IRFunction):
+    ac = IRAnalysesCache(fn)
+    return ac.request_analysis(DominatorTreeAnalysis).immediate_dominators
+
+
+def _time(f, fn: IRFunction) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    ret = f(fn)
+    return time.perf_counter() - t0, ret
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument(
+        "--skip-reference", action="store_true", help="only time the dominator tree analysis"
+    )
+    args = parser.parse_args()
+
+    print(f"{'cfg':<16}{'blocks':>8}{'set-based (s)':>16}{'idom-based (s)':>16}{'speedup':>10}")
+    for make_cfg in (selector_table, loop_nest):
+        for size in args.sizes:
+            fn = make_cfg(size)
+            n_blocks = fn.num_basic_blocks
+
+            new_time, new_idoms = _time(_dominator_tree, fn)
+            if args.skip_reference:
+                print(f"{make_cfg.__name__:<16}{n_blocks:>8}{'-':>16}{new_time:>16.4f}{'-':>10}")
+                continue
+
+            ref_time, ref_idoms = _time(_set_based_dominators, fn)
+            assert new_idoms == ref_idoms
+            speedup = ref_time / new_time
+            print(
+                f"{make_cfg.__name__:<16}{n_blocks:>8}{ref_time:>16.4f}"
+                f"{new_time:>16.4f}{speedup:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+benchmark for the time taken by `import vyper`.
+
+imports vyper in fresh interpreters and reports the best time, along with
+the number of modules imported. run with:
+
+    python tests/benchmarks/import_time.py
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import vyper
+t1 = time.perf_counter()
+print(json.dumps({"time": t1 - t0, "modules": len(sys.modules)}))
+"""
+
+
+def _import_vyper() -> dict:
+    # fresh interpreter, since the modules are cached in this one
+    out = subprocess.check_output([sys.executable, "-c", _SCRIPT])
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="best of n runs")
+    args = parser.parse_args()
+
+    results = [_import_vyper() for _ in range(args.repeat)]
+    best = min(result["time"] for result in results)
+    print(f"import vyper: {best:.4f}s ({results[0]['modules']} modules)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+benchmark for the dense selector table (`-O codesize`) generation.
+
+measures the quality of the generated jumptables (number of buckets) and
+the time it takes to generate them, and compares the magic search against
+the previous algorithm (computing the image of the bucket for one magic
+at a time). run with:
+
+    python tests/benchmarks/jumptable.py
+"""
+
+import argparse
+import random
+import time
+
+from vyper.codegen import jumptable_utils
+from vyper.codegen.jumptable_utils import _find_dense_solution_cached, _image_of
+
+
+def _reference_find_magic_for(xs):
+    # the previous algorithm, for comparison
+    for m in range(2**16):
+        test = _image_of(xs, m)
+        if len(test) == len(set(test)):
+            return m
+
+    raise jumptable_utils._FindMagicFailure(f"Could not find hash for {xs}")
+
+
+def _random_signatures(n_methods: int, rng: random.Random) -> list[str]:
+    seed = rng.randint(0, 2**64 - 1)
+    return [f"foo{i + seed}()" for i in range(n_methods)]
+
+
+def _time(f, *args):
+    t0 = time.perf_counter()
+    ret = f(*args)
+    return time.perf_counter() - t0, ret
+
+
+def _generate(sigs: list[str]):
+    # bypass the in-memory cache of solutions
+    _find_dense_solution_cached.cache_clear()
+    return jumptable_utils.generate_dense_jumptable_info(sigs)
+
+
+def _generate_reference(sigs: list[str]):
+    find_magic_for = jumptable_utils.find_magic_for
+    jumptable_utils.find_magic_for = _reference_find_magic_for
+    try:
+        return _generate(sigs)
+    finally:
+        jumptable_utils.find_magic_for = find_magic_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    # "large" contracts in prod hit about ~50 methods, test with
+    # double the limit
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 50, 80, 100])
+    parser.add_argument("--samples", type=int, default=5, help="contracts per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-reference", action="store_true", help="only time the current magic search"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'methods':>8}{'buckets':>10}{'reference (s)':>16}{'batched (s)':>14}"
+        f"{'speedup':>10}{'cached (s)':>13}"
+    )
+    for size in args.sizes:
+        n_buckets = []
+        ref_time = new_time = cached_time = 0.0
+        for _ in range(args.samples):
+            sigs = _random_signatures(size, rng)
+
+            t, (n, solution) = _time(_generate, sigs)
+            new_time += t
+            n_buckets.append(n)
+
+            # a recompilation hits the in-memory cache
+            t, cached = _time(jumptable_utils.generate_dense_jumptable_info, sigs)
+            cached_time += t
+            assert cached == (n, solution)
+
+            if not args.skip_reference:
+                t, ref = _time(_generate_reference, sigs)
+                ref_time += t
+                assert ref == (n, solution)
+
+        avg_buckets = sum(n_buckets) / len(n_buckets)
+        new_time /= args.samples
+        cached_time /= args.samples
+        if args.skip_reference:
+            ref_str, speedup_str = "-", "-"
+        else:
+            ref_time /= args.samples
+            ref_str, speedup_str = f"{ref_time:.4f}", f"{ref_time / new_time:.1f}x"
+        print(
+            f"{size:>8}{avg_buckets:>10.1f}{ref_str:>16}{new_time:>14.4f}"
+            f"{speedup_str:>10}{cached_time:>13.6f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+benchmark for the gas savings of the venom loop-invariant code motion.
+
+deploys the ERC1155 and ballot examples and a contract with the targeted
+patterns (compiled with the venom pipeline and `-O gas`, the only
+optimization level which runs the pass), and reports the gas used by
+calls which run loops, with and without the loop-invariant code motion.
+run from the root of the repository with:
+
+    python -m tests.benchmarks.licm
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+from random import Random
+
+from eth_keys.datatypes import PrivateKey
+
+from tests.evm_backends.revm_env import RevmEnv
+from vyper.compiler import compile_code
+from vyper.compiler.settings import OptimizationLevel, Settings
+from vyper.venom.passes.loop_invariant_code_motion import LICM
+
+_ROOT = Path(__file__).parent.parent.parent
+
+
+def _deploy(env, source: str, settings: Settings, *args):
+    out = compile_code(source, output_formats=["abi", "bytecode"], settings=settings)
+    bytecode = bytes.fromhex(out["bytecode"].removeprefix("0x"))
+    return env.deploy(out["abi"], bytecode, 0, *args)
+
+
+def _erc1155_calls(env, source, settings):
+    token = _deploy(env, source, settings, "Token", "TKN", "https://example.com/", "")
+    owner, alice, bob = env.accounts[:3]
+    ids, amounts = list(range(1, 11)), [10] * 10
+    return [
+        ("mintBatch", lambda: token.mintBatch(alice, ids, amounts, sender=owner)),
+        (
+            "safeBatchTransferFrom",
+            lambda: token.safeBatchTransferFrom(
+                alice, bob, ids, [1] * 10, b"\x00" * 32, sender=alice
+            ),
+        ),
+        ("balanceOfBatch", lambda: token.balanceOfBatch([alice] * 10, ids)),
+        ("burnBatch", lambda: token.burnBatch(ids, [1] * 10, sender=alice)),
+    ]
+
+
+def _ballot_calls(env, source, settings):
+    ballot = _deploy(env, source, settings, [b"a" * 32, b"b" * 32])
+    chairperson, *voters = env.accounts[:6]
+    for voter in voters:
+        ballot.giveRightToVote(voter, sender=chairperson)
+
+    return [
+        # a chain of delegations, which `_forwardWeight` walks in a loop
+        ("delegate", lambda: ballot.delegate(voters[1], sender=voters[0])),
+        ("delegate (chain)", lambda: ballot.delegate(voters[0], sender=voters[2])),
+        ("vote", lambda: ballot.vote(1, sender=voters[1])),
+        ("winningProposal", lambda: ballot.winningProposal()),
+        ("winnerName", lambda: ballot.winnerName()),
+    ]
+
+
+# the patterns targeted by the loop-invariant code motion: pointer
+# arithmetic on an array which the loop does not change, the length of a
+# DynArray which the loop does not modify, and storage reads which the
+# loop does not clobber
+_PATTERNS = """
+scale: uint256
+offsets: HashMap[uint256, uint256]
+total: uint256
+
+@external
+def pointers(xs: uint256[20], ys: uint256[20]) -> uint256:
+    s: uint256 = 0
+    for i: uint256 in range(20):
+        s += xs[i] * ys[i]
+    return s
+
+@external
+def length(xs: DynArray[uint256, 20]) -> uint256:
+    s: uint256 = 0
+    i: uint256 = 0
+    for x: uint256 in xs:
+        s += x * len(xs) + i
+        i += 1
+    return s
+
+@external
+def storage(xs: DynArray[uint256, 20]) -> uint256:
+    s: uint256 = 0
+    for x: uint256 in xs:
+        s += x * self.scale + self.offsets[self.scale]
+    return s
+
+@external
+def nested(xs: DynArray[DynArray[uint256, 5], 5]) -> uint256:
+    s: uint256 = 0
+    for row: DynArray[uint256, 5] in xs:
+        for x: uint256 in row:
+            s += x * self.scale
+    return s
+
+# the storage read is only executed in a branch which is rarely taken (or
+# not at all, if the loop is empty), so it must stay in the loop
+@external
+def rare(xs: DynArray[uint256, 20]) -> uint256:
+    s: uint256 = 0
+    for x: uint256 in xs:
+        if x == 12345:
+            s += self.scale
+    return s
+"""
+
+
+def _patterns_calls(env, source, settings):
+    c = _deploy(env, source, settings)
+    xs = list(range(20))
+    return [
+        ("pointers", lambda: c.pointers(xs, xs)),
+        ("length", lambda: c.length(xs)),
+        ("storage", lambda: c.storage(xs)),
+        ("nested", lambda: c.nested([list(range(5))] * 5)),
+        ("storage (empty)", lambda: c.storage([])),
+        ("rare", lambda: c.rare(xs)),
+        ("rare (empty)", lambda: c.rare([])),
+    ]
+
+
+def _contracts():
+    for file, make_calls in (
+        ("examples/tokens/ERC1155ownable.vy", _erc1155_calls),
+        ("examples/voting/ballot.vy", _ballot_calls),
+    ):
+        path = _ROOT / file
+        yield path.name, path.read_text(), make_calls
+    yield "patterns", _PATTERNS, _patterns_calls
+
+
+def _gas_used(make_calls, source: str, settings: Settings) -> list[tuple[str, int]]:
+    random = Random(b"vyper")
+    account_keys = [PrivateKey(random.randbytes(32)) for _ in range(6)]
+    env = RevmEnv(
+        gas_limit=10**7,
+        account_keys=account_keys,
+        tracing=False,
+        block_number=1,
+        evm_version=settings.evm_version,
+    )
+
+    ret = []
+    for name, call in make_calls(env, source, settings):
+        call()
+        ret.append((name, env.last_result.gas_used))
+    return ret
+
+
+def _gas_used_without_licm(make_calls, source: str, settings: Settings):
+    guard_loops, process_loop = LICM._guard_loops, LICM._process_loop
+    LICM._guard_loops = lambda self: None  # type: ignore
+    LICM._process_loop = lambda self, loop, preheader: None  # type: ignore
+    try:
+        return _gas_used(make_calls, source, settings)
+    finally:
+        LICM._guard_loops = guard_loops  # type: ignore
+        LICM._process_loop = process_loop  # type: ignore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--evm-version", default="cancun")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    settings = Settings(
+        experimental_codegen=True, optimize=OptimizationLevel.GAS, evm_version=args.evm_version
+    )
+
+    print(f"{'contract':<22}{'call':<24}{'without':>10}{'with':>10}{'saved':>8}")
+    for contract_name, source, make_calls in _contracts():
+        before = _gas_used_without_licm(make_calls, source, settings)
+        after = _gas_used(make_calls, source, settings)
+        for (name, gas_before), (_, gas_after) in zip(before, after):
+            print(
+                f"{contract_name:<22}{name:<24}{gas_before:>10}{gas_after:>10}"
+                f"{gas_before - gas_after:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
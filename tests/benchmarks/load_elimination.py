@@ -0,0 +1,166 @@
+"""
+benchmark for the gas savings of the venom load elimination.
+
+deploys the ERC20 and ERC1155 examples and a contract with the targeted
+patterns (compiled with the venom pipeline), and reports the gas used by
+a few typical calls, with the load elimination as it is and with the load
+elimination restricted to single basic blocks (its previous behavior).
+run from the root of the repository with:
+
+    python -m tests.benchmarks.load_elimination
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+from random import Random
+
+from eth_keys.datatypes import PrivateKey
+
+from tests.evm_backends.revm_env import RevmEnv
+from vyper.compiler import compile_code
+from vyper.compiler.settings import OptimizationLevel, Settings
+from vyper.venom.passes.load_elimination import LoadElimination
+
+_ROOT = Path(__file__).parent.parent.parent
+
+
+def _deploy(env, source: str, settings: Settings, *args):
+    out = compile_code(source, output_formats=["abi", "bytecode"], settings=settings)
+    bytecode = bytes.fromhex(out["bytecode"].removeprefix("0x"))
+    return env.deploy(out["abi"], bytecode, 0, *args)
+
+
+def _erc20_calls(env, source, settings):
+    token = _deploy(env, source, settings, "Token", "TKN", 18, 1000)
+    deployer, alice, bob = env.accounts[:3]
+    return [
+        ("transfer", lambda: token.transfer(alice, 100, sender=deployer)),
+        ("approve", lambda: token.approve(bob, 50, sender=alice)),
+        ("transferFrom", lambda: token.transferFrom(alice, bob, 20, sender=bob)),
+        ("mint", lambda: token.mint(bob, 10, sender=deployer)),
+        ("burn", lambda: token.burn(5, sender=bob)),
+    ]
+
+
+def _erc1155_calls(env, source, settings):
+    token = _deploy(env, source, settings, "Token", "TKN", "https://example.com/", "")
+    owner, alice, bob = env.accounts[:3]
+    return [
+        ("mint", lambda: token.mint(alice, 1, 10, sender=owner)),
+        ("mintBatch", lambda: token.mintBatch(alice, [2, 3, 4], [10, 10, 10], sender=owner)),
+        ("setApprovalForAll", lambda: token.setApprovalForAll(alice, bob, True, sender=alice)),
+        (
+            "safeTransferFrom",
+            lambda: token.safeTransferFrom(alice, bob, 1, 5, b"\x00" * 32, sender=bob),
+        ),
+        (
+            "safeBatchTransferFrom",
+            lambda: token.safeBatchTransferFrom(
+                alice, bob, [2, 3, 4], [1, 1, 1], b"\x00" * 32, sender=alice
+            ),
+        ),
+        ("balanceOfBatch", lambda: token.balanceOfBatch([alice, bob, bob], [2, 3, 4])),
+        ("burnBatch", lambda: token.burnBatch([2, 3], [1, 1], sender=alice)),
+    ]
+
+
+# the patterns targeted by the cross-block load elimination: reading a
+# slot again after a branch which writes to another slot, and reading a
+# slot inside a loop which does not write to it
+_PATTERNS = """
+counter: uint256
+total: uint256
+owner: address
+
+@external
+def after_branch(x: uint256) -> uint256:
+    assert msg.sender == self.owner or x > 1
+    if x > 10:
+        self.total += 1
+    return self.counter + self.total + convert(self.owner, uint256)
+
+@external
+def in_loop(xs: DynArray[uint256, 10]) -> uint256:
+    s: uint256 = self.counter
+    for x: uint256 in xs:
+        s += x * self.counter
+    return s
+"""
+
+
+def _patterns_calls(env, source, settings):
+    c = _deploy(env, source, settings)
+    return [
+        ("after_branch", lambda: c.after_branch(20)),
+        ("in_loop", lambda: c.in_loop([1, 2, 3, 4, 5])),
+    ]
+
+
+def _contracts():
+    for file, make_calls in (
+        ("examples/tokens/ERC20.vy", _erc20_calls),
+        ("examples/tokens/ERC1155ownable.vy", _erc1155_calls),
+    ):
+        path = _ROOT / file
+        yield path.name, path.read_text(), make_calls
+    yield "patterns", _PATTERNS, _patterns_calls
+
+
+def _gas_used(make_calls, source: str, settings: Settings) -> list[tuple[str, int]]:
+    random = Random(b"vyper")
+    account_keys = [PrivateKey(random.randbytes(32)) for _ in range(3)]
+    env = RevmEnv(
+        gas_limit=10**7,
+        account_keys=account_keys,
+        tracing=False,
+        block_number=1,
+        evm_version=settings.evm_version,
+    )
+
+    ret = []
+    for name, call in make_calls(env, source, settings):
+        call()
+        ret.append((name, env.last_result.gas_used))
+    return ret
+
+
+def _gas_used_block_local(make_calls, source: str, settings: Settings):
+    # disable the reuse of values across basic blocks
+    get_dominating_value = LoadElimination._get_dominating_value
+    LoadElimination._get_dominating_value = lambda self, inst, ptr: None  # type: ignore
+    try:
+        return _gas_used(make_calls, source, settings)
+    finally:
+        LoadElimination._get_dominating_value = get_dominating_value  # type: ignore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--evm-version", default="cancun")
+    parser.add_argument(
+        "--optimize", default="gas", choices=["gas", "codesize"], help="optimization level"
+    )
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    settings = Settings(
+        experimental_codegen=True,
+        optimize=OptimizationLevel.from_string(args.optimize),
+        evm_version=args.evm_version,
+    )
+
+    print(f"{'contract':<22}{'call':<24}{'block-local':>13}{'dominators':>12}{'saved':>8}")
+    for contract_name, source, make_calls in _contracts():
+        before = _gas_used_block_local(make_calls, source, settings)
+        after = _gas_used(make_calls, source, settings)
+        for (name, gas_before), (_, gas_after) in zip(before, after):
+            print(
+                f"{contract_name:<22}{name:<24}{gas_before:>13}{gas_after:>12}"
+                f"{gas_before - gas_after:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
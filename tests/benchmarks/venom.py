@@ -0,0 +1,106 @@
+"""
+benchmark for the venom pipeline.
+
+times the conversion of the legacy IR to venom, the venom passes and the
+generation of the assembly for a set of contracts, and measures the memory
+used by the venom IR and the peak memory of the pipeline. run with:
+
+    python tests/benchmarks/venom.py [files...]
+"""
+
+import argparse
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+from vyper.compiler.phases import CompilerData
+from vyper.compiler.settings import Settings
+from vyper.venom import generate_assembly_experimental, run_passes_on
+from vyper.venom.ir_node_to_venom import ir_node_to_venom
+
+_ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_FILES = [
+    "examples/tokens/ERC20.vy",
+    "examples/tokens/ERC721.vy",
+    "tests/functional/examples/thirdparty/curvefi/CurveStableSwapMetaNG.vy",
+    "tests/functional/examples/thirdparty/yearnfi/VaultV2.vy",
+    "tests/functional/examples/thirdparty/yearnfi/VaultV3.vy",
+]
+
+
+def _pipeline(compiler_data: CompilerData):
+    deploy_ir, runtime_ir = compiler_data._ir_output
+    optimize = compiler_data.settings.optimize
+
+    t0 = time.perf_counter()
+    deploy_ctx = ir_node_to_venom(deploy_ir)
+    runtime_ctx = ir_node_to_venom(runtime_ir)
+    t1 = time.perf_counter()
+    run_passes_on(deploy_ctx, optimize)
+    run_passes_on(runtime_ctx, optimize)
+    t2 = time.perf_counter()
+    generate_assembly_experimental(runtime_ctx, deploy_code=deploy_ctx, optimize=optimize)
+    t3 = time.perf_counter()
+
+    return t1 - t0, t2 - t1, t3 - t2
+
+
+def _memory(compiler_data: CompilerData) -> tuple[float, float]:
+    # (size of the venom IR, peak memory of the pipeline) in MB
+    deploy_ir, runtime_ir = compiler_data._ir_output
+    optimize = compiler_data.settings.optimize
+
+    tracemalloc.start()
+    try:
+        deploy_ctx = ir_node_to_venom(deploy_ir)
+        runtime_ctx = ir_node_to_venom(runtime_ir)
+        ir_size, _ = tracemalloc.get_traced_memory()
+        run_passes_on(deploy_ctx, optimize)
+        run_passes_on(runtime_ctx, optimize)
+        generate_assembly_experimental(runtime_ctx, deploy_code=deploy_ctx, optimize=optimize)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return ir_size / 1e6, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=5, help="best of n runs")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    print(
+        f"{'contract':<28}{'to venom (s)':>14}{'passes (s)':>12}{'assembly (s)':>14}"
+        f"{'total (s)':>11}{'IR (MB)':>9}{'peak (MB)':>11}"
+    )
+    for file in args.files:
+        path = Path(file)
+        if not path.is_absolute() and not path.exists():
+            path = _ROOT / path
+        settings = Settings(experimental_codegen=True)
+        compiler_data = CompilerData(path.read_text(), settings=settings)
+        # run the frontend and the legacy codegen outside of the timed region
+        _ = compiler_data._ir_output
+
+        best = None
+        for _ in range(args.repeat):
+            times = _pipeline(compiler_data)
+            if best is None or sum(times) < sum(best):
+                best = times
+        assert best is not None
+
+        ir_size, peak = _memory(compiler_data)
+        print(
+            f"{path.name:<28}{best[0]:>14.4f}{best[1]:>12.4f}{best[2]:>14.4f}"
+            f"{sum(best):>11.4f}{ir_size:>9.2f}{peak:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
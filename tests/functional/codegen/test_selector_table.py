@@ -4,6 +4,9 @@ from hypothesis import given, settings
 
 import vyper.utils as utils
 from vyper.codegen.jumptable_utils import (
+    _FindMagicFailure,
+    _image_of,
+    find_magic_for,
     generate_dense_jumptable_info,
     generate_sparse_jumptable_buckets,
 )
@@ -478,6 +481,33 @@ def test_dense_jumptable_bucket_size(n_methods, seed):
     assert n_buckets / n < 0.4 or n < 10
 
 
+def _reference_find_magic_for(xs):
+    for m in range(2**16):
+        test = _image_of(xs, m)
+        if len(test) == len(set(test)):
+            return m
+    return None
+
+
+@given(xs=st.lists(st.integers(min_value=0, max_value=2**32 - 1), max_size=8, unique=True))
+@pytest.mark.fuzzing
+@settings(max_examples=50)
+def test_find_magic_for(xs):
+    expected = _reference_find_magic_for(xs)
+    if expected is None:
+        with pytest.raises(_FindMagicFailure):
+            find_magic_for(xs)
+    else:
+        assert find_magic_for(xs) == expected
+
+
+def test_find_magic_for_failure():
+    # x * magic is always below 2**BITS_MAGIC, so there is no magic
+    # which separates these two
+    with pytest.raises(_FindMagicFailure):
+        find_magic_for([0, 5])
+
+
 @st.composite
 def generate_methods(draw, max_calldata_bytes):
     max_default_args = draw(st.integers(min_value=0, max_value=4))
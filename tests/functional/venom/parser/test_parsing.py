@@ -366,3 +366,28 @@ def test_phis():
 
     parsed_fn = next(iter(ctx.functions.values()))
     assert_bb_eq(parsed_fn.get_basic_block(expect_bb.label.name), expect_bb)
+
+
+def test_negative_hex_literal():
+    source = """
+    function main {
+        main:
+            mstore 0, -0x8000000000000000000000000000000000000000000000000000000000000000
+            mstore 32, -0x400
+            stop
+    }
+    """
+
+    parsed_ctx = parse_venom(source)
+
+    expected_ctx = IRContext()
+    expected_ctx.add_function(main_fn := IRFunction(IRLabel("main")))
+    main_bb = main_fn.get_basic_block("main")
+    main_bb.append_instruction("mstore", IRLiteral(-(2**255)), IRLiteral(0))
+    main_bb.append_instruction("mstore", IRLiteral(-1024), IRLiteral(32))
+    main_bb.append_instruction("stop")
+
+    assert_ctx_eq(parsed_ctx, expected_ctx)
+
+    # round-trips through the text format
+    assert_ctx_eq(parse_venom(repr(parsed_ctx)), expected_ctx)
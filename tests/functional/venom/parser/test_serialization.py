@@ -0,0 +1,87 @@
+import pickle
+import zlib
+
+import pytest
+
+from tests.venom_utils import assert_ctx_eq
+from vyper.compiler import compile_code
+from vyper.venom.parser import parse_venom
+from vyper.venom.serialization import dump_venom, is_serialized_venom, load_venom
+
+SOURCE = """
+function main {
+    main:
+        %1 = callvalue
+        %2 = -0x8000000000000000000000000000000000000000000000000000000000000000
+        jnz %1, @fine, @"has callvalue"
+    fine:
+        %3 = calldataload 4
+        %4 = add %3, %2
+        %5 = invoke @helper, %4
+        return %3, %5
+    "has callvalue":
+        revert 0, 0
+}
+
+function helper {
+    helper:
+        %1 = param
+        %2 = param
+        ret %2
+}
+
+data readonly {
+    dbsection selector_buckets:
+        db @fine
+        db x"cafe"
+}
+"""
+
+
+def test_round_trip():
+    ctx = parse_venom(SOURCE)
+    data = dump_venom(ctx)
+    assert is_serialized_venom(data)
+
+    new_ctx = load_venom(data)
+    assert_ctx_eq(ctx, new_ctx)
+    assert repr(new_ctx) == repr(ctx)
+
+    assert new_ctx.entry_function.name.value == "main"
+    assert new_ctx.last_label == ctx.last_label
+    for fn, new_fn in zip(ctx.get_functions(), new_ctx.get_functions()):
+        assert new_fn.last_variable == fn.last_variable
+        for bb in new_fn.get_basic_blocks():
+            assert bb.parent is new_fn
+            assert all(inst.parent is bb for inst in bb.instructions)
+
+
+def test_round_trip_compiled():
+    src = """
+@external
+def foo(x: uint256) -> uint256:
+    return x * 2 - 1
+    """
+    ctx = compile_code(src, output_formats=["bb_runtime"])["bb_runtime"]
+    assert_ctx_eq(ctx, load_venom(dump_venom(ctx)))
+
+
+def test_invalid_data():
+    with pytest.raises(ValueError):
+        load_venom(SOURCE.encode())
+
+    data = dump_venom(parse_venom(SOURCE))
+    with pytest.raises(ValueError):
+        load_venom(data[:6] + b"\xff" + data[7:])
+
+
+def test_no_code_execution():
+    # a pickle which calls a function when loaded
+    class Evil:
+        def __reduce__(self):
+            return (print, ("pwned",))
+
+    data = dump_venom(parse_venom(SOURCE))
+    data = data[:7] + zlib.compress(pickle.dumps(Evil()))
+    with pytest.raises(pickle.UnpicklingError):
+        load_venom(data)
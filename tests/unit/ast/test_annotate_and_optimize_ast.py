@@ -1,5 +1,7 @@
 import ast as python_ast
+import pickle
 
+from vyper.ast import parse_to_ast
 from vyper.ast.parse import PreParser, annotate_python_ast
 
 
@@ -65,3 +67,22 @@ def test_it_rewrites_unary_subtractions():
 
     assert isinstance(return_stmt.value, python_ast.Constant)
     assert return_stmt.value.value == -1
+
+
+def test_node_source_code():
+    vyper_module = parse_to_ast(TEST_CONTRACT_SOURCE_CODE)
+    return_stmt = vyper_module.body[2].body[0]
+
+    assert return_stmt.node_source_code == "return -(-(-1))"
+    # the rewritten literal covers the whole unary subtraction
+    assert return_stmt.value.node_source_code == "-(-(-1))"
+    assert vyper_module.body[0].node_source_code == "struct S:\n    a: bool\n    b: int128"
+
+    # the source code is sliced on demand, nodes only keep offsets into
+    # the module's source code
+    for node in vyper_module.get_descendants():
+        assert node.full_source_code is vyper_module.full_source_code
+
+    vyper_module = pickle.loads(pickle.dumps(vyper_module))
+    return_stmt = vyper_module.body[2].body[0]
+    assert return_stmt.node_source_code == "return -(-(-1))"
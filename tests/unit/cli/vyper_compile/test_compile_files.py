@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pytest
 
+from vyper.cli import vyper_compile
 from vyper.cli.compile_archive import compiler_data_from_zip
 from vyper.cli.vyper_compile import compile_files
 from vyper.cli.vyper_json import compile_from_input_dict, compile_json
@@ -15,8 +16,9 @@ from vyper.compiler.input_bundle import FilesystemInputBundle
 from vyper.compiler.output_bundle import OutputBundle
 from vyper.compiler.phases import CompilerData
 from vyper.compiler.settings import Settings
-from vyper.exceptions import TypeMismatch
+from vyper.exceptions import ModuleNotFound, TypeMismatch, UndeclaredDefinition
 from vyper.utils import sha256sum
+from vyper.warnings import VyperWarning
 
 TAMPERED_INTEGRITY_SUM = sha256sum("tampered integrity sum")
 
@@ -679,3 +681,109 @@ def baz() -> uint8:
             continue
         with pytest.raises(ValueError):
             compile_files([file], [f])
+
+
+def test_compile_files_parallel(make_file, chdir_tmp_path):
+    lib1 = """
+@internal
+def foo() -> uint256:
+    return block.number + 1
+    """
+    lib2 = """
+x: uint256
+
+@internal
+def bar() -> uint256:
+    return self.x
+    """
+    contract1 = """
+import lib1
+
+@external
+def foo() -> uint256:
+    return lib1.foo()
+    """
+    contract2 = """
+import lib2
+import lib1
+
+initializes: lib2
+
+@external
+def bar() -> uint256:
+    return lib2.bar() + lib1.foo()
+    """
+    make_file("lib1.vy", lib1)
+    make_file("lib2.vy", lib2)
+    input_files = []
+    for i in range(4):
+        input_files.append(make_file(f"contract{i}.vy", contract2 if i % 2 else contract1))
+
+    formats = ["combined_json"]
+    serial = compile_files(input_files, formats)
+    parallel = compile_files(input_files, formats, jobs=2)
+
+    # source ids (and therefore source maps) must not depend on the job count
+    assert parallel == serial
+    assert list(parallel.keys()) == list(serial.keys())
+
+
+def test_compile_files_parallel_error(make_file, chdir_tmp_path):
+    good = make_file("good.vy", "x: uint256")
+    bad = make_file("bad.vy", "x: uint256 = 1")
+    bad2 = make_file("bad2.vy", "@external\ndef foo() -> uint256:\n    return y")
+
+    with pytest.raises(UndeclaredDefinition) as e1:
+        compile_files([good, bad2, bad], ["bytecode"])
+    with pytest.raises(UndeclaredDefinition) as e2:
+        compile_files([good, bad2, bad], ["bytecode"], jobs=3)
+
+    # errors are reported for the first failing file, like in serial mode
+    assert str(e1.value) == str(e2.value)
+
+
+def test_compile_files_parallel_exc_handler(make_file, chdir_tmp_path, monkeypatch):
+    good = make_file("good.vy", "x: uint256")
+    bad = make_file("bad.vy", "x: uint256 = 1")
+    good2 = make_file("good2.vy", "y: uint256")
+
+    # an exception handler which does not raise
+    errors = []
+    monkeypatch.setattr(vyper_compile, "exc_handler", lambda path, e: errors.append(path))
+
+    ret = compile_files([good, bad, good2], ["bytecode"], jobs=3)
+
+    assert errors == [bad]
+    assert list(ret.keys()) == [good, good2]
+
+
+def test_compile_files_parallel_import_error(make_file, chdir_tmp_path):
+    good = make_file("good.vy", "x: uint256")
+    bad = make_file("bad.vy", "import missing")
+    bad2 = make_file("bad2.vy", "x: uint256 = 1")
+
+    with pytest.raises(ModuleNotFound) as e1:
+        compile_files([good, bad, bad2], ["bytecode"])
+    with pytest.raises(ModuleNotFound) as e2:
+        compile_files([good, bad, bad2], ["bytecode"], jobs=3)
+
+    # the import error is not swallowed, and it is reported for the same
+    # file as in serial mode
+    assert str(e1.value) == str(e2.value)
+
+
+def test_compile_files_parallel_warnings(make_file, chdir_tmp_path):
+    # code which emits a warning
+    code = "x: public(uint256[2**64])"
+    input_files = [make_file(f"foo{i}.vy", code) for i in range(3)]
+
+    with warnings.catch_warnings(record=True) as w1:
+        compile_files(input_files, ["bytecode"])
+    with warnings.catch_warnings(record=True) as w2:
+        compile_files(input_files, ["bytecode"], jobs=2)
+
+    assert len(w2) == len(w1) > 0
+    assert all(x.message.message == "Use of large arrays can be unsafe!" for x in w2)
+
+    with pytest.raises(VyperWarning):
+        compile_files(input_files, ["bytecode"], jobs=2, warnings_control="error")
@@ -1,3 +1,4 @@
+import json
 import os
 import warnings
 
@@ -59,3 +60,43 @@ x: public(uint256[2**64])
     assert len(w) == 0
 
     warnings.resetwarnings()
+
+
+@pytest.mark.parametrize("fmt", ["json", "chrome"])
+def test_profile_phases(make_file, tmp_path, fmt):
+    code = """
+@external
+def foo() -> bool:
+    return True
+"""
+    path = make_file("foo.vy", code)
+    profile_path = tmp_path / "profile.json"
+
+    _parse_args([str(path), "--profile-phases", str(profile_path), "--profile-format", fmt])
+
+    with profile_path.open() as f:
+        report = json.load(f)
+
+    if fmt == "json":
+        compile_phase = report["phases"][0]
+        assert compile_phase["name"] == "compile"
+        assert compile_phase["args"] == {"path": str(path)}
+        assert "parse" in report["totals"]
+    else:
+        names = [event["name"] for event in report["traceEvents"]]
+        assert names[0] == "compile"
+        assert "parse" in names
+
+
+@pytest.mark.parametrize("jobs", ["0", "2"])
+def test_profile_phases_with_jobs(make_file, tmp_path, jobs):
+    path = make_file("foo.vy", "x: uint256")
+    profile_path = tmp_path / "profile.json"
+
+    with pytest.raises(ValueError, match="--profile-phases"):
+        _parse_args([str(path), "--profile-phases", str(profile_path), "-j", jobs])
+    assert not profile_path.exists()
+
+    # a single job is the same as a serial build
+    _parse_args([str(path), "--profile-phases", str(profile_path), "-j", "1"])
+    assert profile_path.exists()
@@ -438,3 +438,42 @@ def test_compile_json_with_both_venom_aliases():
     with pytest.raises(JSONError) as e:
         get_settings(code)
     assert e.value.args[0] == "both experimentalCodegen and venomExperimental cannot be set"
+
+
+def test_compile_json_parallel(input_json):
+    serial = compile_json(input_json)
+
+    input_json["settings"]["jobs"] = 2
+    assert compile_json(input_json) == serial
+
+    # the cli flag overrides the setting
+    assert compile_json(input_json, jobs=1) == serial
+
+
+def test_compile_json_parallel_errors(input_json):
+    input_json["settings"]["jobs"] = 2
+    input_json["sources"]["badcode.vy"] = {"content": BAD_COMPILER_CODE}
+    with pytest.raises(TypeMismatch):
+        compile_json(input_json)
+
+    result = compile_json(input_json, exc_handler_to_dict)
+    del input_json["settings"]["jobs"]
+    assert result == compile_json(input_json, exc_handler_to_dict)
+
+
+def test_compile_json_parallel_warnings(input_json):
+    input_json["sources"]["warn.vy"] = {"content": "x: public(uint256[2**64])"}
+
+    serial = compile_json(input_json)
+    input_json["settings"]["jobs"] = 2
+    parallel = compile_json(input_json)
+
+    assert len(serial["errors"]) == 1
+    assert json.dumps(parallel, default=str) == json.dumps(serial, default=str)
+
+
+@pytest.mark.parametrize("jobs", [-1, "2", True])
+def test_compile_json_invalid_jobs(input_json, jobs):
+    input_json["settings"]["jobs"] = jobs
+    with pytest.raises(JSONError):
+        compile_json(input_json)
@@ -0,0 +1,168 @@
+import io
+import json
+import socket
+import threading
+
+import pytest
+
+from vyper.ast import ast_to_dict
+from vyper.ast.parse import ParseCache, parse_to_ast, use_parse_cache
+from vyper.cli.vyper_json import compile_json
+from vyper.cli.vyper_server import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    CompilerServer,
+)
+from vyper.compiler.phases import CompilerData
+
+LIBRARY_CODE = """
+@internal
+def foo() -> uint256:
+    return 1
+"""
+
+CONTRACT_CODE = """
+import library
+
+@external
+def bar() -> uint256:
+    return library.foo()
+"""
+
+INPUT_JSON = {
+    "language": "Vyper",
+    "sources": {"contract.vy": {"content": CONTRACT_CODE}, "library.vy": {"content": LIBRARY_CODE}},
+    "settings": {"outputSelection": {"contract.vy": ["abi", "evm.bytecode"]}},
+}
+
+
+def _request(method, params=None, request_id=1):
+    ret = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        ret["params"] = params
+    return ret
+
+
+def _roundtrip(server, request):
+    return json.loads(server.handle_line(json.dumps(request)))
+
+
+def test_compile():
+    server = CompilerServer()
+    response = _roundtrip(server, _request("compile", INPUT_JSON))
+
+    assert response["id"] == 1
+    assert response["result"] == json.loads(json.dumps(compile_json(INPUT_JSON), default=str))
+
+
+def test_compile_cache_hit(monkeypatch):
+    server = CompilerServer()
+    expected = _roundtrip(server, _request("compile", INPUT_JSON))
+
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError("should not reach codegen")
+
+    monkeypatch.setattr(CompilerData, "_ir_output", property(fail))
+    monkeypatch.setattr(CompilerData, "_annotate", property(fail))
+
+    assert _roundtrip(server, _request("compile", INPUT_JSON)) == expected
+    # both modules were served from the parse cache
+    assert len(server.parse_cache) == 2
+
+
+def test_compile_error():
+    server = CompilerServer()
+    input_json = json.loads(json.dumps(INPUT_JSON))
+    input_json["sources"]["library.vy"]["content"] = "x: uint256 = 1"
+    response = _roundtrip(server, _request("compile", input_json))
+
+    (error,) = response["result"]["errors"]
+    assert error["severity"] == "error"
+    assert error["sourceLocation"]["file"] == "contract.vy"
+
+
+@pytest.mark.parametrize(
+    "line,code",
+    [
+        ("{not json", PARSE_ERROR),
+        ("[]", INVALID_REQUEST),
+        ('{"id": 1, "method": "version"}', INVALID_REQUEST),  # noqa: FS003
+        (json.dumps(_request("foo")), METHOD_NOT_FOUND),
+        (json.dumps(_request("compile", [1, 2])), INVALID_PARAMS),
+    ],
+)
+def test_invalid_requests(line, code):
+    server = CompilerServer()
+    response = json.loads(server.handle_line(line))
+    assert response["error"]["code"] == code
+
+
+def test_notification():
+    server = CompilerServer()
+    request = _request("version")
+    del request["id"]
+    assert server.handle_line(json.dumps(request)) is None
+
+
+def test_serve_stdio():
+    server = CompilerServer()
+    requests = [_request("version", request_id=1), _request("shutdown", request_id=2)]
+    # requests after shutdown are not processed
+    requests.append(_request("version", request_id=3))
+
+    reader = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    writer = io.StringIO()
+    server.serve(reader, writer)
+
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2]
+    assert "version" in responses[0]["result"]
+
+
+def test_serve_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "vyper.sock")
+    server = CompilerServer()
+    thread = threading.Thread(target=server.serve_unix_socket, args=(socket_path,))
+    thread.start()
+
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        for _ in range(100):
+            try:
+                client.connect(socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                thread.join(0.05)
+
+        with client, client.makefile("rw") as f:
+            f.write(json.dumps(_request("compile", INPUT_JSON)) + "\n")
+            f.write(json.dumps(_request("shutdown", request_id=2)) + "\n")
+            f.flush()
+            compile_response = json.loads(f.readline())
+            shutdown_response = json.loads(f.readline())
+    finally:
+        thread.join(10)
+
+    assert "contracts" in compile_response["result"]
+    assert shutdown_response == {"jsonrpc": "2.0", "id": 2, "result": None}
+    assert not thread.is_alive()
+
+
+def test_parse_cache():
+    cache = ParseCache(max_entries=1)
+    with use_parse_cache(cache):
+        ast1 = parse_to_ast(LIBRARY_CODE)
+        ast2 = parse_to_ast(LIBRARY_CODE)
+        # a fresh copy is returned every time
+        assert ast1 is not ast2
+        assert ast_to_dict(ast1) == ast_to_dict(ast2)
+        assert len(cache) == 1
+
+        parse_to_ast(CONTRACT_CODE)
+        assert len(cache) == 1
+
+    # outside of the context, the cache is not used
+    parse_to_ast(CONTRACT_CODE, source_id=1)
+    assert len(cache) == 1
@@ -3,7 +3,7 @@ import pytest
 from vyper.compiler import compile_code
 from vyper.compiler.phases import CompilerData
 from vyper.compiler.settings import OptimizationLevel, Settings
-from vyper.ir.compile_ir import _merge_jumpdests
+from vyper.ir.compile_ir import _merge_jumpdests, optimize_assembly
 
 codes = [
     """
@@ -132,3 +132,29 @@ def test_merge_jumpdests():
     asm = ["_sym_label_0", "JUMP", "PUSH0", "_sym_label_0", "JUMPDEST", "_sym_label_0", "JUMPDEST"]
 
     assert _merge_jumpdests(asm) is False, "should not return True as no changes were made"
+
+
+@pytest.mark.parametrize(
+    "asm,expected",
+    [
+        # unreachable code, then a jump to the next instruction,
+        # then an unused label
+        (["_sym_a", "JUMP", "PUSH1", 1, "_sym_a", "JUMPDEST", "STOP"], ["STOP"]),
+        # stack peephole rewrites, which enable each other
+        (
+            ["DUP1", "SWAP2", "SWAP1", "SWAP3", "SWAP3", "SWAP1", "POP", "POP", "STOP"],
+            ["SWAP1", "DUP2", "POP", "POP", "STOP"],
+        ),
+        # redundant ISZEROs before JUMPI, and label renaming
+        (
+            [
+                *["ISZERO", "ISZERO", "_sym_a", "JUMPI"],
+                *["_sym_b", "JUMP", "_sym_a", "JUMPDEST", "_sym_b", "JUMPDEST", "STOP"],
+            ],
+            ["_sym_b", "JUMPI", "_sym_b", "JUMPDEST", "STOP"],
+        ),
+    ],
+)
+def test_optimize_assembly(asm, expected):
+    optimize_assembly(asm)
+    assert asm == expected
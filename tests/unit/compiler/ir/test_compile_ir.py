@@ -75,3 +75,26 @@ def test_pc_debugger():
         offset = 5
 
     assert line_number_map["pc_breakpoints"][0] == offset
+
+
+def test_assembly_symbols():
+    asm = [
+        "_sym_label",  # forward reference
+        "JUMP",
+        "_OFST",
+        "_sym_data",
+        3,
+        "STOP",
+        "_sym_label",
+        "JUMPDEST",
+        "_sym_code_end",
+        "STOP",
+        [compile_ir.DataHeader("_sym_data"), b"\x01\x02", "_sym_label"],
+    ]
+    bytecode, _, symbol_map = compile_ir.assembly_to_evm_with_symbol_map(asm)
+
+    assert symbol_map["_sym_label"] == 8
+    assert symbol_map["_sym_data"] == 13
+    assert symbol_map["_sym_code_end"] == 17
+    # PUSH2 0x0008 JUMP PUSH2 0x0010 STOP JUMPDEST PUSH2 0x0011 STOP <data>
+    assert bytecode.hex() == "61000856" + "61001000" + "5b" + "61001100" + "0102" + "0008"
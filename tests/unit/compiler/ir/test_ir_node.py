@@ -0,0 +1,65 @@
+import copy
+
+import pytest
+
+from vyper.codegen import ir_node
+from vyper.codegen.ir_node import IRnode
+
+
+def test_gas_is_computed_on_demand():
+    ir = IRnode.from_list(["seq", ["mstore", 0, ["add", "x", 1]], ["sstore", 0, 1]])
+    assert ir._gas is None
+    assert ir.args[0]._gas is None
+
+    # seq: 30 + mstore (3 + 2 * -2 + add (3 + 2 * -1 + 3 + 5) + 5)
+    # + sstore (20000 + 2 * -2 + 5 + 5 + 15000)
+    mstore_gas = 3 - 4 + (3 - 2 + 3 + 5) + 5
+    sstore_gas = 20000 - 4 + 5 + 5 + 15000
+    assert ir.gas == 30 + mstore_gas + sstore_gas
+    # cached for the whole tree
+    assert ir.args[0]._gas == mstore_gas
+
+    ir.add_gas_estimate = 100
+    assert ir.gas == 30 + mstore_gas + sstore_gas + 100
+
+
+def test_gas_of_deep_ir():
+    ir = IRnode.from_list(1)
+    for _ in range(5000):
+        ir = IRnode.from_list(["seq", ir])
+    assert ir.gas == 5 + 30 * 5000
+
+
+def test_check_ir(monkeypatch):
+    with pytest.raises(AssertionError):
+        IRnode.from_list(["mstore", 0])
+
+    monkeypatch.setattr(ir_node, "VYPER_CHECK_IR", False)
+    ir = IRnode.from_list(["mstore", 0])
+    assert ir.valency == 0
+
+
+def test_passthrough_metadata():
+    ir = IRnode.from_list(["seq"])
+    assert ir._passthrough_metadata is None
+
+    ir.passthrough_metadata["foo"] = 1
+    assert ir.passthrough_metadata == {"foo": 1}
+
+    # the metadata is passed through by reference
+    ir2 = IRnode.from_list(["seq"], passthrough_metadata=ir.passthrough_metadata)
+    assert ir2.passthrough_metadata is ir.passthrough_metadata
+
+
+def test_deepcopy():
+    ir = IRnode.from_list(["seq", ["mstore", 0, 1]], annotation="foo", error_msg="bar")
+    ir.is_source_bytes_literal = True
+    _ = ir.unique_symbols
+
+    ret = copy.deepcopy(ir)
+    assert ret == ir
+    assert ret.args[0] is not ir.args[0]
+    assert ret.annotation == "foo"
+    assert ret.error_msg == "bar"
+    assert ret.is_source_bytes_literal
+    assert not hasattr(ret, "_writes")
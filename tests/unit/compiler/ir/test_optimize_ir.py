@@ -223,13 +223,11 @@ optimize_list = [
 @pytest.mark.parametrize("ir", optimize_list)
 def test_ir_optimizer(ir):
     optimized = optimizer.optimize(IRnode.from_list(ir[0]))
-    optimized.repr_show_gas = True
     if ir[1] is None:
         # no-op, assert optimizer does nothing
         expected = IRnode.from_list(ir[0])
     else:
         expected = IRnode.from_list(ir[1])
-    expected.repr_show_gas = True
     optimized.annotation = None
     assert optimized == expected
 
@@ -54,6 +54,18 @@ def test_bytecode_runtime():
     assert out["bytecode_runtime"].removeprefix("0x") in out["bytecode"].removeprefix("0x")
 
 
+@pytest.mark.parametrize("code", [simple_contract_code, many_functions, has_immutables])
+@pytest.mark.parametrize("output_formats", [["bytecode_runtime"], ["bytecode", "bytecode_runtime"]])
+def test_bytecode_runtime_embedded(code, output_formats, optimize, experimental_codegen):
+    # the runtime bytecode does not depend on which outputs were
+    # computed before it, and it is the same as the deployed runtime code.
+    settings = Settings(optimize=optimize, experimental_codegen=experimental_codegen)
+    out = vyper.compile_code(code, output_formats=output_formats, settings=settings)
+    bytecode = vyper.compile_code(code, output_formats=["bytecode"], settings=settings)["bytecode"]
+
+    assert out["bytecode_runtime"].removeprefix("0x") in bytecode.removeprefix("0x")
+
+
 def test_bytecode_signature(optimize, debug):
     out = vyper.compile_code(
         simple_contract_code, output_formats=["bytecode_runtime", "bytecode", "integrity"]
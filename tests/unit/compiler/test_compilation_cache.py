@@ -0,0 +1,304 @@
+import pickle
+import warnings
+
+import pytest
+
+from vyper.cli.vyper_compile import compile_files
+from vyper.compiler import compile_from_file_input
+from vyper.compiler.cache import CompilationCache, DiskParseCache
+from vyper.compiler.phases import CompilerData
+from vyper.compiler.settings import OptimizationLevel, Settings
+from vyper.warnings import ContractSizeLimit, VyperWarning
+
+CODE = """
+x: public(uint256)
+
+@external
+def set_x(new_x: uint256):
+    self.x = new_x
+"""
+
+FORMATS = ["bytecode", "bytecode_runtime", "abi", "source_map", "layout"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompilationCache(tmp_path / "cache")
+
+
+def _compile(file_input, input_bundle, cache, output_formats=FORMATS, **kwargs):
+    return compile_from_file_input(
+        file_input, input_bundle=input_bundle, output_formats=output_formats, cache=cache, **kwargs
+    )
+
+
+def test_cache_hit_skips_codegen(make_input_bundle, cache, monkeypatch):
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    expected = _compile(file_input, input_bundle, None)
+    assert _compile(file_input, input_bundle, cache) == expected
+
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError("should not reach codegen")
+
+    monkeypatch.setattr(CompilerData, "_ir_output", property(fail))
+    monkeypatch.setattr(CompilerData, "_annotate", property(fail))
+
+    assert _compile(file_input, input_bundle, cache) == expected
+
+
+def test_cache_partial_hit(make_input_bundle, cache):
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    _compile(file_input, input_bundle, cache, output_formats=["abi"])
+    out = _compile(file_input, input_bundle, cache, output_formats=["abi", "bytecode"])
+
+    assert list(out.keys()) == ["abi", "bytecode"]
+    assert out == _compile(file_input, input_bundle, None, output_formats=["abi", "bytecode"])
+
+
+def test_cache_key_depends_on_settings(make_input_bundle, cache):
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    settings = Settings(optimize=OptimizationLevel.GAS)
+    data1 = CompilerData(file_input, input_bundle, settings=settings)
+    settings = Settings(optimize=OptimizationLevel.CODESIZE)
+    data2 = CompilerData(file_input, input_bundle, settings=settings)
+    data3 = CompilerData(file_input, input_bundle, settings=settings, no_bytecode_metadata=True)
+
+    keys = {cache.compute_key(d) for d in (data1, data2, data3)}
+    assert len(keys) == 3
+
+
+def test_cache_key_depends_on_imports(make_input_bundle, cache):
+    main = """
+import lib
+
+@external
+def foo() -> uint256:
+    return lib.bar()
+    """
+    input_bundle = make_input_bundle({"main.vy": main, "lib.vy": "x: constant(uint256) = 1"})
+    file_input = input_bundle.load_file("main.vy")
+    key1 = cache.compute_key(CompilerData(file_input, input_bundle))
+
+    input_bundle = make_input_bundle({"lib.vy": "x: constant(uint256) = 2"})
+    file_input = input_bundle.load_file("main.vy")
+    key2 = cache.compute_key(CompilerData(file_input, input_bundle))
+
+    assert key1 != key2
+
+
+def test_cache_replays_warnings(make_input_bundle, cache, monkeypatch):
+    monkeypatch.setattr("vyper.compiler.output.EIP170_CONTRACT_SIZE_LIMIT", 1)
+
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    for _ in range(2):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            _compile(file_input, input_bundle, cache, output_formats=["bytecode_runtime"])
+
+        assert len(w) == 1
+        assert issubclass(w[0].category, ContractSizeLimit)
+
+    with pytest.raises(VyperWarning):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", category=VyperWarning)
+            _compile(file_input, input_bundle, cache, output_formats=["bytecode_runtime"])
+
+
+def test_cache_eviction(make_input_bundle, tmp_path):
+    cache = CompilationCache(tmp_path / "cache", max_size=0)
+
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+    _compile(file_input, input_bundle, cache)
+
+    # the parsed modules are evicted along with the outputs
+    assert list(cache.cache_dir.rglob("*.pickle")) == []
+
+
+def test_cache_eviction_shared_limit(tmp_path):
+    cache = CompilationCache(tmp_path / "cache", max_size=3000)
+    cache.store("aa", {"outputs": {"bytecode": b"\x00" * 1000}})
+    cache.jumptable_cache.put((1, 2, 3), (b"\x01" * 1000,))
+    assert len(cache.jumptable_cache) == 1
+
+    # the output cache and the selector table cache share the limit, so
+    # the least recently used entry is evicted
+    cache.store("bb", {"outputs": {"bytecode": b"\x02" * 1000}})
+    assert cache.load("aa") is None
+    assert cache.load("bb") is not None
+    assert len(cache.jumptable_cache) == 1
+
+
+def test_cache_eviction_scans_lazily(tmp_path, monkeypatch):
+    cache = CompilationCache(tmp_path / "cache", max_size=10_000)
+
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    # the size of the cache directory is only read on the first store,
+    # until the limit is reached
+    for i in range(5):
+        cache.store(f"{i:02}", {"outputs": {"bytecode": b"\x00" * 1000}})
+    assert len(scans) == 1
+
+    for i in range(5, 10):
+        cache.store(f"{i:02}", {"outputs": {"bytecode": b"\x00" * 1000}})
+    assert len(scans) > 1
+    assert sum(p.stat().st_size for p in cache.cache_dir.rglob("*.pickle")) <= 10_000
+
+
+def test_corrupted_cache_entry(make_input_bundle, cache):
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    expected = _compile(file_input, input_bundle, cache)
+
+    (entry,) = cache.cache_dir.glob("*/*.pickle")
+    entry.write_bytes(b"garbage")
+
+    assert _compile(file_input, input_bundle, cache) == expected
+
+
+_exploited = []
+
+
+def _exploit():  # pragma: nocover
+    _exploited.append(True)
+
+
+class _Exploit:
+    def __reduce__(self):
+        return (_exploit, ())
+
+
+def test_cache_entry_with_classes(make_input_bundle, cache):
+    # the cache directory may be writable by someone else, so loading an
+    # entry must not run any code
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    expected = _compile(file_input, input_bundle, cache)
+
+    (entry,) = cache.cache_dir.glob("*/*.pickle")
+    entry.write_bytes(pickle.dumps({"outputs": _Exploit(), "warnings": []}))
+
+    assert _compile(file_input, input_bundle, cache) == expected
+    assert _exploited == []
+
+
+def test_parse_cache_entry_with_classes(make_input_bundle, tmp_path):
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+
+    cache = CompilationCache(tmp_path / "cache")
+    expected = _compile(file_input, input_bundle, cache, output_formats=["abi"])
+
+    (entry,) = (tmp_path / "cache" / "ast").glob("*/*.pickle")
+    entry.write_bytes(pickle.dumps({"module": _Exploit(), "warnings": []}))
+
+    cache = CompilationCache(tmp_path / "cache")
+    assert _compile(file_input, input_bundle, cache, output_formats=["abi"]) == expected
+    assert _exploited == []
+
+
+def test_compile_files_cache_dir(chdir_tmp_path, make_file, tmp_path):
+    make_file("foo.vy", CODE)
+    cache_dir = tmp_path / "cache"
+
+    expected = compile_files(["foo.vy"], FORMATS)
+    assert compile_files(["foo.vy"], FORMATS, cache_dir=str(cache_dir)) == expected
+    assert len(list(cache_dir.glob("*/*.pickle"))) == 1
+    assert compile_files(["foo.vy"], FORMATS, cache_dir=str(cache_dir)) == expected
+
+
+def test_parse_cache_hit_skips_parsing(make_input_bundle, tmp_path, monkeypatch):
+    main = """
+import lib
+
+@external
+def foo() -> uint256:
+    return lib.bar()
+    """
+    lib = """
+@internal
+def bar() -> uint256:
+    return 1
+    """
+    input_bundle = make_input_bundle({"main.vy": main, "lib.vy": lib})
+    file_input = input_bundle.load_file("main.vy")
+
+    cache = CompilationCache(tmp_path / "cache")
+    expected = _compile(file_input, input_bundle, cache, output_formats=["abi"])
+    # main.vy and lib.vy
+    assert len(cache.parse_cache) == 2
+
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError("should not reach the parser")
+
+    monkeypatch.setattr("vyper.ast.parse._parse_to_ast", fail)
+
+    # fresh cache object and input bundle, as in a new compiler invocation.
+    # the output is not cached yet, but the parsed modules are.
+    cache = CompilationCache(tmp_path / "cache")
+    input_bundle = make_input_bundle({"main.vy": main, "lib.vy": lib})
+    file_input = input_bundle.load_file("main.vy")
+    out = _compile(file_input, input_bundle, cache, output_formats=["abi", "bytecode"])
+    assert out["abi"] == expected["abi"]
+
+
+def test_parse_cache_key_depends_on_version(tmp_path, monkeypatch):
+    cache = DiskParseCache(tmp_path / "cache")
+    key = ("sha256sum", "0", "foo.vy", "foo.vy", "None", "False")
+    assert cache._compute_key(key) == cache._compute_key(key)
+
+    old_key = cache._compute_key(key)
+    monkeypatch.setattr("vyper.compiler.cache.get_long_version", lambda: "0.0.0+commit.0")
+    assert cache._compute_key(key) != old_key
+
+
+def test_cache_asts_opt_out(make_input_bundle, tmp_path):
+    cache = CompilationCache(tmp_path / "cache", cache_asts=False)
+
+    input_bundle = make_input_bundle({"foo.vy": CODE})
+    file_input = input_bundle.load_file("foo.vy")
+    _compile(file_input, input_bundle, cache)
+
+    assert cache.parse_cache is None
+    assert not (cache.cache_dir / "ast").exists()
+
+
+def test_jumptable_cache_hit_skips_search(make_input_bundle, tmp_path, monkeypatch):
+    from vyper.codegen import jumptable_utils
+
+    code = "\n".join(f"@external\ndef foo{i}() -> uint256:\n    return {i}\n" for i in range(20))
+    settings = Settings(optimize=OptimizationLevel.CODESIZE)
+    input_bundle = make_input_bundle({"foo.vy": code})
+    file_input = input_bundle.load_file("foo.vy")
+
+    jumptable_utils._find_dense_solution_cached.cache_clear()
+    cache = CompilationCache(tmp_path / "cache")
+    expected = _compile(file_input, input_bundle, cache, output_formats=["asm"], settings=settings)
+    assert len(cache.jumptable_cache) == 1
+
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError("should not search for magics")
+
+    monkeypatch.setattr(jumptable_utils, "_find_dense_solution", fail)
+    jumptable_utils._find_dense_solution_cached.cache_clear()
+
+    # the output is not cached yet, but the selector table is
+    cache = CompilationCache(tmp_path / "cache")
+    out = _compile(
+        file_input, input_bundle, cache, output_formats=["asm", "bytecode"], settings=settings
+    )
+    assert out["asm"] == expected["asm"]
+    jumptable_utils._find_dense_solution_cached.cache_clear()
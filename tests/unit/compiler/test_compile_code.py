@@ -18,3 +18,49 @@ initializes: lib1
 
     vyper.compile_code(main1, input_bundle=input_bundle)
     vyper.compile_code(main2, input_bundle=input_bundle)
+
+
+CODE = """
+x: uint256
+
+@external
+def foo(a: uint256) -> uint256:
+    return a + self.x
+"""
+
+
+def _is_annotated(module):
+    return any("type" in node._metadata for node in module.get_descendants())
+
+
+def test_analysis_annotates_parsed_module_in_place(monkeypatch):
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError("should not copy the module")
+
+    monkeypatch.setattr(vyper.ast.VyperNode, "__deepcopy__", fail)
+
+    compiler_data = vyper.compiler.phases.CompilerData(CODE)
+    compiler_data.bytecode
+
+
+def test_unannotated_module_ast_first():
+    compiler_data = vyper.compiler.phases.CompilerData(CODE)
+    vyper_module = compiler_data.vyper_module
+
+    annotated_module = compiler_data.annotated_vyper_module
+    assert annotated_module is not vyper_module
+    assert _is_annotated(annotated_module)
+    assert not _is_annotated(vyper_module)
+
+
+def test_unannotated_module_ast_last():
+    compiler_data = vyper.compiler.phases.CompilerData(CODE)
+    annotated_module = compiler_data.annotated_vyper_module
+
+    vyper_module = compiler_data.vyper_module
+    assert vyper_module is not annotated_module
+    assert _is_annotated(annotated_module)
+    assert not _is_annotated(vyper_module)
+
+    expected = vyper.compiler.phases.CompilerData(CODE).vyper_module
+    assert vyper_module.to_dict() == expected.to_dict()
@@ -0,0 +1,213 @@
+import json
+from pathlib import PurePath
+
+import pytest
+
+from vyper.compiler import compile_from_file_input
+from vyper.compiler.input_bundle import FilesystemInputBundle, JSONInput
+from vyper.compiler.phases import CompilerData, enable_module_sharing
+from vyper.compiler.settings import Settings
+from vyper.exceptions import TypeMismatch
+
+LIB = """
+counter: uint256
+owner: address
+
+@deploy
+def __init__():
+    self.owner = msg.sender
+
+@internal
+def bump() -> uint256:
+    self.counter += 1
+    return self.counter
+
+@internal
+@nonreentrant
+def guarded():
+    pass
+"""
+
+MAIN1 = """
+import lib
+
+initializes: lib
+
+x: uint256
+
+@deploy
+def __init__():
+    lib.__init__()
+
+@external
+def foo() -> uint256:
+    return lib.bump()
+"""
+
+MAIN2 = """
+import lib
+
+y: HashMap[uint256, uint256]
+initializes: lib
+
+@deploy
+def __init__():
+    lib.__init__()
+
+@external
+def bar() -> uint256:
+    lib.guarded()
+    return lib.bump() + self.y[1]
+
+@external
+def baz():
+    pass
+"""
+
+FORMATS = ["bytecode", "bytecode_runtime", "layout", "source_map", "metadata", "abi"]
+
+
+def _compile(input_bundle, path, **kwargs):
+    file_input = input_bundle.load_file(path)
+    return compile_from_file_input(
+        file_input, input_bundle=input_bundle, output_formats=FORMATS, **kwargs
+    )
+
+
+def _imported_modules(input_bundle, path):
+    data = CompilerData(input_bundle.load_file(path), input_bundle)
+    _ = data.annotated_vyper_module
+    return list(data.resolved_imports.compiler_inputs.values())
+
+
+def test_shared_modules_same_outputs(make_input_bundle, tmp_path):
+    sources = {"lib.vy": LIB, "main1.vy": MAIN1, "main2.vy": MAIN2}
+    input_bundle = make_input_bundle(sources)
+    enable_module_sharing(input_bundle)
+
+    for path in ("main1.vy", "main2.vy", "main1.vy"):
+        fresh_bundle = FilesystemInputBundle([tmp_path])
+        # load files in the same order so that source ids match
+        for p in input_bundle._source_ids:
+            fresh_bundle.load_file(p)
+        assert _compile(input_bundle, path) == _compile(fresh_bundle, path)
+
+
+def test_shared_modules_analyzed_once(make_input_bundle):
+    input_bundle = make_input_bundle({"lib.vy": LIB, "main1.vy": MAIN1, "main2.vy": MAIN2})
+    module_cache = enable_module_sharing(input_bundle)
+
+    (lib1,) = _imported_modules(input_bundle, "main1.vy")
+    (lib2,) = _imported_modules(input_bundle, "main2.vy")
+
+    assert lib1 is lib2
+    assert len(module_cache) == 1
+
+
+def test_modules_not_shared_by_default(make_input_bundle):
+    input_bundle = make_input_bundle({"lib.vy": LIB, "main1.vy": MAIN1, "main2.vy": MAIN2})
+
+    (lib1,) = _imported_modules(input_bundle, "main1.vy")
+    (lib2,) = _imported_modules(input_bundle, "main2.vy")
+
+    assert lib1 is not lib2
+
+
+def test_shared_modules_settings(make_input_bundle):
+    input_bundle = make_input_bundle({"lib.vy": LIB, "main1.vy": MAIN1})
+    module_cache = enable_module_sharing(input_bundle)
+
+    _compile(input_bundle, "main1.vy")
+    cancun = _compile(input_bundle, "main1.vy")
+    paris = _compile(input_bundle, "main1.vy", settings=Settings(evm_version="paris"))
+
+    # analysis depends on the settings, so the module is not shared
+    assert len(module_cache) == 2
+    assert cancun["layout"] != paris["layout"]
+
+
+def test_shared_modules_storage_layout_override(make_input_bundle):
+    input_bundle = make_input_bundle({"lib.vy": LIB, "main1.vy": MAIN1})
+    enable_module_sharing(input_bundle)
+
+    expected = _compile(input_bundle, "main1.vy")["layout"]["storage_layout"]
+    override = {
+        "x": {"type": "uint256", "n_slots": 1, "slot": 0},
+        "lib": {
+            "counter": {"type": "uint256", "n_slots": 1, "slot": 11},
+            "owner": {"type": "address", "n_slots": 1, "slot": 12},
+        },
+    }
+    layout_input = JSONInput(
+        contents=json.dumps(override),
+        data=override,
+        source_id=-1,
+        path=PurePath("layout.json"),
+        resolved_path=PurePath("layout.json"),
+    )
+    out = _compile(input_bundle, "main1.vy", storage_layout_override=layout_input)
+    assert out["layout"]["storage_layout"] == override
+
+    # allocation is fresh for the next compilation
+    assert _compile(input_bundle, "main1.vy")["layout"]["storage_layout"] == expected
+
+
+def test_shared_module_with_error(make_input_bundle):
+    lib = """
+@internal
+def foo() -> uint256:
+    return msg.sender
+    """
+    main = """
+import lib
+
+@external
+def bar() -> uint256:
+    return lib.foo()
+    """
+    input_bundle = make_input_bundle({"lib.vy": lib, "main1.vy": main, "main2.vy": main})
+    module_cache = enable_module_sharing(input_bundle)
+
+    for path in ("main1.vy", "main2.vy"):
+        with pytest.raises(TypeMismatch):
+            _compile(input_bundle, path)
+
+    # the partially analyzed module is not kept around
+    assert len(module_cache) == 0
+
+
+def test_shared_module_resolved_differently(make_input_bundle, chdir_tmp_path, tmp_path):
+    # `common/lib.vy` imports a different `helper` depending on the
+    # directory of the compilation target.
+    lib = """
+import helper
+
+@internal
+def foo() -> uint256:
+    return helper.X
+    """
+    main = """
+import common.lib as lib
+
+@external
+def bar() -> uint256:
+    return lib.foo()
+    """
+    sources = {
+        "common/lib.vy": lib,
+        "a/helper.vy": "X: constant(uint256) = 1",
+        "b/helper.vy": "X: constant(uint256) = 2",
+        "a/main.vy": main,
+        "b/main.vy": main,
+    }
+    input_bundle = make_input_bundle(sources)
+    enable_module_sharing(input_bundle)
+
+    out_a = _compile(input_bundle, "a/main.vy")
+    out_b = _compile(input_bundle, "b/main.vy")
+    assert out_a["bytecode_runtime"] != out_b["bytecode_runtime"]
+
+    fresh_bundle = FilesystemInputBundle([tmp_path])
+    for p in input_bundle._source_ids:
+        fresh_bundle.load_file(p)
+    assert out_b == _compile(fresh_bundle, "b/main.vy")
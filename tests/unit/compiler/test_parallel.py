@@ -0,0 +1,64 @@
+import pickle
+import warnings
+
+import pytest
+
+from vyper.compiler import compile_code
+from vyper.compiler.parallel import get_num_jobs, run_job
+from vyper.exceptions import CompilerPanic, NamespaceCollision, SyntaxException, TypeMismatch
+from vyper.warnings import VyperWarning, vyper_warn
+
+
+@pytest.mark.parametrize(
+    "code,exc_type",
+    [
+        ("x: uint256 = ", SyntaxException),
+        ("@external\ndef foo() -> uint256:\n    return True", TypeMismatch),
+        ("x: uint256\nx: uint256", NamespaceCollision),
+    ],
+)
+def test_pickle_vyper_exception(code, exc_type):
+    with pytest.raises(exc_type) as e:
+        compile_code(code)
+
+    exc = e.value
+    unpickled = pickle.loads(pickle.dumps(exc))
+
+    assert type(unpickled) is type(exc)
+    assert str(unpickled) == str(exc)
+    assert unpickled.message == exc.message
+    assert unpickled.hint == exc.hint
+
+
+def test_pickle_internal_exception():
+    exc = CompilerPanic("panic!")
+    assert str(pickle.loads(pickle.dumps(exc))) == str(exc)
+
+
+def _warn_and_raise():
+    vyper_warn("be careful")
+    compile_code("x: uint256 = ")
+
+
+def test_run_job():
+    result = run_job(sum, [1, 2, 3])
+    assert result.unwrap() == 6
+
+    result = pickle.loads(pickle.dumps(run_job(_warn_and_raise)))
+    assert result.warnings == [(VyperWarning, "be careful")]
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        with pytest.raises(SyntaxException):
+            result.unwrap()
+
+    assert len(w) == 1
+    assert str(w[0].message) == "be careful"
+
+
+def test_get_num_jobs():
+    assert get_num_jobs(None) == 1
+    assert get_num_jobs(3) == 3
+    assert get_num_jobs(0) >= 1
+    with pytest.raises(ValueError):
+        get_num_jobs(-1)
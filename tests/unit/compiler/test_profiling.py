@@ -0,0 +1,113 @@
+import tracemalloc
+
+import pytest
+
+from vyper.compiler import compile_code
+from vyper.compiler.profiling import PhaseProfiler, profile_phase, use_profiler
+from vyper.compiler.settings import OptimizationLevel, Settings
+
+CODE = """
+x: public(uint256)
+
+@external
+def foo(a: uint256) -> uint256:
+    self.x = a
+    return a + 1
+"""
+
+LEGACY_PHASES = [
+    "parse",
+    "resolve_imports",
+    "analyze",
+    "storage_layout",
+    "codegen",
+    "legacy_optimizer",
+    "assembly",
+    "assembly_to_evm",
+]
+
+
+@pytest.mark.parametrize("venom", [False, True])
+def test_profile_phases(venom):
+    settings = Settings(optimize=OptimizationLevel.GAS, experimental_codegen=venom)
+    profiler = PhaseProfiler()
+    with use_profiler(profiler):
+        compile_code(CODE, output_formats=["bytecode"], settings=settings)
+
+    totals = profiler.totals()
+    if venom:
+        expected = [p for p in LEGACY_PHASES if p != "legacy_optimizer"] + ["ir_node_to_venom"]
+    else:
+        expected = LEGACY_PHASES
+    for phase in expected:
+        assert phase in totals, phase
+
+    venom_passes = [k for k, v in totals.items() if v["category"] == "venom_pass"]
+    if venom:
+        assert "SCCP" in venom_passes
+        assert "DFTPass" in venom_passes
+    else:
+        assert venom_passes == []
+
+    for event in profiler.events:
+        assert 0 <= event.self_duration <= event.duration
+        assert event.alloc_net is None
+
+
+def test_profile_nesting():
+    profiler = PhaseProfiler()
+    with use_profiler(profiler):
+        with profile_phase("outer", path="foo.vy"):
+            with profile_phase("inner"):
+                pass
+            with profile_phase("inner"):
+                pass
+
+    outer, inner1, inner2 = profiler.events
+    assert outer.args == {"path": "foo.vy"}
+    assert (outer.depth, inner1.depth, inner2.depth) == (0, 1, 1)
+    assert outer.self_duration == pytest.approx(outer.duration - inner1.duration - inner2.duration)
+    assert profiler.totals()["inner"]["count"] == 2
+
+    # no profiler is active anymore
+    with profile_phase("ignored"):
+        pass
+    assert len(profiler.events) == 3
+
+
+def test_profile_allocations():
+    profiler = PhaseProfiler(trace_allocations=True)
+    with use_profiler(profiler):
+        with profile_phase("outer"):
+            with profile_phase("inner"):
+                x = bytearray(1024 * 1024)
+                del x
+
+    # tracemalloc is only traced while profiling
+    assert not tracemalloc.is_tracing()
+
+    outer, inner = profiler.events
+    assert inner.alloc_peak >= 1000 * 1000
+    assert inner.alloc_net < 1000 * 1000
+    # the peak of nested phases is included
+    assert outer.alloc_peak >= inner.alloc_peak
+
+
+def test_profile_output_formats(tmp_path):
+    profiler = PhaseProfiler()
+    with use_profiler(profiler):
+        compile_code(CODE, output_formats=["bytecode"])
+
+    report = profiler.as_dict()
+    assert [e["name"] for e in report["phases"]] == [e.name for e in profiler.events]
+    assert report["totals"] == profiler.totals()
+
+    trace = profiler.as_chrome_trace()["traceEvents"]
+    assert len(trace) == len(profiler.events)
+    for item, event in zip(trace, profiler.events):
+        assert item["ph"] == "X"
+        assert item["name"] == event.name
+        assert item["dur"] == pytest.approx(event.duration * 1e6)
+
+    with pytest.raises(ValueError):
+        profiler.write(str(tmp_path / "profile.json"), "xml")
@@ -2,6 +2,7 @@ from collections import namedtuple
 
 from vyper.compiler import compile_code
 from vyper.compiler.output import _compress_source_map
+from vyper.compiler.profiling import PhaseProfiler, use_profiler
 from vyper.compiler.settings import OptimizationLevel
 from vyper.compiler.utils import expand_source_map
 
@@ -208,3 +209,20 @@ def test_node_id_map():
         assert isinstance(source_id, int), source_id
         assert isinstance(node_id, int), node_id
         assert node_id in ast_node_map
+
+
+def test_assemble_once():
+    output_formats = ["bytecode", "bytecode_runtime", "source_map", "source_map_runtime"]
+    profiler = PhaseProfiler()
+    with use_profiler(profiler):
+        out = compile_code(TEST_CODE, output_formats=output_formats)
+
+    # once for the deploy code and once for the runtime code
+    assert profiler.totals()["assembly_to_evm"]["count"] == 2
+
+    # the source map does not depend on the bytecode metadata
+    no_metadata = compile_code(TEST_CODE, output_formats=output_formats, no_bytecode_metadata=True)
+    assert out["bytecode"] != no_metadata["bytecode"]
+    assert out["bytecode_runtime"] == no_metadata["bytecode_runtime"]
+    assert out["source_map"] == no_metadata["source_map"]
+    assert out["source_map_runtime"] == no_metadata["source_map_runtime"]
@@ -1,5 +1,8 @@
+import random
 from typing import Optional
 
+import pytest
+
 from vyper.exceptions import CompilerPanic
 from vyper.utils import OrderedSet
 from vyper.venom.analysis import DominatorTreeAnalysis, IRAnalysesCache
@@ -72,3 +75,100 @@ def test_phi_placement():
 
     ac = IRAnalysesCache(fn)
     MakeSSA(ac, fn).run_pass()
+
+
+def _make_random_ctx(seed: int, n_blocks: int) -> IRFunction:
+    rng = random.Random(seed)
+    lab = [IRLabel(str(i)) for i in range(n_blocks)]
+
+    ctx = IRContext()
+    fn = ctx.create_function(lab[0].value)
+    fn.entry.append_instruction("jmp", lab[1])
+
+    for i in range(1, n_blocks):
+        # mostly forward edges, with some back edges (loops) and some
+        # blocks which end up unreachable
+        n_outs = rng.choice([0, 1, 2, 2])
+        if i == n_blocks - 1:
+            n_outs = 0
+        outs = []
+        for _ in range(n_outs):
+            if rng.random() < 0.2:
+                target = rng.randrange(1, i + 1)
+            else:
+                target = rng.randrange(i + 1, min(i + 8, n_blocks))
+            outs.append(lab[target])
+        _add_bb(fn, lab[i], outs)
+
+    return fn
+
+
+def _reference_dominators(fn: IRFunction) -> dict:
+    # `dom` dominates `bb` iff `bb` is unreachable from the entry
+    # once `dom` is removed from the cfg.
+    def reachable(removed=None):
+        seen = set()
+        stack = [fn.entry]
+        while len(stack) > 0:
+            bb = stack.pop()
+            if bb in seen or bb == removed:
+                continue
+            seen.add(bb)
+            stack.extend(bb.out_bbs)
+        return seen
+
+    all_reachable = reachable()
+    ret = {bb: {bb} for bb in all_reachable}
+    for dom in all_reachable:
+        for bb in all_reachable - reachable(removed=dom):
+            ret[bb].add(dom)
+    return ret
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dominators_random_cfg(seed):
+    fn = _make_random_ctx(seed, 60)
+    expected = _reference_dominators(fn)
+
+    ac = IRAnalysesCache(fn)
+    dom = ac.request_analysis(DominatorTreeAnalysis)
+
+    assert set(dom.immediate_dominators.keys()) == set(expected.keys())
+    for bb, doms in expected.items():
+        for other in expected:
+            assert dom.dominates(other, bb) == (other in doms), (other, bb)
+
+        # the immediate dominator is the closest strict dominator, i.e.
+        # the one which is dominated by all the others
+        idom = dom.immediate_dominator(bb)
+        if bb == fn.entry:
+            assert idom == bb
+            continue
+        strict_doms = doms - {bb}
+        assert idom in strict_doms
+        assert all(dom.dominates(d, idom) for d in strict_doms)
+
+    # unreachable blocks are not part of the dominator tree
+    for bb in fn.get_basic_blocks():
+        if bb not in expected:
+            assert not dom.dominates(fn.entry, bb)
+
+
+def test_dominators_deep_cfg():
+    # deeper than the recursion limit
+    n_blocks = 5000
+    lab = [IRLabel(str(i)) for i in range(n_blocks)]
+    ctx = IRContext()
+    fn = ctx.create_function(lab[0].value)
+    fn.entry.append_instruction("jmp", lab[1])
+    for i in range(1, n_blocks - 1):
+        _add_bb(fn, lab[i], [lab[i + 1]])
+    _add_bb(fn, lab[n_blocks - 1], [])
+
+    ac = IRAnalysesCache(fn)
+    dom = ac.request_analysis(DominatorTreeAnalysis)
+
+    first, last = fn.entry, fn.get_basic_block(str(n_blocks - 1))
+    assert dom.dominates(first, last)
+    assert not dom.dominates(last, first)
+    assert list(dom.dom_post_order) == list(reversed(list(fn.get_basic_blocks())))
@@ -1,5 +1,8 @@
 import vyper
 from vyper.compiler.settings import Settings
+from vyper.venom.analysis import IRAnalysesCache, LivenessAnalysis
+from vyper.venom.basicblock import IRLabel
+from vyper.venom.parser import parse_venom
 
 source = """
 @external
@@ -16,3 +19,47 @@ def test_liveness_simple_loop():
     vyper.compile_code(
         source, output_formats=["opcodes"], settings=Settings(experimental_codegen=True)
     )
+
+
+def test_liveness_loop_order():
+    ctx = parse_venom(
+        """
+        function main {
+        main:
+            %a = param
+            %b = param
+            %c = 0
+            jmp @loop
+        loop:
+            %i = phi @main, %c, @body, %i2
+            %cond = lt %i, %a
+            jnz %cond, @body, @exit
+        body:
+            %i2 = add %i, %b
+            jmp @loop
+        exit:
+            return %b, %i
+        }
+        """
+    )
+    fn = ctx.get_function(IRLabel("main"))
+    ac = IRAnalysesCache(fn)
+    liveness = ac.request_analysis(LivenessAnalysis)
+    main, loop, body, exit_ = fn.get_basic_blocks()
+
+    def names(vars_):
+        return [var.name for var in vars_]
+
+    assert names(liveness.out_vars(exit_)) == []
+    assert names(liveness.live_vars_at(exit_.instructions[0])) == ["%i", "%b"]
+    assert names(liveness.out_vars(body)) == ["%b", "%a", "%i2"]
+    assert names(liveness.live_vars_at(body.instructions[0])) == ["%b", "%a", "%i"]
+    assert names(liveness.out_vars(loop)) == ["%i", "%b", "%a"]
+    # the phi arguments are live at the start of the loop header
+    assert names(liveness.live_vars_at(loop.instructions[0])) == ["%b", "%a", "%c", "%i2"]
+    assert names(liveness.liveness_in_vars(loop)) == ["%i", "%b", "%a"]
+    # only the phi argument of the incoming edge is live across the edge
+    assert names(liveness.input_vars_from(main, loop)) == ["%b", "%a", "%c"]
+    assert names(liveness.input_vars_from(body, loop)) == ["%b", "%a", "%i2"]
+    assert names(liveness.out_vars(main)) == ["%b", "%a", "%c"]
+    assert names(liveness.live_vars_at(main.instructions[0])) == []
@@ -92,8 +92,9 @@ def test_elimination_barrier():
         %2 = mload %1
         %3 = %100
         # fence - writes to memory
-        staticcall %3, %3, %3, %3
+        staticcall %3, %3, %3, %3, %3, %3
         %4 = mload %1
+        sink %2, %4
     """
     _check_no_change(pre)
 
@@ -142,8 +143,9 @@ def test_store_load_barrier():
         mstore %ptr, %val
         %3 = %100  ; arbitrary
         # fence
-        staticcall %3, %3, %3, %3
+        staticcall %3, %3, %3, %3, %3, %3
         %4 = mload %ptr
+        sink %4
     """
     _check_no_change(pre)
 
@@ -294,3 +296,240 @@ def test_store_store_unknown_ptr_barrier():
     """
 
     _check_no_change(pre)
+
+
+@pytest.mark.parametrize("addrspace", ADDRESS_SPACES)
+def test_load_elimination_dominated_block(addrspace):
+    """
+    Check that a load in a dominated basic block reuses the value
+    loaded in the dominator
+    """
+    LOAD = addrspace.load_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %2 = {LOAD} %ptr
+        sink %1, %2
+    """
+    post = f"""
+    main:
+        %ptr = 11
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %2 = %1
+        sink %1, %2
+    """
+    _check_pre_post(pre, post)
+
+
+@pytest.mark.parametrize("addrspace", RW_ADDRESS_SPACES)
+def test_store_load_elimination_dominated_block(addrspace):
+    """
+    Check that a store is forwarded to a load in a dominated basic
+    block, across a store which does not alias it
+    """
+    LOAD = addrspace.load_op
+    STORE = addrspace.store_op
+    pre = f"""
+    main:
+        %cond = param
+        %val = param
+        {STORE} 11, %val
+        jnz %cond, @then, @else
+    then:
+        {STORE} 100, 5
+        %1 = {LOAD} 11
+        sink %1
+    else:
+        stop
+    """
+    post = f"""
+    main:
+        %cond = param
+        %val = param
+        {STORE} 11, %val
+        jnz %cond, @then, @else
+    then:
+        {STORE} 100, 5
+        %1 = %val
+        sink %1
+    else:
+        stop
+    """
+    _check_pre_post(pre, post)
+
+
+@pytest.mark.parametrize("addrspace", RW_ADDRESS_SPACES)
+def test_load_elimination_branch_barrier(addrspace):
+    """
+    Check that a store on one of the paths into a basic block is a
+    barrier for the loads in the dominator
+    """
+    LOAD = addrspace.load_op
+    STORE = addrspace.store_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        {STORE} %ptr, 5
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %2 = {LOAD} %ptr
+        sink %1, %2
+    """
+    _check_no_change(pre)
+
+
+@pytest.mark.parametrize("addrspace", RW_ADDRESS_SPACES)
+def test_load_elimination_branch_no_alias(addrspace):
+    """
+    Check that a store on one of the paths into a basic block is not a
+    barrier if it does not alias the load
+    """
+    LOAD = addrspace.load_op
+    STORE = addrspace.store_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        {STORE} 100, 5
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %2 = {LOAD} %ptr
+        sink %1, %2
+    """
+    post = f"""
+    main:
+        %ptr = 11
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        {STORE} 100, 5
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %2 = %1
+        sink %1, %2
+    """
+    _check_pre_post(pre, post)
+
+
+@pytest.mark.parametrize("addrspace", RW_ADDRESS_SPACES)
+def test_load_elimination_dominated_block_barrier(addrspace):
+    """
+    Check that a store in the dominated basic block (before the load)
+    is a barrier
+    """
+    LOAD = addrspace.load_op
+    STORE = addrspace.store_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %other = param
+        %cond = param
+        %1 = {LOAD} %ptr
+        jnz %cond, @then, @else
+    then:
+        {STORE} %other, 5  ; may alias %ptr
+        %2 = {LOAD} %ptr
+        sink %1, %2
+    else:
+        stop
+    """
+    _check_no_change(pre)
+
+
+@pytest.mark.parametrize("addrspace", ADDRESS_SPACES)
+def test_load_elimination_loop(addrspace):
+    """
+    Check that a load inside a loop reuses the value loaded before the
+    loop if the loop does not write to the address space
+    """
+    LOAD = addrspace.load_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %i = 0
+        %1 = {LOAD} %ptr
+        jmp @loop
+    loop:
+        %cond = lt %i, 5
+        jnz %cond, @body, @exit
+    body:
+        %2 = {LOAD} %ptr
+        %i = add %i, %2
+        jmp @loop
+    exit:
+        sink %1, %i
+    """
+    post = f"""
+    main:
+        %ptr = 11
+        %i = 0
+        %1 = {LOAD} %ptr
+        jmp @loop
+    loop:
+        %cond = lt %i, 5
+        jnz %cond, @body, @exit
+    body:
+        %2 = %1
+        %i = add %i, %2
+        jmp @loop
+    exit:
+        sink %1, %i
+    """
+    _check_pre_post(pre, post, hevm=False)
+
+
+@pytest.mark.parametrize("addrspace", RW_ADDRESS_SPACES)
+def test_load_elimination_loop_barrier(addrspace):
+    """
+    Check that a store inside a loop is a barrier for the loads in the
+    loop, even if it comes after them
+    """
+    LOAD = addrspace.load_op
+    STORE = addrspace.store_op
+    pre = f"""
+    main:
+        %ptr = 11
+        %i = 0
+        %1 = {LOAD} %ptr
+        jmp @loop
+    loop:
+        %cond = lt %i, 5
+        jnz %cond, @body, @exit
+    body:
+        %2 = {LOAD} %ptr
+        %i = add %i, %2
+        {STORE} %ptr, %i
+        jmp @loop
+    exit:
+        sink %1, %i
+    """
+    _check_no_change(pre)
@@ -0,0 +1,184 @@
+from tests.venom_utils import parse_venom
+from vyper.venom.analysis import IRAnalysesCache, LoopAnalysis
+from vyper.venom.basicblock import IRLabel
+
+
+def _loop_analysis(code: str):
+    ctx = parse_venom(code)
+    fn = ctx.functions[IRLabel("main")]
+    ac = IRAnalysesCache(fn)
+    return fn, ac.request_analysis(LoopAnalysis)
+
+
+def _labels(bbs):
+    return {bb.label.value for bb in bbs}
+
+
+def test_no_loops():
+    code = """
+    function main {
+    main:
+        %cond = calldataload 0
+        jnz %cond, @then, @exit
+    then:
+        jmp @exit
+    exit:
+        stop
+    }
+    """
+    fn, loops = _loop_analysis(code)
+
+    assert loops.loops == []
+    for bb in fn.get_basic_blocks():
+        assert loops.get_loop(bb) is None
+        assert loops.loop_depth(bb) == 0
+        assert not loops.is_loop_header(bb)
+
+
+def test_simple_loop():
+    code = """
+    function main {
+    main:
+        %n = calldataload 0
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        stop
+    }
+    """
+    fn, loops = _loop_analysis(code)
+
+    (loop,) = loops.loops
+    header = fn.get_basic_block("header")
+    body = fn.get_basic_block("body")
+
+    assert loop.header == header
+    assert _labels(loop.blocks) == {"header", "body"}
+    assert _labels(loop.latches) == {"body"}
+    assert loop.preheader == fn.get_basic_block("main")
+    assert loop.parent is None
+    assert loop.depth == 1
+
+    assert loops.is_loop_header(header)
+    assert not loops.is_loop_header(body)
+    assert loops.get_loop(body) is loop
+    assert loops.loop_depth(body) == 1
+    assert loops.get_loop(fn.get_basic_block("exit")) is None
+
+
+def test_nested_loops():
+    code = """
+    function main {
+    main:
+        %n = calldataload 0
+        %i0 = 0
+        jmp @outer
+    outer:
+        %i = phi @main, %i0, @outer_latch, %i1
+        %cond = lt %i, %n
+        jnz %cond, @outer_body, @exit
+    outer_body:
+        %j0 = 0
+        jmp @inner
+    inner:
+        %j = phi @outer_body, %j0, @inner_body, %j1
+        %inner_cond = lt %j, %n
+        jnz %inner_cond, @inner_body, @outer_latch
+    inner_body:
+        %j1 = add %j, 1
+        jmp @inner
+    outer_latch:
+        %i1 = add %i, 1
+        jmp @outer
+    exit:
+        stop
+    }
+    """
+    fn, loops = _loop_analysis(code)
+
+    inner, outer = loops.loops
+    assert inner.header == fn.get_basic_block("inner")
+    assert outer.header == fn.get_basic_block("outer")
+
+    assert _labels(inner.blocks) == {"inner", "inner_body"}
+    assert _labels(outer.blocks) == {"outer", "outer_body", "inner", "inner_body", "outer_latch"}
+
+    assert inner.parent is outer
+    assert outer.children == [inner]
+    assert inner.depth == 2
+    assert outer.depth == 1
+    assert inner.preheader == fn.get_basic_block("outer_body")
+    assert outer.preheader == fn.get_basic_block("main")
+
+    assert loops.get_loop(fn.get_basic_block("inner_body")) is inner
+    assert loops.get_loop(fn.get_basic_block("outer_latch")) is outer
+    assert loops.loop_depth(fn.get_basic_block("inner_body")) == 2
+    assert loops.loop_depth(fn.get_basic_block("outer_body")) == 1
+
+
+def test_multiple_latches():
+    # e.g. a `continue` in the loop body: both back edges are in the
+    # same loop
+    code = """
+    function main {
+    main:
+        %n = calldataload 0
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @then, %i1, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %i1 = add %i, 1
+        %c = calldataload %i1
+        jnz %c, @then, @header
+    then:
+        jmp @header
+    exit:
+        stop
+    }
+    """
+    fn, loops = _loop_analysis(code)
+
+    (loop,) = loops.loops
+    assert _labels(loop.blocks) == {"header", "body", "then"}
+    assert _labels(loop.latches) == {"body", "then"}
+
+
+def test_no_preheader():
+    # the header has two predecessors outside of the loop
+    code = """
+    function main {
+    main:
+        %n = calldataload 0
+        %c = calldataload 32
+        jnz %c, @a, @b
+    a:
+        %i0 = 0
+        jmp @header
+    b:
+        %i2 = 1
+        jmp @header
+    header:
+        %i = phi @a, %i0, @b, %i2, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        stop
+    }
+    """
+    _, loops = _loop_analysis(code)
+
+    (loop,) = loops.loops
+    assert loop.preheader is None
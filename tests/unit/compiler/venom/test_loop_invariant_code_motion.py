@@ -0,0 +1,529 @@
+import pytest
+
+from tests.venom_utils import PrePostChecker, parse_venom
+from vyper.compiler.settings import OptimizationLevel
+from vyper.exceptions import StackTooDeep
+from vyper.venom import generate_assembly_experimental, run_passes_on
+from vyper.venom.passes import LICM, loop_invariant_code_motion
+
+pytestmark = pytest.mark.hevm
+
+_check_pre_post = PrePostChecker([LICM])
+
+
+def _check_no_change(pre):
+    _check_pre_post(pre, pre, hevm=False)
+
+
+def _loop(preheader: str, body: str, exit: str = "sink %i") -> str:
+    # a loop `for i in range(n)`, with `n` and `x` defined in the preheader
+    return f"""
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        {preheader}
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        {body}
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        {exit}
+    """
+
+
+def _guarded_loop(hoisted: str, body: str) -> str:
+    # `_loop`, where the condition is checked before the loop (and the
+    # instructions moved out of the loop are only executed if the body is)
+    return f"""
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        %1 = lt %i0, %n
+        jnz %1, @1_preheader, @exit
+    1_preheader:
+        {hoisted}
+        jmp @header
+    header:
+        %i = phi @1_preheader, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        {body}
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        %2 = phi @header, %i, @main, %i0
+        sink %2
+    """
+
+
+def test_hoist_invariant_arithmetic():
+    pre = _loop(
+        "",
+        """
+        %a = add %x, 32
+        %b = mul %a, %n
+        %c = add %b, %i
+        sstore %i, %c
+        """,
+    )
+    post = _loop(
+        """
+        %a = add %x, 32
+        %b = mul %a, %n
+        """,
+        """
+        %c = add %b, %i
+        sstore %i, %c
+        """,
+    )
+    _check_pre_post(pre, post)
+
+
+def test_no_hoist_variant():
+    pre = _loop(
+        "",
+        """
+        %a = add %i, 32
+        %b = mul %a, %x
+        sstore %i, %b
+        """,
+    )
+    _check_no_change(pre)
+
+
+@pytest.mark.parametrize("load", ["sload", "tload", "mload"])
+def test_hoist_load(load):
+    # the loop does not write to the location of the load. the load is
+    # only executed if the loop is
+    pre = _loop(
+        "",
+        f"""
+        %a = {load} %x
+        %b = add %a, %i
+        log 0, %b, 32
+        """,
+    )
+    post = _guarded_loop(
+        f"%a = {load} %x",
+        """
+        %b = add %a, %i
+        log 0, %b, 32
+        """,
+    )
+    _check_pre_post(pre, post)
+
+
+def test_hoist_calldataload():
+    # no guard is needed for instructions without effects
+    pre = _loop(
+        "",
+        """
+        %a = calldataload %x
+        %b = add %a, %i
+        log 0, %b, 32
+        """,
+    )
+    post = _loop(
+        "%a = calldataload %x",
+        """
+        %b = add %a, %i
+        log 0, %b, 32
+        """,
+    )
+    _check_pre_post(pre, post)
+
+
+def test_hoist_load_constant_bound():
+    # the loop is always executed, no guard is needed
+    pre = """
+    main:
+        %x = calldataload 0
+        %n = 20
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %a = sload %x
+        %b = add %a, %i
+        log 0, %b, 32
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    post = """
+    main:
+        %x = calldataload 0
+        %n = 20
+        %i0 = 0
+        %a = sload %x
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %b = add %a, %i
+        log 0, %b, 32
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    _check_pre_post(pre, post)
+
+
+def test_no_hoist_conditional_load():
+    # the load is not executed on every iteration, only the arithmetic
+    # (which has no effects) is moved out of the loop
+    pre = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @latch, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %c = eq %i, 12345
+        jnz %c, @then, @latch
+    then:
+        %y = add %x, 1
+        %a = sload %y
+        log 0, %a, 32
+        jmp @latch
+    latch:
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    post = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        %y = add %x, 1
+        jmp @header
+    header:
+        %i = phi @main, %i0, @latch, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %c = eq %i, 12345
+        jnz %c, @then, @latch
+    then:
+        %a = sload %y
+        log 0, %a, 32
+        jmp @latch
+    latch:
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    _check_pre_post(pre, post)
+
+
+def test_no_guard_header_with_effects():
+    # the condition cannot be checked before the loop, so the load in
+    # the body is not moved (but the load in the header is)
+    pre = """
+    main:
+        %x = calldataload 0
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %n = sload 0
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %a = sload %x
+        %b = add %a, %i
+        log 0, %b, 32
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    post = """
+    main:
+        %x = calldataload 0
+        %i0 = 0
+        %n = sload 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %a = sload %x
+        %b = add %a, %i
+        log 0, %b, 32
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    _check_pre_post(pre, post)
+
+
+@pytest.mark.parametrize(
+    "load,store", [("sload", "sstore"), ("tload", "tstore"), ("mload", "mstore")]
+)
+def test_no_hoist_clobbered_load(load, store):
+    pre = _loop(
+        "",
+        f"""
+        %a = {load} %x
+        %b = add %a, %i
+        {store} %i, %b
+        """,
+    )
+    _check_no_change(pre)
+
+
+def test_no_hoist_load_across_call():
+    pre = _loop(
+        "",
+        """
+        %a = sload %x
+        %b = call %a, %x, 0, 0, 0, 0, 0
+        """,
+    )
+    _check_no_change(pre)
+
+
+def test_no_hoist_mload_with_msize():
+    # the mload could change the value of msize
+    pre = _loop(
+        "",
+        """
+        %a = mload %x
+        %m = msize
+        %b = add %a, %m
+        sstore %i, %b
+        """,
+    )
+    _check_no_change(pre)
+
+
+def test_no_hoist_volatile():
+    pre = _loop(
+        "",
+        """
+        %g = gas
+        %r = staticcall %g, %x, 0, 0, 0, 0
+        sstore %i, %r
+        """,
+    )
+    _check_no_change(pre)
+
+
+def test_no_hoist_phi_operand():
+    # the operands of the phis are not moved out of the loop
+    pre = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %i1 = add %x, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    _check_no_change(pre)
+
+
+def test_hoist_nested_loops():
+    pre = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        jmp @outer
+    outer:
+        %i = phi @main, %i0, @outer_latch, %i1
+        %cond = lt %i, %n
+        jnz %cond, @outer_body, @exit
+    outer_body:
+        %j0 = 0
+        jmp @inner
+    inner:
+        %j = phi @outer_body, %j0, @inner_body, %j1
+        %inner_cond = lt %j, %n
+        jnz %inner_cond, @inner_body, @outer_latch
+    inner_body:
+        %a = sload %x
+        %b = add %a, %i
+        %c = add %b, %j
+        log 0, %c, 32
+        %j1 = add %j, 1
+        jmp @inner
+    outer_latch:
+        %i1 = add %i, 1
+        jmp @outer
+    exit:
+        sink %i
+    """
+    # `%a` and `%b` are moved out of the inner loop, which is guarded.
+    # `%a` stays in the outer loop, since the inner loop can be skipped
+    post = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        %i0 = 0
+        jmp @outer
+    outer:
+        %i = phi @main, %i0, @outer_latch, %i1
+        %cond = lt %i, %n
+        jnz %cond, @outer_body, @exit
+    outer_body:
+        %j0 = 0
+        %1 = lt %j0, %n
+        jnz %1, @1_preheader, @outer_latch
+    1_preheader:
+        %a = sload %x
+        %b = add %a, %i
+        jmp @inner
+    inner:
+        %j = phi @1_preheader, %j0, @inner_body, %j1
+        %inner_cond = lt %j, %n
+        jnz %inner_cond, @inner_body, @outer_latch
+    inner_body:
+        %c = add %b, %j
+        log 0, %c, 32
+        %j1 = add %j, 1
+        jmp @inner
+    outer_latch:
+        %i1 = add %i, 1
+        jmp @outer
+    exit:
+        sink %i
+    """
+    _check_pre_post(pre, post)
+
+
+def test_no_preheader():
+    pre = """
+    main:
+        %x = calldataload 0
+        %n = calldataload 32
+        jnz %x, @a, @b
+    a:
+        %i0 = 0
+        jmp @header
+    b:
+        %i2 = 1
+        jmp @header
+    header:
+        %i = phi @a, %i0, @b, %i2, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %c = add %x, 1
+        sstore %i, %c
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        sink %i
+    """
+    _check_no_change(pre)
+
+
+def test_max_live_vars(monkeypatch):
+    # at most 5 variables are live in the loop (%x, %n, %i, %a and %b at
+    # the sstore). each instruction moved out adds a live variable.
+    monkeypatch.setattr(loop_invariant_code_motion, "MAX_LIVE_VARS", 5)
+    pre = _loop(
+        "",
+        """
+        %a = add %x, 32
+        %b = add %x, 64
+        sstore %a, %b
+        """,
+    )
+    _check_no_change(pre)
+
+    monkeypatch.setattr(loop_invariant_code_motion, "MAX_LIVE_VARS", 6)
+    post = _loop(
+        "%a = add %x, 32",
+        """
+        %b = add %x, 64
+        sstore %a, %b
+        """,
+    )
+    _check_pre_post(pre, post)
+
+
+def _many_live_vars(num_live: int) -> str:
+    # a loop in which `num_live` variables are live: `%n`, `%i`, the
+    # running sum and `%v0`, `%v1`, ... which are all used in each
+    # iteration. each `%c` is loop-invariant
+    num_vars = num_live - 4
+    defs = "\n".join(f"%v{k} = calldataload {32 * k}" for k in range(num_vars))
+    body = "\n".join(
+        f"""
+        %s{k + 1} = add %s{k}, %v{k}
+        %c{k} = mul %v{k}, 3
+        sstore %c{k}, %s{k + 1}
+        """
+        for k in range(num_vars)
+    )
+    return f"""
+    function main {{
+    main:
+        %n = calldataload 1000
+        {defs}
+        %i0 = 0
+        jmp @header
+    header:
+        %i = phi @main, %i0, @body, %i1
+        %cond = lt %i, %n
+        jnz %cond, @body, @exit
+    body:
+        %s0 = %i
+        {body}
+        %i1 = add %i, 1
+        jmp @header
+    exit:
+        stop
+    }}
+    """
+
+
+def _compile_venom(code: str):
+    ctx = parse_venom(code)
+    run_passes_on(ctx, OptimizationLevel.GAS)
+    return generate_assembly_experimental(ctx)
+
+
+@pytest.mark.parametrize("num_live", [14, 15, 16])
+def test_max_live_vars_stack_depth(monkeypatch, num_live):
+    # at the limit, the loop still fits in the reach of DUP and SWAP
+    _compile_venom(_many_live_vars(num_live))
+
+    # moving all the invariant instructions out of the loop does not
+    monkeypatch.setattr(loop_invariant_code_motion, "MAX_LIVE_VARS", 100)
+    with pytest.raises(StackTooDeep):
+        _compile_venom(_many_live_vars(num_live))
@@ -1,3 +1,5 @@
+import random
+
 from vyper.venom.analysis import IRAnalysesCache
 from vyper.venom.analysis.mem_alias import MemoryAliasAnalysis
 from vyper.venom.basicblock import IRLabel
@@ -298,3 +300,30 @@ def test_may_alias_edge_cases2():
     assert all(
         volatile_loc2 in alias.alias_sets[loc] for loc in [loc4, loc5, loc6]
     ), "Volatile location should be in all aliasing locations' sets"
+
+
+def test_alias_sets_match_may_overlap():
+    pre = """
+    function _global {
+        _global:
+            stop
+    }
+    """
+    ctx = parse_venom(pre)
+    fn = ctx.functions[IRLabel("_global")]
+    ac = IRAnalysesCache(fn)
+    alias = MemoryAliasAnalysis(ac, fn)
+    alias.analyze()
+
+    rng = random.Random(0)
+    locs = []
+    for _ in range(300):
+        offset = rng.choice([None, rng.randrange(0, 512, 32), rng.randrange(0, 512)])
+        size = rng.choice([None, 0, 32, 32, 64, rng.randrange(1, 256)])
+        loc = MemoryLocation(offset=offset, size=size)
+        alias._analyze_mem_location(loc)
+        locs.append(loc)
+
+    for loc in locs:
+        expected = {x for x in locs if MemoryLocation.may_overlap(loc, x)}
+        assert set(alias.alias_sets[loc]) == expected, loc
@@ -0,0 +1,83 @@
+from tests.venom_utils import parse_from_basic_block
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, IRAnalysesCache, LivenessAnalysis
+from vyper.venom.basicblock import IRLiteral
+from vyper.venom.passes import SCCP, AssignElimination, RemoveUnusedVariablesPass
+from vyper.venom.passes.pass_manager import PassManager
+
+PRE = """
+_global:
+    %1 = param
+    %2 = 32
+    %3 = add %2, 64
+    %4 = add %1, %3
+    %5 = %4
+    sink %5
+"""
+
+
+def _setup(source=PRE):
+    ctx = parse_from_basic_block(source)
+    fn = next(iter(ctx.functions.values()))
+    return fn, IRAnalysesCache(fn)
+
+
+def test_snapshot():
+    fn, _ = _setup()
+    snapshot = fn.snapshot()
+    assert fn.snapshot() == snapshot
+
+    inst = fn.entry.instructions[2]
+    inst.operands[1] = IRLiteral(65)
+    assert fn.snapshot() != snapshot
+
+    # an equal operand is not a change
+    snapshot = fn.snapshot()
+    inst.operands[1] = IRLiteral(65)
+    assert fn.snapshot() == snapshot
+
+    fn.entry.instructions.pop()
+    assert fn.snapshot() != snapshot
+
+
+def test_invalidate_only_on_change():
+    fn, ac = _setup()
+    cfg = ac.request_analysis(CFGAnalysis)
+    dfg = ac.request_analysis(DFGAnalysis)
+    liveness = ac.request_analysis(LivenessAnalysis)
+
+    # nothing to remove
+    pass_obj = RemoveUnusedVariablesPass(ac, fn)
+    pass_obj.run_pass()
+    assert not pass_obj.changed
+    assert ac.request_analysis(LivenessAnalysis) is liveness
+
+    pass_obj = AssignElimination(ac, fn)
+    pass_obj.run_pass()
+    assert pass_obj.changed
+    # preserved by the pass
+    assert ac.request_analysis(CFGAnalysis) is cfg
+    assert ac.request_analysis(DFGAnalysis) is dfg
+    # not preserved by the pass
+    assert LivenessAnalysis not in ac.analyses_cache
+
+
+def test_skip_unchanged_repeats():
+    fn, ac = _setup()
+    pm = PassManager(ac, fn)
+
+    assert pm.run(SCCP)
+    # SCCP has reached a fixpoint
+    assert not pm.run(SCCP)
+    assert not pm.run(SCCP)
+    assert pm.stats["SCCP"].runs == 2
+    assert pm.stats["SCCP"].changes == 1
+    assert pm.stats["SCCP"].skips == 1
+
+    # the function changed, so SCCP has to run again
+    assert pm.run(AssignElimination)
+    assert not pm.run(SCCP)
+    assert pm.stats["SCCP"].runs == 3
+
+    # different arguments are a different pass
+    pm.run(SCCP, remove_allocas=False)
+    assert pm.stats["SCCP"].runs == 4
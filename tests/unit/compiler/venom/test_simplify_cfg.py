@@ -68,3 +68,58 @@ def test_block_merging():
     """
 
     _check_pre_post(pre, post)
+
+
+def test_empty_block_before_phi():
+    """
+    an empty block on one side of a branch is bypassed, and the phi
+    operand which came from it now comes from the branch
+    """
+    pre = """
+    _global:
+        %1 = param
+        %2 = param
+        jnz %1, @then, @else
+    then:
+        %3 = add %2, 1
+        jmp @join
+    else:
+        jmp @join
+    join:
+        %4 = phi @then, %3, @else, %2
+        sink %4
+    """
+    post = """
+    _global:
+        %1 = param
+        %2 = param
+        jnz %1, @then, @join
+    then:
+        %3 = add %2, 1
+        jmp @join
+    join:
+        %4 = phi @then, %3, @_global, %2
+        sink %4
+    """
+
+    _check_pre_post(pre, post)
+
+
+def test_empty_block_before_phi_same_predecessor():
+    """
+    the empty block cannot be bypassed if the branch already jumps to
+    the phi, since the phi could not tell the two edges apart
+    """
+    pre = """
+    _global:
+        %1 = param
+        %2 = param
+        jnz %1, @else, @join
+    else:
+        jmp @join
+    join:
+        %3 = phi @_global, %1, @else, %2
+        sink %3
+    """
+
+    _check_pre_post(pre, pre, hevm=False)
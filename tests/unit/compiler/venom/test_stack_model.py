@@ -0,0 +1,62 @@
+import pytest
+
+from vyper.venom.basicblock import IRLabel, IRLiteral, IRVariable
+from vyper.venom.stack_model import StackModel
+
+
+def _stack(*ops):
+    stack = StackModel()
+    for op in ops:
+        stack.push(op)
+    return stack
+
+
+def test_get_depth():
+    a, b, c = IRVariable("%a"), IRVariable("%b"), IRVariable("%c")
+    stack = _stack(a, b, a)
+
+    # the topmost match
+    assert stack.get_depth(a) == 0
+    assert stack.get_depth(b) == -1
+    assert stack.get_depth(c) is StackModel.NOT_IN_STACK
+
+    stack.pop()
+    assert stack.get_depth(a) == -1
+    stack.pop(2)
+    assert stack.get_depth(a) is StackModel.NOT_IN_STACK
+    assert stack.height == 0
+
+
+def test_stack_operations():
+    a, b, c = IRVariable("%a"), IRLiteral(1), IRLabel("c")
+    stack = _stack(a, b, c)
+
+    stack.swap(-2)
+    assert stack._stack == [c, b, a]
+    assert [stack.get_depth(op) for op in (a, b, c)] == [0, -1, -2]
+
+    stack.dup(-1)
+    assert stack._stack == [c, b, a, b]
+    assert stack.get_depth(b) == 0
+
+    d = IRVariable("%d")
+    stack.poke(0, d)
+    assert stack.get_depth(b) == -2
+    assert stack.get_depth(d) == 0
+
+    copy = stack.copy()
+    copy.swap(-3)
+    assert stack.get_depth(d) == 0
+    assert copy.get_depth(d) == -3
+
+
+def test_get_phi_depth():
+    a, b, c = IRVariable("%a"), IRVariable("%b"), IRVariable("%c")
+    stack = _stack(a, c)
+
+    assert stack.get_phi_depth([a, b]) == -1
+    assert stack.get_phi_depth([b]) is StackModel.NOT_IN_STACK
+
+    stack.push(b)
+    with pytest.raises(AssertionError, match="phi argument is not unique"):
+        stack.get_phi_depth([a, b])
@@ -1,4 +1,6 @@
-from vyper.venom.basicblock import IRVariable
+from vyper.venom.basicblock import IRInstruction, IRLabel, IRLiteral, IRVariable
+from vyper.venom.context import IRContext
+from vyper.venom.parser import parse_venom
 
 
 def test_variable_equality():
@@ -6,3 +8,70 @@ def test_variable_equality():
     v2 = IRVariable("%x")
     assert v1 == v2
     assert v1 != IRVariable("%y")
+
+
+def test_operand_equality_across_types():
+    assert IRVariable("%x") != IRLabel("%x")
+    assert IRLiteral(1) != IRVariable("%1")
+    assert IRLabel("foo") == IRLabel("foo", True)
+    assert hash(IRLabel("foo")) == hash(IRLabel("foo", True))
+
+
+def test_interned_operands():
+    ctx = IRContext()
+    x = ctx.get_variable("%x")
+    assert ctx.get_variable("%x") is x
+    # the % prefix is optional
+    assert ctx.get_variable("x") is x
+    assert x == IRVariable("%x")
+
+    label = ctx.get_label("foo")
+    assert ctx.get_label("foo") is label
+    assert ctx.get_label("foo", True) is not label
+    assert ctx.get_label("foo", True).is_symbol
+    assert not label.is_symbol
+
+    # interning is per context
+    assert IRContext().get_variable("%x") is not x
+
+
+def test_parsed_operands_are_interned():
+    ctx = parse_venom(
+        """
+        function main {
+        main:
+            %x = param
+            %y = add %x, %x
+            jmp @exit
+        exit:
+            return %y, %x
+        }
+        """
+    )
+    fn = ctx.get_function(IRLabel("main"))
+    main, exit_ = fn.get_basic_blocks()
+    x = main.instructions[0].output
+    assert all(op is x for op in main.instructions[1].operands)
+    assert exit_.instructions[0].operands[0] is x
+    assert main.instructions[-1].operands[0] is exit_.label
+
+
+def test_instruction_flags():
+    inst = IRInstruction("add", [IRLiteral(1), IRVariable("%x")])
+    assert inst.is_commutative and inst.flippable
+    assert not inst.is_volatile and not inst.is_bb_terminator
+
+    # the flags follow the opcode
+    inst.opcode = "lt"
+    assert not inst.is_commutative
+    assert inst.is_comparator and inst.flippable
+    inst.flip()
+    assert inst.opcode == "gt"
+
+    inst.opcode = "jmp"
+    assert inst.is_volatile and inst.is_bb_terminator
+    assert not inst.flippable
+
+    assert IRInstruction("phi", []).is_pseudo
+    assert IRInstruction("param", []).is_pseudo
+    assert not IRInstruction("store", [IRLiteral(1)]).is_pseudo
@@ -1,3 +1,5 @@
+import sys
+
 from vyper.venom.parser import parse_venom
 from vyper.venom.venom_to_assembly import VenomCompiler
 
@@ -34,3 +36,37 @@ def test_optimistic_swap_params():
 
     asm = VenomCompiler([ctx]).generate_evm()
     assert asm == ["SWAP2", "PUSH1", 117, "POP", "MSTORE", "MSTORE", "JUMP"]
+
+
+def test_deep_cfg():
+    # a chain of blocks which is deeper than the (default) recursion limit
+    recursion_limit = 1000
+    n = 2 * recursion_limit
+    blocks = []
+    for i in range(n):
+        blocks.append(
+            f"""
+        bb{i}:
+            %c{i} = calldataload {i}
+            jnz %c{i}, @bb{i + 1}, @exit{i}
+        exit{i}:
+            stop
+            """
+        )
+    code = "function foo {" + "".join(blocks) + f"bb{n}:\n stop\n}}"
+    ctx = parse_venom(code)
+
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(recursion_limit)
+    try:
+        asm = VenomCompiler([ctx]).generate_evm(no_optimize=True)
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+    # blocks are emitted in depth-first order
+    jumpdests = [asm[i - 1] for i, x in enumerate(asm) if x == "JUMPDEST"]
+    expected = []
+    for i in range(n):
+        expected.extend([f"_sym_bb{i}", f"_sym_exit{i}"])
+    expected.append(f"_sym_bb{n}")
+    assert jumpdests[: len(expected)] == expected
@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+
+# modules which should only be imported by the phases which need them
+LAZY_MODULES = (
+    "importlib.metadata",
+    "vyper.builtins.functions",
+    "vyper.codegen",
+    "vyper.ir",
+    "vyper.venom",
+)
+
+# (the time taken by the import is measured by
+# tests/benchmarks/import_time.py)
+_SCRIPT = """
+import json, sys
+import vyper
+print(json.dumps(list(sys.modules)))
+"""
+
+
+def _import_vyper():
+    # fresh interpreter, since vyper is already imported in this one
+    out = subprocess.check_output([sys.executable, "-c", _SCRIPT])
+    return json.loads(out)
+
+
+def test_import_is_lazy():
+    modules = _import_vyper()
+    for module in modules:
+        assert not module.startswith(LAZY_MODULES), module
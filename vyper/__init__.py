@@ -1,5 +1,3 @@
-from importlib.metadata import PackageNotFoundError
-from importlib.metadata import version as _version
 from pathlib import Path as _Path
 
 from vyper.compiler import compile_code, compile_from_file_input
@@ -14,11 +12,12 @@ else:
 
 __version__: str
 try:
-    __version__ = _version(__name__)
-except PackageNotFoundError:
-    from vyper.version import version
+    # generated at install time. (much faster than `importlib.metadata`)
+    from vyper.version import version as __version__
+except ImportError:  # pragma: nocover
+    from importlib.metadata import version as _version
 
-    __version__ = version
+    __version__ = _version(__name__)
 
 # pep440 version with commit hash
 __long_version__ = f"{__version__}+commit.{__commit__}"
@@ -50,11 +50,11 @@ NODE_SRC_ATTRIBUTES = (
     "end_lineno",
     "full_source_code",
     "lineno",
-    "node_source_code",
+    "node_source_span",
     "src",
 )
 
-DICT_AST_SKIPLIST = ("full_source_code", "node_source_code")
+DICT_AST_SKIPLIST = ("full_source_code", "node_source_span")
 
 
 def get_node(
@@ -339,6 +339,15 @@ class VyperNode:
         class_repr = f"{cls.__module__}.{cls.__qualname__}"
         return f"{class_repr}:\n{self._annotated_source}"
 
+    @property
+    def node_source_code(self) -> Optional[str]:
+        # sliced on demand, so that nodes do not have to keep (overlapping)
+        # copies of the source code around.
+        if self.full_source_code is None or self.node_source_span is None:
+            return None
+        start, end = self.node_source_span
+        return self.full_source_code[start:end]
+
     @property
     def _annotated_source(self):
         # return source with context / line/col info
@@ -17,7 +17,9 @@ def get_node(
 
 class VyperNode:
     full_source_code: str = ...
-    node_source_code: str = ...
+    node_source_span: tuple[int, int] = ...
+    @property
+    def node_source_code(self) -> str: ...
     lineno: int = ...
     col_offset: int = ...
     end_lineno: int = ...
@@ -1,6 +1,8 @@
 import ast as python_ast
+import contextlib
 import pickle
 import tokenize
+from collections import OrderedDict
 from decimal import Decimal
 from functools import cached_property
 from typing import Optional
@@ -9,7 +11,70 @@ from vyper.ast import nodes as vy_ast
 from vyper.ast.pre_parser import PreParser
 from vyper.exceptions import CompilerPanic, ParserException, SyntaxException
 from vyper.utils import sha256sum
-from vyper.warnings import Deprecation, vyper_warn
+from vyper.warnings import (
+    CapturedWarning,
+    Deprecation,
+    capture_warnings,
+    replay_warnings,
+    vyper_warn,
+)
+
+# default number of modules kept by a `ParseCache`
+DEFAULT_PARSE_CACHE_ENTRIES = 1024
+
+
+class ParseCache:
+    """
+    In-memory LRU cache of parsed (unannotated) modules.
+
+    Intended for long-running compiler processes, which parse the same
+    sources over and over. Modules are stored pickled, so every lookup
+    returns a fresh copy which can be annotated by the caller without
+    affecting the cached version.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PARSE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[bytes, list[CapturedWarning]]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[vy_ast.Module]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        pickled_module, captured = self._entries[key]
+        # re-emit any warnings raised while parsing, e.g. deprecated pragmas
+        replay_warnings(captured)
+        return pickle.loads(pickled_module)
+
+    def put(self, key: tuple, module: vy_ast.Module, captured: list[CapturedWarning]) -> None:
+        self._entries[key] = (pickle.dumps(module), captured)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_parse_cache: Optional[ParseCache] = None
+
+
+@contextlib.contextmanager
+def use_parse_cache(cache: Optional[ParseCache]):
+    """
+    Serve calls to `parse_to_ast` from `cache` for the duration of the
+    context.
+    """
+    global _parse_cache
+    tmp = _parse_cache
+    _parse_cache = cache
+    try:
+        yield
+    finally:
+        _parse_cache = tmp
 
 
 def parse_to_ast(
@@ -20,15 +85,31 @@ def parse_to_ast(
     add_fn_node: Optional[str] = None,
     is_interface: bool = False,
 ) -> vy_ast.Module:
+    args = (vyper_source, source_id, module_path, resolved_path, add_fn_node, is_interface)
     try:
-        return _parse_to_ast(
-            vyper_source, source_id, module_path, resolved_path, add_fn_node, is_interface
-        )
+        if _parse_cache is None:
+            return _parse_to_ast(*args)
+        return _parse_to_ast_cached(_parse_cache, *args)
     except SyntaxException as e:
         e.resolved_path = resolved_path
         raise e
 
 
+def _parse_to_ast_cached(cache: ParseCache, vyper_source: str, *args) -> vy_ast.Module:
+    # the source id and paths end up in the nodes, so they are part
+    # of the key along with the source code itself.
+    key = (sha256sum(vyper_source), *(str(arg) for arg in args))
+    ret = cache.get(key)
+    if ret is not None:
+        return ret
+
+    with capture_warnings() as captured:
+        ret = _parse_to_ast(vyper_source, *args)
+    cache.put(key, ret, captured)
+    replay_warnings(captured)
+    return ret
+
+
 def _parse_to_ast(
     vyper_source: str,
     source_id: int = 0,
@@ -98,9 +179,8 @@ def _parse_to_ast(
         raise new_e from None
 
     # some python AST node instances are singletons and are reused between
-    # parse() invocations. copy the python AST so that we are using fresh
-    # objects.
-    py_ast = _deepcopy_ast(py_ast)
+    # parse() invocations. replace them so that we are using fresh objects.
+    py_ast = _copy_shared_nodes(py_ast)
 
     # Add dummy function node to ensure local variables are treated as `AnnAssign`
     # instead of state variables (`VariableDecl`)
@@ -171,9 +251,37 @@ def annotate_python_ast(
     return parsed_ast
 
 
-def _deepcopy_ast(ast_node: python_ast.AST):
-    # pickle roundtrip is faster than copy.deepcopy() here.
-    return pickle.loads(pickle.dumps(ast_node))
+# python reuses the instances of these nodes (`Load`, `Add`, `Eq` etc.)
+# between parse() invocations, all other nodes are fresh objects.
+_SHARED_AST_TYPES = (
+    python_ast.expr_context,
+    python_ast.boolop,
+    python_ast.operator,
+    python_ast.unaryop,
+    python_ast.cmpop,
+)
+
+
+def _copy_shared_nodes(ast_node: python_ast.AST):
+    # replace just the shared instances, instead of copying the whole tree
+    # (which is much slower). like a deepcopy, each shared instance is
+    # replaced by a single fresh instance.
+    memo: dict[int, python_ast.AST] = {}
+
+    def _copy(item):
+        if id(item) not in memo:
+            memo[id(item)] = type(item)()
+        return memo[id(item)]
+
+    for node in python_ast.walk(ast_node):
+        for field, value in python_ast.iter_fields(node):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, _SHARED_AST_TYPES):
+                        value[i] = _copy(item)
+            elif isinstance(value, _SHARED_AST_TYPES):
+                setattr(node, field, _copy(value))
+    return ast_node
 
 
 class AnnotatingVisitor(python_ast.NodeTransformer):
@@ -276,7 +384,8 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         end_pos = self.line_offsets[node.end_lineno] + node.end_col_offset
 
         node.src = f"{start_pos}:{end_pos-start_pos}:{self._source_id}"
-        node.node_source_code = self._source_code[start_pos:end_pos]
+        # offsets into full_source_code, see `VyperNode.node_source_code`
+        node.node_source_span = (start_pos, end_pos)
 
         return super().generic_visit(node)
 
@@ -366,7 +475,7 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         try:
             fake_node = python_ast.parse(annotation_str).body[0]
             # do we need to fix location info here?
-            fake_node = _deepcopy_ast(fake_node)
+            fake_node = _copy_shared_nodes(fake_node)
         except SyntaxError as e:
             raise SyntaxException(
                 "invalid type annotation", self._source_code, node.lineno, node.col_offset
@@ -496,7 +605,8 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         """
         # modify vyper AST type according to the format of the literal value
         self.generic_visit(node)
-        value = node.node_source_code
+        start, end = node.node_source_span
+        value = self._source_code[start:end]
 
         # deduce non base-10 types based on prefix
         if value.lower()[:2] == "0x":
@@ -547,7 +657,7 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         if is_sub and is_num:
             node.operand.value = 0 - node.operand.value
             node.operand.col_offset = node.col_offset
-            node.operand.node_source_code = node.node_source_code
+            node.operand.node_source_span = node.node_source_span
             return node.operand
         else:
             return node
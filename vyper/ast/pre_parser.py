@@ -4,8 +4,6 @@ import re
 from collections import defaultdict
 from tokenize import COMMENT, NAME, OP, STRING, TokenError, TokenInfo, tokenize, untokenize
 
-from packaging.specifiers import InvalidSpecifier, SpecifierSet
-
 from vyper.compiler.settings import OptimizationLevel, Settings
 
 # seems a bit early to be importing this but we want it to validate the
@@ -18,6 +16,8 @@ def validate_version_pragma(version_str: str, location: tuple[str, int, int]) ->
     """
     Validates a version pragma directive against the current compiler version.
     """
+    from packaging.specifiers import InvalidSpecifier, SpecifierSet
+
     from vyper import __version__
 
     if len(version_str) == 0:
@@ -24,7 +24,7 @@ def compile_from_zip(file_name, output_formats, settings, no_bytecode_metadata):
     return outputs_from_compiler_data(compiler_data, output_formats)
 
 
-def compiler_data_from_zip(file_name, settings, no_bytecode_metadata):
+def open_archive(file_name) -> zipfile.ZipFile:
     with open(file_name, "rb") as f:
         bcontents = f.read()
 
@@ -42,6 +42,12 @@ def compiler_data_from_zip(file_name, settings, no_bytecode_metadata):
         except (zipfile.BadZipFile, binascii.Error):
             raise NotZipInput() from e1
 
+    return archive
+
+
+def compiler_data_from_zip(file_name, settings, no_bytecode_metadata):
+    archive = open_archive(file_name)
+
     fcontents = archive.read("MANIFEST/compilation_targets").decode("utf-8")
     compilation_targets = fcontents.splitlines()
 
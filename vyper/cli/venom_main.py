@@ -9,6 +9,7 @@ from vyper.compiler.settings import OptimizationLevel, Settings, set_global_sett
 from vyper.venom import generate_assembly_experimental, run_passes_on
 from vyper.venom.check_venom import check_venom_ctx
 from vyper.venom.parser import parse_venom
+from vyper.venom.serialization import is_serialized_venom, load_venom
 
 """
 Standalone entry point into venom compiler. Parses venom input and emits
@@ -24,7 +25,7 @@ def _parse_args(argv: list[str]):
     parser = argparse.ArgumentParser(
         description="Venom EVM IR parser & compiler", formatter_class=argparse.RawTextHelpFormatter
     )
-    parser.add_argument("input_file", help="Venom sourcefile", nargs="?")
+    parser.add_argument("input_file", help="Venom sourcefile (text or binary format)", nargs="?")
     parser.add_argument("--version", action="version", version=vyper.__long_version__)
     parser.add_argument(
         "--evm-version",
@@ -43,7 +44,7 @@ def _parse_args(argv: list[str]):
 
     if args.stdin:
         if not sys.stdin.isatty():
-            venom_source = sys.stdin.read()
+            venom_source = sys.stdin.buffer.read()
         else:
             # No input provided
             print("Error: --stdin flag used but no input provided")
@@ -52,10 +53,14 @@ def _parse_args(argv: list[str]):
         if args.input_file is None:
             print("Error: No input file provided, either use --stdin or provide a path")
             sys.exit(1)
-        with open(args.input_file, "r") as f:
+        with open(args.input_file, "rb") as f:
             venom_source = f.read()
 
-    ctx = parse_venom(venom_source)
+    # the input can be venom text, or serialized with `dump_venom()`
+    if is_serialized_venom(venom_source):
+        ctx = load_venom(venom_source)
+    else:
+        ctx = parse_venom(venom_source.decode("utf-8"))
 
     check_venom_ctx(ctx)
 
@@ -5,15 +5,33 @@ import inspect
 import json
 import os
 import sys
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
 import vyper
-import vyper.codegen.ir_node as ir_node
 import vyper.evm.opcodes as evm
-from vyper.cli import vyper_json
-from vyper.cli.compile_archive import NotZipInput, compile_from_zip
+from vyper.cli import vyper_json, vyper_server
+from vyper.cli.compile_archive import NotZipInput, compile_from_zip, open_archive
+from vyper.compiler.cache import VYPER_CACHE_DIR, CompilationCache
 from vyper.compiler.input_bundle import FileInput, FilesystemInputBundle
+from vyper.compiler.parallel import (
+    JobResult,
+    assign_source_ids,
+    get_num_jobs,
+    make_executor,
+    run_job,
+)
+from vyper.compiler.phases import enable_module_sharing
+from vyper.compiler.profiling import (
+    PROFILE_FORMATS,
+    VYPER_PROFILE,
+    VYPER_PROFILE_ALLOCATIONS,
+    VYPER_PROFILE_FORMAT,
+    PhaseProfiler,
+    profile_phase,
+    use_profiler,
+)
 from vyper.compiler.settings import VYPER_TRACEBACK_LIMIT, OptimizationLevel, Settings
 from vyper.typing import ContractPath, OutputFormats
 from vyper.utils import uniq
@@ -105,6 +123,10 @@ def _parse_args(argv):
         argv.remove("--standard-json")
         vyper_json._parse_args(argv)
         return
+    if "--server" in argv:
+        argv.remove("--server")
+        vyper_server._parse_args(argv)
+        return
 
     parser = argparse.ArgumentParser(
         description="Pythonic Smart Contract Language for the EVM",
@@ -164,6 +186,12 @@ def _parse_args(argv):
         help="Switch to standard JSON mode. Use `--standard-json -h` for available options.",
         action="store_true",
     )
+    parser.add_argument(
+        "--server",
+        help="Run a long-running compiler server, which accepts standard JSON\n"
+        "compilation requests over JSON-RPC. Use `--server -h` for available options.",
+        action="store_true",
+    )
     parser.add_argument(
         "--hex-ir", help="Represent integers as hex values in the IR", action="store_true"
     )
@@ -191,6 +219,51 @@ def _parse_args(argv):
     parser.add_argument(
         "-W", help="Control warnings", dest="warnings_control", choices=["error", "none"]
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache compiler outputs in the given directory and reuse them "
+        "across invocations (can also be set with the VYPER_CACHE_DIR "
+        "environment variable)",
+        default=VYPER_CACHE_DIR,
+        dest="cache_dir",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Compile input files in parallel, using up to N worker processes "
+        "(0 means one per CPU)",
+        type=int,
+        metavar="N",
+        dest="jobs",
+    )
+    parser.add_argument(
+        "--profile-phases",
+        help="Record the time and memory spent in each compiler phase, and\n"
+        "write a report to FILE (can also be set with the VYPER_PROFILE\n"
+        "environment variable). Input files are compiled serially, so it\n"
+        "cannot be combined with --jobs, and files whose outputs are in the\n"
+        "--cache-dir are not recompiled.",
+        default=VYPER_PROFILE,
+        metavar="FILE",
+        dest="profile_path",
+    )
+    parser.add_argument(
+        "--profile-format",
+        help="Format of the --profile-phases report (default json, or the\n"
+        "VYPER_PROFILE_FORMAT environment variable). `chrome` writes the\n"
+        "Chrome trace event format, e.g. for chrome://tracing or Perfetto.",
+        choices=PROFILE_FORMATS,
+        default=VYPER_PROFILE_FORMAT,
+        dest="profile_format",
+    )
+    parser.add_argument(
+        "--profile-allocations",
+        help="Also record memory allocations in the --profile-phases report\n"
+        "(slow; can also be set with VYPER_PROFILE_ALLOCATIONS=1).",
+        action="store_true",
+        default=VYPER_PROFILE_ALLOCATIONS,
+        dest="profile_allocations",
+    )
 
     args = parser.parse_args(argv)
 
@@ -207,6 +280,8 @@ def _parse_args(argv):
         sys.tracebacklimit = 0
 
     if args.hex_ir:
+        import vyper.codegen.ir_node as ir_node
+
         ir_node.AS_HEX_DEFAULT = True
 
     output_formats = tuple(uniq(args.format.split(",")))
@@ -220,6 +295,10 @@ def _parse_args(argv):
     if args.no_optimize and args.optimize:
         raise ValueError("Cannot use `--no-optimize` and `--optimize` at the same time!")
 
+    if args.profile_path is not None and args.jobs not in (None, 1):
+        # phases are only recorded in this process
+        raise ValueError("Cannot use `--profile-phases` with `--jobs`, profiled builds are serial")
+
     settings = Settings()
 
     # TODO: refactor to something like Settings.from_args()
@@ -245,7 +324,7 @@ def _parse_args(argv):
 
     include_sys_path = not args.disable_sys_path
 
-    compiled = compile_files(
+    compile_args = (
         args.input_files,
         output_formats,
         args.paths,
@@ -255,8 +334,20 @@ def _parse_args(argv):
         args.storage_layout,
         args.no_bytecode_metadata,
         args.warnings_control,
+        args.cache_dir,
     )
 
+    if args.profile_path is not None:
+        # phases are only recorded in this process, so compile serially
+        profiler = PhaseProfiler(trace_allocations=args.profile_allocations)
+        with use_profiler(profiler):
+            try:
+                compiled = compile_files(*compile_args)
+            finally:
+                profiler.write(args.profile_path, args.profile_format)
+    else:
+        compiled = compile_files(*compile_args, jobs=args.jobs)
+
     mode = "w"
     if output_formats == ("archive",):
         mode = "wb"
@@ -323,9 +414,18 @@ def compile_files(
     storage_layout_paths: list[str] = None,
     no_bytecode_metadata: bool = False,
     warnings_control: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
 ) -> dict:
     search_paths = get_search_paths(paths, include_sys_path)
     input_bundle = FilesystemInputBundle(search_paths)
+    # the files are compiled one after the other, so they can share
+    # the analysis of the modules they import.
+    enable_module_sharing(input_bundle)
+
+    cache = None
+    if cache_dir is not None:
+        cache = CompilationCache(cache_dir)
 
     show_version = False
     if "combined_json" in output_formats:
@@ -349,56 +449,165 @@ def compile_files(
     }
     final_formats = [translate_map.get(i, i) for i in output_formats]
 
+    storage_layouts: list[Optional[str]] = [None] * len(input_files)
     if storage_layout_paths:
         if len(storage_layout_paths) != len(input_files):
             raise ValueError(
                 f"provided {len(storage_layout_paths)} storage "
                 f"layouts, but {len(input_files)} source files"
             )
+        storage_layouts = list(storage_layout_paths)
 
     ret: dict[Any, Any] = {}
     if show_version:
         ret["version"] = vyper.__version__
 
-    for file_name in input_files:
-        file_path = Path(file_name)
+    compile_args = (final_formats, settings, show_gas_estimates, no_bytecode_metadata, cache)
+
+    num_jobs = min(get_num_jobs(jobs), len(input_files))
+    if num_jobs > 1:
+        ret.update(
+            _compile_files_parallel(
+                input_bundle, input_files, storage_layouts, num_jobs, compile_args
+            )
+        )
+        return ret
+
+    for file_name, storage_layout_path in zip(input_files, storage_layouts):
+        with profile_phase("compile", path=file_name):
+            output = _compile_file(
+                input_bundle, file_name, storage_layout_path, *compile_args, exc_handler=exc_handler
+            )
+        ret[Path(file_name)] = output
+
+    return ret
+
 
+def _compile_file(
+    input_bundle: FilesystemInputBundle,
+    file_name: str,
+    storage_layout_path: Optional[str],
+    output_formats: OutputFormats,
+    settings: Optional[Settings],
+    show_gas_estimates: bool,
+    no_bytecode_metadata: bool,
+    cache: Optional[CompilationCache],
+    exc_handler: Optional[Callable] = None,
+) -> dict:
+    try:
+        # try to compile in zipfile mode if it's a zip file, falling back
+        # to regular mode if it's not.
+        # we allow this instead of requiring a different mode (like
+        # `--zip`) so that verifier pipelines do not need a different
+        # workflow for archive files and single-file contracts.
+        return compile_from_zip(file_name, output_formats, settings, no_bytecode_metadata)
+    except NotZipInput:
+        pass
+
+    # note compile_from_zip also reads the file contents, so this
+    # is slightly inefficient (and also maybe allows for some very
+    # rare, strange race conditions if the file changes in between
+    # the two reads).
+    file = input_bundle.load_file(Path(file_name))
+    assert isinstance(file, FileInput)  # mypy hint
+
+    storage_layout_override = None
+    if storage_layout_path is not None:
+        storage_layout_override = input_bundle.load_json_file(storage_layout_path)
+
+    return vyper.compile_from_file_input(
+        file,
+        input_bundle=input_bundle,
+        output_formats=output_formats,
+        exc_handler=exc_handler,
+        settings=settings,
+        storage_layout_override=storage_layout_override,
+        show_gas_estimates=show_gas_estimates,
+        no_bytecode_metadata=no_bytecode_metadata,
+        cache=cache,
+    )
+
+
+def _load_inputs(
+    input_bundle: FilesystemInputBundle,
+    input_files: list[str],
+    storage_layouts: list[Optional[str]],
+) -> Iterator[Optional[FileInput]]:
+    # load inputs in the same order as a serial build
+    for file_name, storage_layout_path in zip(input_files, storage_layouts):
         try:
-            # try to compile in zipfile mode if it's a zip file, falling back
-            # to regular mode if it's not.
-            # we allow this instead of requiring a different mode (like
-            # `--zip`) so that verifier pipelines do not need a different
-            # workflow for archive files and single-file contracts.
-            output = compile_from_zip(file_name, final_formats, settings, no_bytecode_metadata)
-            ret[file_path] = output
+            open_archive(file_name)
+            yield None  # archives use their own input bundle
             continue
         except NotZipInput:
             pass
 
-        # note compile_from_zip also reads the file contents, so this
-        # is slightly inefficient (and also maybe allows for some very
-        # rare, strange race conditions if the file changes in between
-        # the two reads).
-        file = input_bundle.load_file(file_path)
+        file = input_bundle.load_file(Path(file_name))
         assert isinstance(file, FileInput)  # mypy hint
+        if storage_layout_path is not None:
+            input_bundle.load_json_file(storage_layout_path)
+        yield file
 
-        storage_layout_override = None
-        if storage_layout_paths:
-            storage_file_path = storage_layout_paths.pop(0)
-            storage_layout_override = input_bundle.load_json_file(storage_file_path)
-
-        output = vyper.compile_from_file_input(
-            file,
-            input_bundle=input_bundle,
-            output_formats=final_formats,
-            exc_handler=exc_handler,
-            settings=settings,
-            storage_layout_override=storage_layout_override,
-            show_gas_estimates=show_gas_estimates,
-            no_bytecode_metadata=no_bytecode_metadata,
-        )
 
-        ret[file_path] = output
+_worker_input_bundle: Optional[FilesystemInputBundle] = None
+
+
+def _init_worker(input_bundle: FilesystemInputBundle) -> None:
+    global _worker_input_bundle
+    _worker_input_bundle = input_bundle
+
+
+def _compile_file_worker(*args) -> dict:
+    assert _worker_input_bundle is not None
+    return _compile_file(_worker_input_bundle, *args)
+
+
+def _compile_files_parallel(
+    input_bundle: FilesystemInputBundle,
+    input_files: list[str],
+    storage_layouts: list[Optional[str]],
+    num_jobs: int,
+    compile_args: tuple,
+) -> dict:
+    output_formats, settings, show_gas_estimates, *_ = compile_args
+    inputs = _load_inputs(input_bundle, input_files, storage_layouts)
+    failed = assign_source_ids(input_bundle, inputs, settings)
+
+    ret = {}
+    with make_executor(num_jobs, _init_worker, (input_bundle,)) as executor:
+        jobs: list[JobResult | Future] = [
+            (
+                failed[i]
+                if i in failed
+                else executor.submit(
+                    run_job, _compile_file_worker, file_name, layout_path, *compile_args
+                )
+            )
+            for i, (file_name, layout_path) in enumerate(zip(input_files, storage_layouts))
+        ]
+
+        # collect results in input order, so that output (including
+        # warnings and errors) is deterministic
+        for file_name, job in zip(input_files, jobs):
+            try:
+                result = job if isinstance(job, JobResult) else job.result()
+                output = result.unwrap()
+            except Exception as e:
+                try:
+                    exc_handler(file_name, e)
+                except BaseException:
+                    # don't wait for the remaining files
+                    executor.shutdown(cancel_futures=True)
+                    raise
+                continue
+
+            ret[Path(file_name)] = output
+
+    if show_gas_estimates and ("ir" in output_formats or "ir_runtime" in output_formats):
+        # replicate the side effect of `build_ir_output()` in this process
+        from vyper.codegen.ir_node import IRnode
+
+        IRnode.repr_show_gas = True
 
     return ret
 
@@ -4,14 +4,25 @@ import argparse
 import json
 import sys
 import warnings
+from concurrent.futures import Future
 from pathlib import Path, PurePath
 from typing import Any, Callable, Hashable, Optional
 
 import vyper
+from vyper.compiler.cache import CompilationCache
 from vyper.compiler.input_bundle import FileInput, JSONInput, JSONInputBundle, _normpath
+from vyper.compiler.parallel import (
+    JobResult,
+    assign_source_ids,
+    get_num_jobs,
+    make_executor,
+    run_job,
+)
+from vyper.compiler.phases import enable_module_sharing
 from vyper.compiler.settings import OptimizationLevel, Settings
 from vyper.evm.opcodes import EVM_VERSIONS
 from vyper.exceptions import JSONError
+from vyper.semantics.analysis.imports import ModuleCache
 from vyper.utils import OrderedSet, keccak256
 from vyper.warnings import Deprecation, vyper_warn
 
@@ -71,6 +82,15 @@ def _parse_args(argv):
         help="Show python traceback on error instead of returning JSON",
         action="store_true",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Compile the compilation targets in parallel, using up to N worker "
+        "processes (0 means one per CPU). Overrides the `jobs` setting.",
+        type=int,
+        metavar="N",
+        dest="jobs",
+    )
 
     args = parser.parse_args(argv)
     if args.input_file:
@@ -83,7 +103,7 @@ def _parse_args(argv):
 
     exc_handler = exc_handler_raises if args.traceback else exc_handler_to_dict
     output_json = json.dumps(
-        compile_json(input_json, exc_handler, json_path),
+        compile_json(input_json, exc_handler, json_path, jobs=args.jobs),
         indent=2 if args.pretty_json else None,
         sort_keys=True,
         default=str,
@@ -298,6 +318,15 @@ def get_search_paths(input_dict: dict) -> list[PurePath]:
     return [PurePath(p) for p in ret]
 
 
+def get_jobs(input_dict: dict) -> Optional[int]:
+    jobs = input_dict["settings"].get("jobs")
+    if jobs is None:
+        return None
+    if not isinstance(jobs, int) or isinstance(jobs, bool) or jobs < 0:
+        raise JSONError(f"invalid 'jobs' (expected a non-negative integer): {jobs}")
+    return jobs
+
+
 def get_settings(input_dict: dict) -> Settings:
     evm_version = get_evm_version(input_dict)
 
@@ -337,7 +366,11 @@ def get_settings(input_dict: dict) -> Settings:
 
 
 def compile_from_input_dict(
-    input_dict: dict, exc_handler: Callable = exc_handler_raises
+    input_dict: dict,
+    exc_handler: Callable = exc_handler_raises,
+    jobs: Optional[int] = None,
+    cache: Optional[CompilationCache] = None,
+    module_cache: Optional[ModuleCache] = None,
 ) -> tuple[dict, dict]:
     if input_dict["language"] != "Vyper":
         raise JSONError(f"Invalid language '{input_dict['language']}' - Only Vyper is supported.")
@@ -348,6 +381,9 @@ def compile_from_input_dict(
 
     integrity = input_dict.get("integrity")
 
+    if jobs is None:
+        jobs = get_jobs(input_dict)
+
     sources = get_inputs(input_dict)
     storage_layout_overrides = get_storage_layout_overrides(input_dict)
     output_formats = get_output_formats(input_dict)
@@ -355,27 +391,28 @@ def compile_from_input_dict(
     search_paths = get_search_paths(input_dict)
 
     input_bundle = JSONInputBundle(sources, search_paths=search_paths)
+    # targets are compiled one after the other, so they can share
+    # the analysis of the modules they import.
+    enable_module_sharing(input_bundle, module_cache)
+
+    targets = [
+        (path, output_formats[path], storage_layout_overrides.get(path))
+        for path in compilation_targets
+    ]
+    compile_args = (integrity, settings, no_bytecode_metadata, cache)
+
+    num_jobs = min(get_num_jobs(jobs), len(targets))
+    if num_jobs > 1:
+        return _compile_targets_parallel(input_bundle, targets, compile_args, num_jobs, exc_handler)
 
     res, warnings_dict = {}, {}
     warnings.simplefilter("always")
-    for contract_path in compilation_targets:
-        storage_layout_override = storage_layout_overrides.get(contract_path)
+    for contract_path, formats, storage_layout_override in targets:
         with warnings.catch_warnings(record=True) as caught_warnings:
             try:
-                # use load_file to get a unique source_id
-                file = input_bundle.load_file(contract_path)
-                assert isinstance(file, FileInput)  # mypy hint
-                data = vyper.compile_from_file_input(
-                    file,
-                    input_bundle=input_bundle,
-                    output_formats=output_formats[contract_path],
-                    storage_layout_override=storage_layout_override,
-                    integrity_sum=integrity,
-                    settings=settings,
-                    no_bytecode_metadata=no_bytecode_metadata,
+                data = _compile_target(
+                    input_bundle, contract_path, formats, storage_layout_override, *compile_args
                 )
-                assert isinstance(data, dict)
-                data["source_id"] = file.source_id
             except Exception as exc:
                 return exc_handler(contract_path, exc, "compiler"), {}
             res[contract_path] = data
@@ -385,6 +422,90 @@ def compile_from_input_dict(
     return res, warnings_dict
 
 
+def _compile_target(
+    input_bundle: JSONInputBundle,
+    contract_path: PurePath,
+    output_formats: list[str],
+    storage_layout_override: Optional[JSONInput],
+    integrity: Optional[str],
+    settings: Settings,
+    no_bytecode_metadata: bool,
+    cache: Optional[CompilationCache],
+) -> dict:
+    # use load_file to get a unique source_id
+    file = input_bundle.load_file(contract_path)
+    assert isinstance(file, FileInput)  # mypy hint
+    data = vyper.compile_from_file_input(
+        file,
+        input_bundle=input_bundle,
+        output_formats=output_formats,
+        storage_layout_override=storage_layout_override,
+        integrity_sum=integrity,
+        settings=settings,
+        no_bytecode_metadata=no_bytecode_metadata,
+        cache=cache,
+    )
+    assert isinstance(data, dict)
+    data["source_id"] = file.source_id
+    return data
+
+
+_worker_input_bundle: Optional[JSONInputBundle] = None
+
+
+def _init_worker(input_bundle: JSONInputBundle) -> None:
+    global _worker_input_bundle
+    _worker_input_bundle = input_bundle
+
+
+def _compile_target_worker(*args) -> dict:
+    assert _worker_input_bundle is not None
+    return _compile_target(_worker_input_bundle, *args)
+
+
+def _compile_targets_parallel(
+    input_bundle: JSONInputBundle,
+    targets: list[tuple[PurePath, list[str], Optional[JSONInput]]],
+    compile_args: tuple,
+    num_jobs: int,
+    exc_handler: Callable,
+) -> tuple[dict, dict]:
+    _, settings, _, _ = compile_args
+    file_inputs = (input_bundle.load_file(path) for path, _, _ in targets)
+    failed = assign_source_ids(input_bundle, file_inputs, settings)
+
+    res, warnings_dict = {}, {}
+    with make_executor(num_jobs, _init_worker, (input_bundle,)) as executor:
+        jobs: list[JobResult | Future] = [
+            (
+                failed[i]
+                if i in failed
+                else executor.submit(run_job, _compile_target_worker, *target, *compile_args)
+            )
+            for i, target in enumerate(targets)
+        ]
+
+        # collect results in target order, so that the output (including
+        # which error is reported) is the same as for a serial build
+        for (contract_path, _, _), job in zip(targets, jobs):
+            result: JobResult = job if isinstance(job, JobResult) else job.result()
+            if result.exception is not None:
+                executor.shutdown(cancel_futures=True)
+                return exc_handler(contract_path, result.exception, "compiler"), {}
+            res[contract_path] = result.value
+            if result.warnings:
+                warnings_dict[contract_path] = [_to_warning_message(w) for w in result.warnings]
+
+    return res, warnings_dict
+
+
+def _to_warning_message(captured: tuple[Any, str]) -> warnings.WarningMessage:
+    # convert a warning captured in a worker process to the same
+    # shape as the ones caught by `warnings.catch_warnings()`
+    category, message = captured
+    return warnings.WarningMessage(category(message), category, "", 0)
+
+
 # convert output of compile_input_dict to final output format
 def format_to_output_dict(compiler_data: dict) -> dict:
     output_dict: dict = {"compiler": f"vyper-{vyper.__version__}", "contracts": {}, "sources": {}}
@@ -469,6 +590,9 @@ def compile_json(
     input_json: dict | str,
     exc_handler: Callable = exc_handler_raises,
     json_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    cache: Optional[CompilationCache] = None,
+    module_cache: Optional[ModuleCache] = None,
 ) -> dict:
     try:
         if isinstance(input_json, str):
@@ -481,7 +605,9 @@ def compile_json(
             input_dict = input_json
 
         try:
-            compiler_data, warn_data = compile_from_input_dict(input_dict, exc_handler)
+            compiler_data, warn_data = compile_from_input_dict(
+                input_dict, exc_handler, jobs, cache, module_cache
+            )
             if "errors" in compiler_data:
                 return compiler_data
         except KeyError as exc:
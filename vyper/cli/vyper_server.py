@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+"""
+long-running compiler process, speaking (newline-delimited) JSON-RPC 2.0
+over stdin/stdout or a unix socket.
+
+keeping the process alive avoids paying for interpreter startup and
+imports on every compilation, and lets compilations share caches: the
+builtin interfaces (`_builtins_cache`), parsed and analyzed modules and
+compiler outputs are reused across requests.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socketserver
+import stat
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+import vyper
+from vyper.ast.parse import ParseCache, use_parse_cache
+from vyper.cli.vyper_json import compile_json, exc_handler_to_dict
+from vyper.compiler.cache import VYPER_CACHE_DIR, CompilationCache, InMemoryCompilationCache
+from vyper.semantics.analysis.imports import ModuleCache
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class JSONRPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Vyper programming language for EVM - Compiler Server",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"{vyper.__version__}+commit.{vyper.__commit__}"
+    )
+    parser.add_argument(
+        "--socket",
+        help="Listen on a unix socket at PATH instead of reading requests from stdin.",
+        metavar="PATH",
+        dest="socket_path",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache compiler outputs on disk, in DIR. By default, outputs are\n"
+        "cached in memory for the lifetime of the server. Can also be set\n"
+        "with the VYPER_CACHE_DIR environment variable.",
+        default=VYPER_CACHE_DIR,
+        metavar="DIR",
+        dest="cache_dir",
+    )
+
+    args = parser.parse_args(argv)
+
+    cache: CompilationCache
+    if args.cache_dir is not None:
+        cache = CompilationCache(args.cache_dir)
+    else:
+        cache = InMemoryCompilationCache()
+
+    server = CompilerServer(cache)
+    if args.socket_path is not None:
+        server.serve_unix_socket(args.socket_path)
+    else:
+        server.serve(sys.stdin, sys.stdout)
+
+
+class CompilerServer:
+    """
+    Handles JSON-RPC requests. Supported methods:
+
+    * `compile`: `params` is a standard JSON input object, the result is
+      the standard JSON output object (compilation errors are reported
+      in its `errors` field, as for `vyper-json`).
+    * `version`: returns the compiler version.
+    * `clear_cache`: drops all cached modules and outputs.
+    * `shutdown`: stops the server after responding.
+    """
+
+    def __init__(self, cache: Optional[CompilationCache] = None):
+        self.cache = cache if cache is not None else InMemoryCompilationCache()
+        self.parse_cache = ParseCache()
+        self.module_cache = ModuleCache()
+        self.is_shutdown = False
+
+    def handle_line(self, line: str) -> Optional[str]:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return _dumps(_error_response(None, PARSE_ERROR, f"Parse error: {e}"))
+
+        response = self.handle_request(request)
+        if response is None:
+            return None
+        return _dumps(response)
+
+    def handle_request(self, request: Any) -> Optional[dict]:
+        request_id = None
+        try:
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0":
+                raise JSONRPCError(INVALID_REQUEST, "Invalid Request")
+            request_id = request.get("id")
+            method = request.get("method")
+            if not isinstance(method, str):
+                raise JSONRPCError(INVALID_REQUEST, "Invalid Request")
+
+            result = self._dispatch(method, request.get("params"))
+
+        except JSONRPCError as e:
+            return _error_response(request_id, e.code, e.message)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            return _error_response(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+
+        if "id" not in request:
+            # notification, no response
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _dispatch(self, method: str, params: Any) -> Any:
+        if method == "compile":
+            if not isinstance(params, dict):
+                raise JSONRPCError(INVALID_PARAMS, "expected standard JSON input object")
+            return self.compile(params)
+        if method == "version":
+            return {"version": vyper.__version__, "commit": vyper.__commit__}
+        if method == "clear_cache":
+            self.parse_cache.clear()
+            self.module_cache.clear()
+            self.cache.clear()
+            return None
+        if method == "shutdown":
+            self.is_shutdown = True
+            return None
+        raise JSONRPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    def compile(self, input_dict: dict) -> dict:
+        # anything the compiler prints must not end up in the response stream
+        with contextlib.redirect_stdout(sys.stderr), use_parse_cache(self.parse_cache):
+            return compile_json(
+                input_dict, exc_handler_to_dict, cache=self.cache, module_cache=self.module_cache
+            )
+
+    def serve(self, reader: TextIO, writer: TextIO) -> None:
+        for line in reader:
+            if line.strip() == "":
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                writer.write(response + "\n")
+                writer.flush()
+            if self.is_shutdown:
+                break
+
+    def serve_unix_socket(self, socket_path: str) -> None:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise OSError("unix sockets are not supported on this platform")
+
+        path = Path(socket_path)
+        with contextlib.suppress(FileNotFoundError):
+            # remove a stale socket left behind by a previous server
+            if stat.S_ISSOCK(path.stat().st_mode):
+                path.unlink()
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = (line.decode("utf-8") for line in self.rfile)
+                writer = _SocketWriter(self.wfile)
+                server.serve(reader, writer)  # type: ignore[arg-type]
+
+        # requests are handled one at a time, since the compiler is not
+        # thread-safe.
+        with socketserver.UnixStreamServer(str(path), Handler) as unix_server:
+            try:
+                while not self.is_shutdown:
+                    unix_server.handle_request()
+            finally:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+
+
+class _SocketWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, s: str) -> None:
+        self.wfile.write(s.encode("utf-8"))
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _dumps(response: dict) -> str:
+    return json.dumps(response, sort_keys=True, default=str)
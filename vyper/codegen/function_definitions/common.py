@@ -26,10 +26,19 @@ class FrameInfo:
 @dataclass
 class _FuncIRInfo:
     func_t: ContractFunctionT
-    gas_estimate: Optional[int] = None
+    # the IR of the function, which the gas estimate is computed from
+    gas_estimate_ir: Optional[IRnode] = None
     frame_info: Optional[FrameInfo] = None
     func_ir: Optional["InternalFuncIR"] = None
 
+    @property
+    def gas_estimate(self) -> Optional[int]:
+        # computed on demand, since it is only needed for the
+        # `--show-gas-estimates` output
+        if self.gas_estimate_ir is None:
+            return None
+        return self.gas_estimate_ir.gas
+
     @property
     def visibility(self):
         return "internal" if self.func_t.is_internal else "external"
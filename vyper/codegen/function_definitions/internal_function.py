@@ -84,7 +84,7 @@ def generate_ir_for_internal_function(
     ir_node.passthrough_metadata["context"] = context
 
     # tag gas estimate and frame info
-    func_t._ir_info.gas_estimate = ir_node.gas
+    func_t._ir_info.gas_estimate_ir = ir_node
     tag_frame_info(func_t, context)
 
     ret = InternalFuncIR(ir_node)
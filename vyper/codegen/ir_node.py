@@ -2,11 +2,10 @@ import contextlib
 import copy
 import re
 from enum import Enum, auto
-from functools import cached_property
 from typing import Any, List, Optional, Union
 
 import vyper.ast as vy_ast
-from vyper.compiler.settings import VYPER_COLOR_OUTPUT, get_global_settings
+from vyper.compiler.settings import VYPER_CHECK_IR, VYPER_COLOR_OUTPUT, get_global_settings
 from vyper.evm.address_space import AddrSpace
 from vyper.evm.opcodes import get_ir_opcodes
 from vyper.exceptions import CodegenPanic, CompilerPanic
@@ -127,21 +126,96 @@ class _WithBuilder:
             return ret
 
 
+class _slot_cached_property:
+    """
+    Like `functools.cached_property`, but for classes with `__slots__`. The
+    value is cached in the slot `_cached_<name>`, which the class needs to
+    declare.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.__doc__ = fn.__doc__
+
+    def __set_name__(self, owner, name):
+        self.slot = getattr(owner, f"_cached_{name}")
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        try:
+            return self.slot.__get__(obj, cls)
+        except AttributeError:
+            ret = self.fn(obj)
+            self.slot.__set__(obj, ret)
+            return ret
+
+
+# pass and pop are used to push/pop values on the stack to be consumed
+# for internal functions, therefore they are allowed as zero valency
+# arguments.
+_ZERO_VALENCY_WHITELIST = frozenset(("pass", "pop"))
+
+# (non-opcode) IR statements which do not push a value on the stack
+_ZERO_VALENCY_VALUES = frozenset(
+    ("repeat", "goto", "exit_to", "label", "unique_symbol", "var_list", "deploy")
+)
+
+
 # Data structure for IR parse tree
 class IRnode:
+    # note: IRnodes are created in large numbers, so they use slots. the
+    # attributes which are only set on a few nodes (e.g. `_writes`,
+    # `invoked_function_ir`) and the cached properties are left unset
+    # until they are needed.
+    __slots__ = (
+        "value",
+        "args",
+        "typ",
+        "location",
+        "ast_source",
+        "error_msg",
+        "annotation",
+        "mutable",
+        "add_gas_estimate",
+        "encoding",
+        "as_hex",
+        "is_self_call",
+        "func_ir",
+        "common_ir",
+        # for bytestrings, if we have `is_source_bytes_literal`, we can perform
+        # certain optimizations like eliding the copy.
+        "is_source_bytes_literal",
+        "valency",
+        # the gas estimate, computed on demand (cf. `gas`)
+        "_gas",
+        # the gas of the opcode, if this is an opcode node. it depends on the
+        # evm version, so it is looked up when the node is created.
+        "_opcode_gas",
+        "_passthrough_metadata",
+        # set by codegen on some nodes
+        "_referenced_variables",
+        "_writes",
+        "invoked_function_ir",
+        # caches for the `_slot_cached_property`s
+        "_cached_unique_symbols",
+        "_cached_referenced_variables",
+        "_cached_variable_writes",
+        "_cached_contains_risky_call",
+        "_cached_contains_writeable_call",
+        "_cached_contains_self_call",
+        "_cached_optimized",
+    )
+
     repr_show_gas = False
-    _gas: int
+    _gas: Optional[int]
     valency: int
     args: List["IRnode"]
     value: Union[str, int]
     is_self_call: bool
-    passthrough_metadata: dict[str, Any]
     func_ir: Any
     common_ir: Any
-
-    # for bytestrings, if we have `is_source_bytes_literal`, we can perform
-    # certain optimizations like eliding the copy.
-    is_source_bytes_literal: bool = False
+    is_source_bytes_literal: bool
 
     def __init__(
         self,
@@ -175,198 +249,242 @@ class IRnode:
         self.encoding = encoding
         self.as_hex = AS_HEX_DEFAULT
         self.is_self_call = is_self_call
-        self.passthrough_metadata = passthrough_metadata or {}
+        # most nodes have no metadata, cf. `passthrough_metadata`
+        self._passthrough_metadata = passthrough_metadata or None
         self.func_ir = None
         self.common_ir = None
+        self.is_source_bytes_literal = False
+        self._gas = None
+        self._opcode_gas = None
 
         assert self.value is not None, "None is not allowed as IRnode value"
 
         # Determine this node's valency (1 if it pushes a value on the stack,
-        # 0 otherwise) and checks to make sure the number and valencies of
-        # children are correct. Also, find an upper bound on gas consumption
-        # Numbers
-        if isinstance(self.value, int):
-            assert len(self.args) == 0, "int can't have arguments"
-
-            # integers must be in the range (MIN_INT256, MAX_UINT256)
-            assert -(2**255) <= self.value < 2**256, "out of range"
-
+        # 0 otherwise). The upper bound on gas consumption is only computed
+        # when it is needed, cf. `gas`.
+        if isinstance(value, int):
             self.valency = 1
-            self._gas = 5
-        elif isinstance(self.value, bytes):
+        elif isinstance(value, bytes):
             # a literal bytes value, probably inside a "data" node.
-            assert len(self.args) == 0, "bytes can't have arguments"
-
             self.valency = 0
-            self._gas = 0
-
-        elif isinstance(self.value, str):
-            # Opcodes and pseudo-opcodes (e.g. clamp)
-            if self.value.upper() in get_ir_opcodes():
-                _, ins, outs, gas = get_ir_opcodes()[self.value.upper()]
+        elif isinstance(value, str):
+            opcode_info = get_ir_opcodes().get(value.upper())
+            if opcode_info is not None:
+                # Opcodes and pseudo-opcodes (e.g. clamp)
+                _, _, outs, gas = opcode_info
                 self.valency = outs
-                assert (
-                    len(self.args) == ins
-                ), f"Number of arguments mismatched: {self.value} {self.args}"
-                # We add 2 per stack height at push time and take it back
-                # at pop time; this makes `break` easier to handle
-                self._gas = gas + 2 * (outs - ins)
-                for arg in self.args:
-                    # pop and pass are used to push/pop values on the stack to be
-                    # consumed for internal functions, therefore we whitelist this as a zero valency
-                    # allowed argument.
-                    zero_valency_whitelist = {"pass", "pop"}
-                    assert (
-                        arg.valency == 1 or arg.value in zero_valency_whitelist
-                    ), f"invalid argument to `{self.value}`: {arg}"
-
-                    self._gas += arg.gas
-                # Dynamic gas cost: 8 gas for each byte of logging data
-                if self.value.upper()[0:3] == "LOG" and isinstance(self.args[1].value, int):
-                    self._gas += self.args[1].value * 8
-                # Dynamic gas cost: non-zero-valued call
-                if self.value.upper() == "CALL" and self.args[2].value != 0:
-                    self._gas += 34000
-                # Dynamic gas cost: filling sstore (ie. not clearing)
-                elif self.value.upper() == "SSTORE" and self.args[1].value != 0:
-                    self._gas += 15000
-                # Dynamic gas cost: calldatacopy
-                elif self.value.upper() in ("CALLDATACOPY", "CODECOPY", "EXTCODECOPY"):
-                    size = 34000
-                    size_arg_index = 3 if self.value.upper() == "EXTCODECOPY" else 2
-                    size_arg = self.args[size_arg_index]
-                    if isinstance(size_arg.value, int):
-                        size = size_arg.value
-                    self._gas += ceil32(size) // 32 * 3
-                # Gas limits in call
-                if self.value.upper() == "CALL" and isinstance(self.args[0].value, int):
-                    self._gas += self.args[0].value
-            # If statements
-            elif self.value == "if":
-                if len(self.args) == 3:
-                    self._gas = self.args[0].gas + max(self.args[1].gas, self.args[2].gas) + 3
-                if len(self.args) == 2:
-                    self._gas = self.args[0].gas + self.args[1].gas + 17
-                assert (
-                    self.args[0].valency > 0
-                ), f"zerovalent argument as a test to an if statement: {self.args[0]}"
-                assert len(self.args) in (2, 3), "if statement can only have 2 or 3 arguments"
-                self.valency = self.args[1].valency
-            # With statements: with <var> <initial> <statement>
-            elif self.value == "with":
-                assert len(self.args) == 3, self
-                assert len(self.args[0].args) == 0 and isinstance(
-                    self.args[0].value, str
-                ), f"first argument to with statement must be a variable name: {self.args[0]}"
-                assert (
-                    self.args[1].valency == 1 or self.args[1].value == "pass"
-                ), f"zerovalent argument to with statement: {self.args[1]}"
-                self.valency = self.args[2].valency
-                self._gas = sum([arg.gas for arg in self.args]) + 5
-            # Repeat statements: repeat <index_name> <startval> <rounds> <rounds_bound> <body>
-            elif self.value == "repeat":
-                assert (
-                    len(self.args) == 5
-                ), "repeat(index_name, startval, rounds, rounds_bound, body)"
-
-                counter_ptr = self.args[0]
-                start = self.args[1]
-                repeat_count = self.args[2]
-                repeat_bound = self.args[3]
-                body = self.args[4]
-
-                assert (
-                    isinstance(repeat_bound.value, int) and repeat_bound.value > 0
-                ), f"repeat bound must be a compile-time positive integer: {self.args[2]}"
-                assert repeat_count.valency == 1, repeat_count
-                assert counter_ptr.valency == 1, counter_ptr
-                assert start.valency == 1, start
-
+                self._opcode_gas = gas
+            # (if the node is malformed, `_check()` reports it)
+            elif value == "if":
+                self.valency = args[1].valency if len(args) > 1 else 0
+            elif value == "with":
+                self.valency = args[2].valency if len(args) > 2 else 0
+            elif value == "seq":
+                self.valency = args[-1].valency if args else 0
+            elif value == "multi":
+                self.valency = sum([arg.valency for arg in args])
+            elif value in _ZERO_VALENCY_VALUES:
                 self.valency = 0
-
-                self._gas = counter_ptr.gas + start.gas
-                self._gas += 3  # gas for repeat_bound
-                int_bound = int(repeat_bound.value)
-                self._gas += int_bound * (body.gas + 50) + 30
-
-                if repeat_count != repeat_bound:
-                    # gas for assert(repeat_count <= repeat_bound)
-                    self._gas += 18
-
-            # Seq statements: seq <statement> <statement> ...
-            elif self.value == "seq":
-                self.valency = self.args[-1].valency if self.args else 0
-                self._gas = sum([arg.gas for arg in self.args]) + 30
-
-            # GOTO is a jump with args
-            # e.g. (goto my_label x y z) will push x y and z onto the stack,
-            # then JUMP to my_label.
-            elif self.value in ("goto", "exit_to"):
-                for arg in self.args:
-                    assert (
-                        arg.valency == 1 or arg.value == "pass"
-                    ), f"zerovalent argument to goto {arg}"
-
-                self.valency = 0
-                self._gas = sum([arg.gas for arg in self.args])
-            elif self.value == "label":
-                assert (
-                    self.args[1].value == "var_list"
-                ), f"2nd argument to label must be var_list, {self}"
-                assert len(args) == 3, f"label should have 3 args but has {len(args)}, {self}"
-                self.valency = 0
-                self._gas = 1 + sum(t.gas for t in self.args)
-            elif self.value == "unique_symbol":
-                # a label which enforces uniqueness, and does not appear
-                # in generated bytecode. this is useful for generating
-                # internal assertions that a particular IR fragment only
-                # occurs a single time in a program. note that unique_symbol
-                # must be distinct from all `unique_symbol`s AS WELL AS all
-                # `label`s, otherwise IR-to-assembly will raise an exception.
-                self.valency = 0
-                self._gas = 0
-
-            # var_list names a variable number stack variables
-            elif self.value == "var_list":
-                for arg in self.args:
-                    if not isinstance(arg.value, str) or len(arg.args) > 0:  # pragma: nocover
-                        raise CodegenPanic(f"var_list only takes strings: {self.args}")
-                self.valency = 0
-                self._gas = 0
-
-            # Multi statements: multi <expr> <expr> ...
-            elif self.value == "multi":
-                for arg in self.args:
-                    assert (
-                        arg.valency > 0
-                    ), f"Multi expects all children to not be zerovalent: {arg}"
-                self.valency = sum([arg.valency for arg in self.args])
-                self._gas = sum([arg.gas for arg in self.args])
-            elif self.value == "deploy":
-                self.valency = 0
-                assert len(self.args) == 3, f"`deploy` should have three args {self}"
-                self._gas = NullAttractor()  # unknown
             # Stack variables
             else:
                 self.valency = 1
-                self._gas = 3
         else:  # pragma: nocover
             raise CompilerPanic(f"Invalid value for IR AST node: {self.value}")
-        assert isinstance(self.args, list)
+
+        if VYPER_CHECK_IR:
+            self._check()
+
+    def _check(self):
+        # check that the number and valencies of children are correct.
+        # these are sanity checks for the codegen, which can be turned off
+        # with VYPER_CHECK_IR=0 for faster compilation.
+        value = self.value
+        args = self.args
+        assert isinstance(args, list)
+
+        # Numbers
+        if isinstance(value, int):
+            assert len(args) == 0, "int can't have arguments"
+
+            # integers must be in the range (MIN_INT256, MAX_UINT256)
+            assert -(2**255) <= value < 2**256, "out of range"
+
+        elif isinstance(value, bytes):
+            assert len(args) == 0, "bytes can't have arguments"
+
+        # Opcodes and pseudo-opcodes (e.g. clamp)
+        elif self._opcode_gas is not None:
+            _, ins, _, _ = get_ir_opcodes()[value.upper()]
+            assert len(args) == ins, f"Number of arguments mismatched: {value} {args}"
+            for arg in args:
+                assert (
+                    arg.valency == 1 or arg.value in _ZERO_VALENCY_WHITELIST
+                ), f"invalid argument to `{value}`: {arg}"
+        # If statements
+        elif value == "if":
+            assert len(args) in (2, 3), "if statement can only have 2 or 3 arguments"
+            assert (
+                args[0].valency > 0
+            ), f"zerovalent argument as a test to an if statement: {args[0]}"
+        # With statements: with <var> <initial> <statement>
+        elif value == "with":
+            assert len(args) == 3, self
+            assert len(args[0].args) == 0 and isinstance(
+                args[0].value, str
+            ), f"first argument to with statement must be a variable name: {args[0]}"
+            assert (
+                args[1].valency == 1 or args[1].value == "pass"
+            ), f"zerovalent argument to with statement: {args[1]}"
+        # Repeat statements: repeat <index_name> <startval> <rounds> <rounds_bound> <body>
+        elif value == "repeat":
+            assert len(args) == 5, "repeat(index_name, startval, rounds, rounds_bound, body)"
+
+            counter_ptr, start, repeat_count, repeat_bound, _ = args
+
+            assert (
+                isinstance(repeat_bound.value, int) and repeat_bound.value > 0
+            ), f"repeat bound must be a compile-time positive integer: {args[2]}"
+            assert repeat_count.valency == 1, repeat_count
+            assert counter_ptr.valency == 1, counter_ptr
+            assert start.valency == 1, start
+
+        # GOTO is a jump with args
+        # e.g. (goto my_label x y z) will push x y and z onto the stack,
+        # then JUMP to my_label.
+        elif value in ("goto", "exit_to"):
+            for arg in args:
+                assert arg.valency == 1 or arg.value == "pass", f"zerovalent argument to goto {arg}"
+        elif value == "label":
+            assert args[1].value == "var_list", f"2nd argument to label must be var_list, {self}"
+            assert len(args) == 3, f"label should have 3 args but has {len(args)}, {self}"
+
+        # var_list names a variable number stack variables
+        elif value == "var_list":
+            for arg in args:
+                if not isinstance(arg.value, str) or len(arg.args) > 0:  # pragma: nocover
+                    raise CodegenPanic(f"var_list only takes strings: {args}")
+
+        # Multi statements: multi <expr> <expr> ...
+        elif value == "multi":
+            for arg in args:
+                assert arg.valency > 0, f"Multi expects all children to not be zerovalent: {arg}"
+        elif value == "deploy":
+            assert len(args) == 3, f"`deploy` should have three args {self}"
+
+    def _compute_gas(self) -> int:
+        # upper bound on the gas consumption of this node, given the gas
+        # of its children.
+        value = self.value
+        args = self.args
+
+        if isinstance(value, int):
+            return 5
+        if isinstance(value, bytes):
+            return 0
+
+        if self._opcode_gas is not None:
+            op = value.upper()
+            # We add 2 per stack height at push time and take it back
+            # at pop time; this makes `break` easier to handle
+            gas = self._opcode_gas + 2 * (self.valency - len(args))
+            for arg in args:
+                gas += arg.gas
+            # Dynamic gas cost: 8 gas for each byte of logging data
+            if op[0:3] == "LOG" and isinstance(args[1].value, int):
+                gas += args[1].value * 8
+            # Dynamic gas cost: non-zero-valued call
+            if op == "CALL" and args[2].value != 0:
+                gas += 34000
+            # Dynamic gas cost: filling sstore (ie. not clearing)
+            elif op == "SSTORE" and args[1].value != 0:
+                gas += 15000
+            # Dynamic gas cost: calldatacopy
+            elif op in ("CALLDATACOPY", "CODECOPY", "EXTCODECOPY"):
+                size = 34000
+                size_arg_index = 3 if op == "EXTCODECOPY" else 2
+                size_arg = args[size_arg_index]
+                if isinstance(size_arg.value, int):
+                    size = size_arg.value
+                gas += ceil32(size) // 32 * 3
+            # Gas limits in call
+            if op == "CALL" and isinstance(args[0].value, int):
+                gas += args[0].value
+            return gas
+
+        if value == "if":
+            if len(args) == 3:
+                return args[0].gas + max(args[1].gas, args[2].gas) + 3
+            return args[0].gas + args[1].gas + 17
+        if value == "with":
+            return sum([arg.gas for arg in args]) + 5
+        if value == "repeat":
+            counter_ptr, start, repeat_count, repeat_bound, body = args
+            gas = counter_ptr.gas + start.gas
+            gas += 3  # gas for repeat_bound
+            int_bound = int(repeat_bound.value)
+            gas += int_bound * (body.gas + 50) + 30
+
+            if repeat_count != repeat_bound:
+                # gas for assert(repeat_count <= repeat_bound)
+                gas += 18
+            return gas
+        if value == "seq":
+            return sum([arg.gas for arg in args]) + 30
+        if value in ("goto", "exit_to", "multi"):
+            return sum([arg.gas for arg in args])
+        if value == "label":
+            return 1 + sum(t.gas for t in args)
+        if value in ("unique_symbol", "var_list"):
+            return 0
+        if value == "deploy":
+            return NullAttractor()  # unknown
+        # Stack variables
+        return 3
 
     # deepcopy is a perf hotspot; it pays to optimize it a little
     def __deepcopy__(self, memo):
         cls = self.__class__
         ret = cls.__new__(cls)
-        ret.__dict__ = self.__dict__.copy()
-        ret.args = [copy.deepcopy(arg) for arg in ret.args]
+        for slot in IRnode.__slots__:
+            try:
+                setattr(ret, slot, getattr(self, slot))
+            except AttributeError:
+                # not set on this node
+                pass
+        ret.args = [copy.deepcopy(arg) for arg in self.args]
         return ret
 
     # TODO would be nice to rename to `gas_estimate` or `gas_bound`
     @property
     def gas(self):
+        if self._gas is None:
+            # compute the gas of all the nodes below this one which do not
+            # know their gas yet, children first. (not recursive, since
+            # the IR can get quite deep.)
+            stack = [self]
+            while len(stack) > 0:
+                node = stack[-1]
+                pending = [arg for arg in node.args if arg._gas is None]
+                if len(pending) > 0:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if node._gas is None:
+                    node._gas = node._compute_gas()
+
         return self._gas + self.add_gas_estimate
 
+    @property
+    def passthrough_metadata(self) -> dict[str, Any]:
+        # allocated on first use, since most nodes have no metadata
+        if self._passthrough_metadata is None:
+            self._passthrough_metadata = {}
+        return self._passthrough_metadata
+
+    @passthrough_metadata.setter
+    def passthrough_metadata(self, metadata: dict[str, Any]) -> None:
+        self._passthrough_metadata = metadata
+
     @property
     def is_empty_intrinsic(self):
         if self.value == "~empty":
@@ -418,7 +536,7 @@ class IRnode:
     # which changes the child `.unique_symbols`. in the future it would
     # be good to tighten down the hatches so it is harder to modify
     # IRnode member variables.
-    @cached_property
+    @_slot_cached_property
     def unique_symbols(self):
         ret = set()
         if self.value == "unique_symbol":
@@ -447,16 +565,27 @@ class IRnode:
     def is_pointer(self) -> bool:
         return self.location is not None
 
-    @property  # probably could be cached_property but be paranoid
+    @property
     def _optimized(self):
         if get_global_settings().experimental_codegen:
             # in venom pipeline, we don't need to inline constants.
             return self
 
+        # cached, since codegen asks for it repeatedly (cf. `cache_when_complex`).
+        # this relies on the value and args of a node not being modified
+        # after it is created (the callers only look at the value and args
+        # of the optimized node).
+        try:
+            return self._cached_optimized
+        except AttributeError:
+            pass
+
         # TODO figure out how to fix this circular import
         from vyper.ir.optimizer import optimize
 
-        return optimize(self)
+        ret = optimize(self)
+        self._cached_optimized = ret
+        return ret
 
     # This function is slightly confusing but abstracts a common pattern:
     # when an IR value needs to be computed once and then cached as an
@@ -482,7 +611,7 @@ class IRnode:
 
         return _WithBuilder(self, name, should_inline)
 
-    @cached_property
+    @_slot_cached_property
     def referenced_variables(self):
         ret = getattr(self, "_referenced_variables", set())
 
@@ -494,7 +623,7 @@ class IRnode:
 
         return ret
 
-    @cached_property
+    @_slot_cached_property
     def variable_writes(self):
         ret = getattr(self, "_writes", set())
 
@@ -506,7 +635,7 @@ class IRnode:
 
         return ret
 
-    @cached_property
+    @_slot_cached_property
     def contains_risky_call(self):
         ret = self.value in ("call", "delegatecall", "staticcall", "create", "create2")
 
@@ -518,7 +647,7 @@ class IRnode:
 
         return ret
 
-    @cached_property
+    @_slot_cached_property
     def contains_writeable_call(self):
         ret = self.value in ("call", "delegatecall", "create", "create2")
 
@@ -530,7 +659,7 @@ class IRnode:
 
         return ret
 
-    @cached_property
+    @_slot_cached_property
     def contains_self_call(self):
         return getattr(self, "is_self_call", False) or any(x.contains_self_call for x in self.args)
 
@@ -660,9 +789,24 @@ class IRnode:
                 passthrough_metadata=passthrough_metadata,
             )
         else:
+            args = []
+            for o in obj[1:]:
+                if isinstance(o, IRnode):
+                    # inlined `cls.from_list(o, ast_source=..., error_msg=...)`,
+                    # the common case when building IR from existing nodes
+                    if o.ast_source is None:
+                        o.ast_source = ast_source
+                    if o.encoding is None:
+                        o.encoding = Encoding.VYPER
+                    if o.error_msg is None:
+                        o.error_msg = error_msg
+                    args.append(o)
+                else:
+                    args.append(cls.from_list(o, ast_source=ast_source, error_msg=error_msg))
+
             return cls(
                 obj[0],
-                [cls.from_list(o, ast_source=ast_source, error_msg=error_msg) for o in obj[1:]],
+                args,
                 typ,
                 location=location,
                 annotation=annotation,
@@ -1,6 +1,9 @@
 # helper module which implements jumptable for function selection
+import contextlib
+import functools
 import math
 from dataclasses import dataclass
+from typing import Optional
 
 from vyper.utils import method_id_int
 
@@ -32,7 +35,7 @@ class Bucket:
         return len(self.method_ids)
 
 
-BITS_MAGIC = 24  # a constant which produced good results, see _bench_dense()
+BITS_MAGIC = 24  # a constant which produced good results, see tests/benchmarks/jumptable.py
 
 
 def _image_of(xs, magic):
@@ -51,11 +54,62 @@ class _HasEmptyBuckets(Exception):
     pass
 
 
+# number of magics which find_magic_for() tries at once
+_MAGIC_BATCH_SIZE = 512
+
+
+@functools.lru_cache(maxsize=16)
+def _lane_constants(lane_bits, n_lanes):
+    # integers with n_lanes lanes of lane_bits bits each, which hold
+    # 1 and the lane index, respectively.
+    ones = sum(1 << (lane_bits * i) for i in range(n_lanes))
+    index = sum(i << (lane_bits * i) for i in range(n_lanes))
+    return ones, index
+
+
 def find_magic_for(xs):
-    for m in range(2**16):
-        test = _image_of(xs, m)
-        if len(test) == len(set(test)):
-            return m
+    # find the smallest magic for which _image_of(xs, magic) has no
+    # collisions. this tries a batch of magics at once by packing them
+    # into the lanes of a single (big) integer, so that the image of x
+    # under all of them takes a handful of integer operations instead of
+    # one python-level computation per magic.
+    n = len(xs)
+    if n <= 1:
+        return 0
+
+    # bound on (x * magic) >> BITS_MAGIC
+    value_bits = max(max(xs).bit_length() + 16 - BITS_MAGIC, 1)
+    # `value % n` is computed as `value - n * ((value * r) >> shift)`,
+    # which is exact for all values below 2**value_bits (cf. Granlund
+    # and Montgomery, "Division by invariant integers using multiplication")
+    shift = value_bits + n.bit_length()
+    r = -(-(1 << shift) // n)
+    # the lanes need to be wide enough that no intermediate result
+    # carries over into the next lane
+    lane_bits = max(BITS_MAGIC + value_bits, value_bits + shift + 1, n.bit_length() + 1)
+
+    ones, index = _lane_constants(lane_bits, _MAGIC_BATCH_SIZE)
+    value_mask = ones * ((1 << value_bits) - 1)
+    # a lane of `(a ^ b) + low` has its `high` bit set iff a != b
+    low = ones * ((1 << n.bit_length()) - 1)
+    high = ones << n.bit_length()
+
+    for lo in range(0, 2**16, _MAGIC_BATCH_SIZE):
+        magics = lo * ones + index
+        # the lanes which have no collisions so far
+        valid = high
+        images = []
+        for x in xs:
+            value = ((x * magics) >> BITS_MAGIC) & value_mask
+            image = value - n * (((value * r) >> shift) & value_mask)
+            for other in images:
+                valid &= (image ^ other) + low
+            if not valid:
+                break
+            images.append(image)
+        else:
+            # the lowest valid lane
+            return lo + ((valid & -valid).bit_length() - 1) // lane_bits
 
     raise _FindMagicFailure(f"Could not find hash for {xs}")
 
@@ -92,13 +146,13 @@ def _dense_jumptable_info(method_ids, n_buckets):
 START_BUCKET_SIZE = 5
 
 
-# this is expensive! for 80 methods, costs about 350ms and probably
-# linear in # of methods.
-# see _bench_perfect()
-# note the buckets are NOT in order!
-def generate_dense_jumptable_info(signatures):
-    method_ids = [method_id_int(sig) for sig in signatures]
-    n = len(signatures)
+# the search only depends on the set of method ids, and finds the
+# same magics regardless of their order. returns the number of buckets
+# and the magic for each bucket.
+# this is expensive! for 80 methods, costs about 100ms and probably
+# linear in # of methods. see tests/benchmarks/jumptable.py
+def _find_dense_solution(method_ids):
+    n = len(method_ids)
     # start at bucket size of 5 and try to improve (generally
     # speaking we want as few buckets as possible)
     n_buckets = (n // START_BUCKET_SIZE) + 1
@@ -109,7 +163,8 @@ def generate_dense_jumptable_info(signatures):
             # print(f"trying {n_buckets} (bucket size {n // n_buckets})")
             solution = _dense_jumptable_info(method_ids, n_buckets)
             assert len(solution) == n_buckets
-            ret = n_buckets, solution
+            magics = {bucket_id: bucket.magic for bucket_id, bucket in solution.items()}
+            ret = n_buckets, magics
 
         except _HasEmptyBuckets:
             # found a solution which has empty buckets; skip it since
@@ -128,12 +183,61 @@ def generate_dense_jumptable_info(signatures):
                 tried_exhaustive = True
                 continue
             else:
-                raise RuntimeError(f"Could not generate jumptable! {signatures}")
+                raise RuntimeError(f"Could not generate jumptable for method ids {method_ids}")
         n_buckets -= 1
 
     return ret
 
 
+# optional persistent cache of dense solutions, cf. `use_jumptable_cache()`.
+# anything with `get(key)` and `put(key, solution)` methods will do, e.g.
+# `vyper.compiler.cache.DiskJumptableCache`.
+_jumptable_cache = None
+
+
+@contextlib.contextmanager
+def use_jumptable_cache(cache):
+    """
+    Look up (and store) dense jumptable solutions in `cache` for the
+    duration of the context.
+    """
+    global _jumptable_cache
+    tmp = _jumptable_cache
+    _jumptable_cache = cache
+    try:
+        yield
+    finally:
+        _jumptable_cache = tmp
+
+
+@functools.lru_cache(maxsize=256)
+def _find_dense_solution_cached(method_ids: tuple[int, ...]) -> Optional[tuple]:
+    if _jumptable_cache is None:
+        return _find_dense_solution(method_ids)
+
+    ret = _jumptable_cache.get(method_ids)
+    if ret is None:
+        ret = _find_dense_solution(method_ids)
+        _jumptable_cache.put(method_ids, ret)
+    return ret
+
+
+# note the buckets are NOT in order!
+def generate_dense_jumptable_info(signatures):
+    method_ids = [method_id_int(sig) for sig in signatures]
+    # recompiling a contract (or compiling another contract with the
+    # same external interface) finds the same solution, so it is cached
+    # by the sorted method ids.
+    solution = _find_dense_solution_cached(tuple(sorted(method_ids)))
+    if solution is None:
+        return None
+
+    n_buckets, magics = solution
+    buckets = _mk_buckets(method_ids, n_buckets)
+    ret = {bucket_id: Bucket(bucket_id, magics[bucket_id], xs) for bucket_id, xs in buckets.items()}
+    return n_buckets, ret
+
+
 # note the buckets are NOT in order!
 def generate_sparse_jumptable_buckets(signatures):
     method_ids = [method_id_int(sig) for sig in signatures]
@@ -162,30 +266,6 @@ def generate_sparse_jumptable_buckets(signatures):
     return ret
 
 
-# benchmark for quality of buckets
-def _bench_dense(N=1_000, n_methods=100):
-    import random
-
-    stats = []
-    for i in range(N):
-        seed = random.randint(0, 2**64 - 1)
-        # "large" contracts in prod hit about ~50 methods, test with
-        # double the limit
-        sigs = [f"foo{i + seed}()" for i in range(n_methods)]
-
-        xs = generate_dense_jumptable_info(sigs)
-        print(f"found. n buckets {len(xs)}")
-        stats.append(xs)
-
-    def mean(xs):
-        return sum(xs) / len(xs)
-
-    avg_n_buckets = mean([len(jt) for jt in stats])
-    # usually around ~14 buckets per 100 sigs
-    # N=10, time=3.6s
-    print(f"average N buckets: {avg_n_buckets}")
-
-
 def _bench_sparse(N=10_000, n_methods=80):
     import random
 
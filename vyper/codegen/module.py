@@ -417,7 +417,22 @@ def _selector_section_linear(external_functions, module_t):
 
 
 # take a ModuleT, and generate the runtime and deploy IR
+def _reset_codegen_state(module_t: ModuleT) -> None:
+    # imported modules can be shared between compilation targets (cf.
+    # `ModuleCache`), clear any codegen info left behind by a previous target.
+    for m in module_t.reachable_modules:
+        function_types = list(m.functions.values())
+        function_types.extend(
+            v.getter_ast._metadata["func_type"] for v in m.public_variables.values()
+        )
+        for fn_t in function_types:
+            fn_t._ir_info = None
+            fn_t._function_id = None
+
+
 def generate_ir_for_module(module_t: ModuleT) -> tuple[IRnode, IRnode]:
+    _reset_codegen_state(module_t)
+
     # order functions so that each function comes after all of its callees
     id_generator = IDGenerator()
     runtime_reachable = _runtime_reachable_functions(module_t, id_generator)
@@ -1,8 +1,8 @@
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
-import vyper.codegen.core as codegen
 import vyper.compiler.output as output
+from vyper.compiler.cache import CompilationCache
 from vyper.compiler.input_bundle import FileInput, InputBundle, JSONInput, PathLike
 from vyper.compiler.phases import CompilerData
 from vyper.compiler.settings import Settings, anchor_settings, get_global_settings
@@ -68,6 +68,7 @@ def compile_from_file_input(
     no_bytecode_metadata: bool = False,
     show_gas_estimates: bool = False,
     exc_handler: Optional[Callable] = None,
+    cache: Optional[CompilationCache] = None,
 ) -> dict:
     """
     Main entry point into the compiler.
@@ -99,6 +100,9 @@ def compile_from_file_input(
         Do not add metadata to bytecode. Defaults to False
     experimental_codegen: bool
         Use experimental codegen. Defaults to False
+    cache: CompilationCache, optional
+        On-disk cache to fetch previously compiled outputs from (and to
+        store newly compiled outputs in).
 
     Returns
     -------
@@ -117,17 +121,35 @@ def compile_from_file_input(
         no_bytecode_metadata=no_bytecode_metadata,
     )
 
-    return outputs_from_compiler_data(compiler_data, output_formats, exc_handler)
+    return outputs_from_compiler_data(compiler_data, output_formats, exc_handler, cache)
 
 
 def outputs_from_compiler_data(
     compiler_data: CompilerData,
     output_formats: Optional[OutputFormats] = None,
     exc_handler: Optional[Callable] = None,
+    cache: Optional[CompilationCache] = None,
 ):
     if output_formats is None:
         output_formats = ("bytecode",)
 
+    def compute_outputs(compiler_data, output_formats):
+        return _outputs_from_compiler_data(compiler_data, output_formats, exc_handler)
+
+    if cache is not None:
+        with (
+            cache.use_parse_cache(),
+            cache.use_jumptable_cache(),
+            anchor_settings(compiler_data.settings),
+        ):
+            return cache.outputs_from_compiler_data(compiler_data, output_formats, compute_outputs)
+
+    return compute_outputs(compiler_data, output_formats)
+
+
+def _outputs_from_compiler_data(
+    compiler_data: CompilerData, output_formats: OutputFormats, exc_handler: Optional[Callable]
+) -> dict:
     ret = {}
 
     with anchor_settings(compiler_data.settings):
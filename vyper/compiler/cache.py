@@ -0,0 +1,511 @@
+import builtins
+import contextlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from vyper import warnings as vyper_warnings
+from vyper.ast import nodes as vy_ast
+from vyper.ast.metadata import NodeMetadata
+from vyper.ast.parse import ParseCache, use_parse_cache
+from vyper.compiler.settings import OptimizationLevel, Settings
+from vyper.utils import get_long_version, sha256sum
+from vyper.warnings import CapturedWarning, capture_warnings, replay_warnings
+
+if TYPE_CHECKING:
+    from vyper.compiler.phases import CompilerData
+
+VYPER_CACHE_DIR = os.environ.get("VYPER_CACHE_DIR")
+
+# default upper bound on the total size of a cache directory (512MB)
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+# output formats which only depend on the cache key and can therefore be
+# safely stored and reused. formats which contain live compiler objects
+# (e.g. IRnode, venom functions) or which are not pure functions of the
+# integrity sum (e.g. ast output which contains the contract path) are
+# always recomputed.
+CACHEABLE_OUTPUT_FORMATS = frozenset(
+    (
+        "abi",
+        "asm",
+        "blueprint_bytecode",
+        "bytecode",
+        "bytecode_runtime",
+        "devdoc",
+        "external_interface",
+        "integrity",
+        "interface",
+        "layout",
+        "method_identifiers",
+        "opcodes",
+        "opcodes_runtime",
+        "settings_dict",
+        "source_map",
+        "source_map_runtime",
+        "userdoc",
+    )
+)
+
+_CACHE_SUFFIX = ".pickle"
+
+# subdirectory of the cache directory which holds the parsed modules
+_PARSE_CACHE_SUBDIR = "ast"
+
+# subdirectory of the cache directory which holds the selector tables
+_JUMPTABLE_CACHE_SUBDIR = "jumptable"
+
+
+# the types which the entries of the output cache are made of. they are
+# loaded without resolving any class, so that a cache directory which is
+# writable by someone else cannot be used to run arbitrary code
+_PRIMITIVE_TYPES = (type(None), bool, int, float, str, bytes)
+
+# the modules the warning categories of the cached warnings are looked up in
+_WARNING_MODULES = {"builtins": builtins, "vyper.warnings": vyper_warnings}
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, allowed_classes: frozenset[tuple[str, str]]):
+        super().__init__(file)
+        self.allowed_classes = allowed_classes
+
+    def find_class(self, module, name):
+        if (module, name) not in self.allowed_classes:
+            raise pickle.UnpicklingError(f"invalid cache entry: {module}.{name}")
+        return super().find_class(module, name)
+
+
+class CompilationCache:
+    """
+    Content-addressed, on-disk cache of compiler outputs.
+
+    Entries are keyed by the integrity sum of a compilation target (which
+    covers the source code and all of its resolved imports), the compiler
+    settings and the compiler version. Each entry is a single pickle file
+    which is written atomically, so the cache can be shared by several
+    concurrently running compiler processes. When the total size of the
+    cache exceeds `max_size` bytes, least-recently-used entries are evicted.
+    The limit also covers the caches in the subdirectories (parsed modules
+    and selector tables), whose entries are evicted along with the outputs.
+
+    The size of the cache is only read from disk on the first store (and
+    on each eviction), and is then kept up to date in memory. Entries
+    written by other processes in the meantime are accounted for at the
+    next eviction.
+
+    Entries only consist of builtin types (cf. `_to_primitive()`), and
+    loading an entry which refers to any other class (except for
+    `allowed_classes`) fails.
+    """
+
+    # cache of parsed modules, used while computing outputs
+    parse_cache: Optional[ParseCache] = None
+    # cache of dense selector tables, used while computing outputs
+    jumptable_cache: Optional["DiskJumptableCache"] = None
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        cache_asts: bool = True,
+        cache_jumptables: bool = True,
+        allowed_classes: Iterable[tuple[str, str]] = (),
+        parent: Optional["CompilationCache"] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.allowed_classes = frozenset(allowed_classes)
+        # the cache whose directory contains this one, which keeps track
+        # of the size of both and evicts their entries
+        self.parent = parent
+        # the total size of the entries, None until it is read from disk
+        self._disk_size: Optional[int] = None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        if cache_asts:
+            self.parse_cache = DiskParseCache(
+                self.cache_dir / _PARSE_CACHE_SUBDIR, max_size, parent=self
+            )
+        if cache_jumptables:
+            self.jumptable_cache = DiskJumptableCache(
+                self.cache_dir / _JUMPTABLE_CACHE_SUBDIR, max_size, parent=self
+            )
+
+    def compute_key(self, compiler_data: "CompilerData") -> str:
+        file_input = compiler_data.file_input
+        imports = compiler_data.resolved_imports.compiler_inputs
+
+        # source ids and paths end up in source maps and error messages,
+        # so they are part of the key along with the integrity sum.
+        key = {
+            "version": get_long_version(),
+            "integrity_sum": compiler_data.integrity_sum,
+            "settings": compiler_data.settings.as_dict(),
+            "no_bytecode_metadata": compiler_data.no_bytecode_metadata,
+            "show_gas_estimates": compiler_data.show_gas_estimates,
+            "source": (file_input.source_id, str(file_input.path), str(file_input.resolved_path)),
+            "imports": sorted((c.source_id, str(c.resolved_path)) for c in imports),
+        }
+        return sha256sum(json.dumps(key, sort_keys=True))
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / (key + _CACHE_SUFFIX)
+
+    def load(self, key: str) -> Optional[dict]:
+        path = self._path_for(key)
+        try:
+            with path.open("rb") as f:
+                entry = _Unpickler(f, self.allowed_classes).load()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # corrupted, tampered with or written by an incompatible
+            # compiler, treat it as a cache miss. it will be overwritten
+            # by `store()`.
+            return None
+
+        try:
+            # bump mtime for LRU eviction
+            os.utime(path)
+        except OSError:  # pragma: nocover
+            pass
+
+        return entry
+
+    def store(self, key: str, entry: dict) -> None:
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file and atomically move it into place so
+        # that concurrent readers never observe a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                new_size = f.tell()
+            old_size = _file_size(path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _unlink(Path(tmp_path))
+            raise
+
+        self._add_size(new_size - old_size)
+
+    def _add_size(self, delta: int) -> None:
+        if self.parent is not None:
+            self.parent._add_size(delta)
+            return
+
+        if self._disk_size is None:
+            # first store, read the size from disk
+            self.evict()
+            return
+
+        self._disk_size += delta
+        if self._disk_size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        if self.parent is not None:
+            self.parent.evict()
+            return
+
+        entries = []
+        total_size = 0
+        # including the entries of the caches in the subdirectories
+        for path in self.cache_dir.rglob("*" + _CACHE_SUFFIX):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                # deleted by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total_size += st.st_size
+
+        self._disk_size = total_size
+        if total_size <= self.max_size:
+            return
+
+        # evict least recently used entries first
+        entries.sort(key=lambda t: t[0])
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            _unlink(path)
+            total_size -= size
+        self._disk_size = total_size
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*/*" + _CACHE_SUFFIX):
+            _unlink(path)
+        self._disk_size = None
+        if self.parse_cache is not None:
+            self.parse_cache.clear()
+        if self.jumptable_cache is not None:
+            self.jumptable_cache.clear()
+
+    def use_parse_cache(self):
+        """
+        Context manager which serves `parse_to_ast` from `self.parse_cache`
+        (if there is one). Note that `CompilerData` parses lazily, so this
+        should wrap any access to its properties.
+        """
+        if self.parse_cache is None:
+            return contextlib.nullcontext()
+        return use_parse_cache(self.parse_cache)
+
+    def use_jumptable_cache(self):
+        """
+        Context manager which looks up dense selector tables in
+        `self.jumptable_cache` (if there is one).
+        """
+        if self.jumptable_cache is None:
+            return contextlib.nullcontext()
+        # imported lazily, so that `import vyper` does not load the codegen
+        from vyper.codegen.jumptable_utils import use_jumptable_cache
+
+        return use_jumptable_cache(self.jumptable_cache)
+
+    def outputs_from_compiler_data(
+        self, compiler_data: "CompilerData", output_formats, compute_outputs
+    ) -> dict:
+        """
+        Fetch the requested outputs from the cache, calling
+        `compute_outputs(compiler_data, formats)` for any outputs
+        which are not cached yet.
+        """
+        try:
+            key = self.compute_key(compiler_data)
+        except Exception:
+            # the input does not compile (far enough) to compute a key.
+            # fall through so that the error gets reported the usual way.
+            return compute_outputs(compiler_data, output_formats)
+
+        entry = self.load(key) or {"outputs": {}, "warnings": []}
+        cached_outputs = entry["outputs"]
+
+        missing = [f for f in output_formats if f not in cached_outputs]
+        if len(missing) == 0:
+            replay_warnings(_decode_warnings(entry["warnings"]))
+            return {f: cached_outputs[f] for f in output_formats}
+
+        with capture_warnings() as new_warnings:
+            new_outputs = compute_outputs(compiler_data, missing)
+
+        to_store = {}
+        for f, v in new_outputs.items():
+            if f not in CACHEABLE_OUTPUT_FORMATS:
+                continue
+            try:
+                to_store[f] = _to_primitive(v)
+            except TypeError:
+                continue
+
+        if len(to_store) > 0:
+            cached_outputs.update(to_store)
+            for w in _encode_warnings(new_warnings):
+                if w not in entry["warnings"]:
+                    entry["warnings"].append(w)
+            self.store(key, entry)
+
+        # re-emit the warnings with the user's warnings filter in place
+        replay_warnings(new_warnings)
+
+        ret = {}
+        for f in output_formats:
+            if f in new_outputs:
+                ret[f] = new_outputs[f]
+            elif f in cached_outputs:
+                ret[f] = cached_outputs[f]
+        return ret
+
+
+class InMemoryCompilationCache(CompilationCache):
+    """
+    Like `CompilationCache`, but entries are kept in memory. Used by
+    long-running compiler processes (cf. `vyper --server`) when no cache
+    directory is given.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._total_size = 0
+
+    def load(self, key: str) -> Optional[dict]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        # unpickle, so that callers get a fresh copy of the outputs
+        return pickle.loads(self._entries[key])
+
+    def store(self, key: str, entry: dict) -> None:
+        self._remove(key)
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self._entries[key] = data
+        self._total_size += len(data)
+        self.evict()
+
+    def evict(self) -> None:
+        while self._total_size > self.max_size and len(self._entries) > 0:
+            key = next(iter(self._entries))
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_size = 0
+
+    def _remove(self, key: str) -> None:
+        data = self._entries.pop(key, None)
+        if data is not None:
+            self._total_size -= len(data)
+
+
+class DiskParseCache(ParseCache):
+    """
+    On-disk cache of parsed (unannotated) modules, cf. `ParseCache`.
+
+    Unlike `ParseCache`, entries survive the compiler process, so unchanged
+    sources (and the builtin interfaces) do not need to be parsed again by
+    every new compiler invocation. Entries are keyed by the sha256sum of the
+    source code, the source id and paths, and the compiler version.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        parent: Optional[CompilationCache] = None,
+    ):
+        # reuse the storage (atomic writes, LRU eviction) of the output cache
+        self._store = CompilationCache(
+            cache_dir,
+            max_size,
+            cache_asts=False,
+            cache_jumptables=False,
+            allowed_classes=_ast_classes(),
+            parent=parent,
+        )
+
+    def __len__(self):
+        return sum(1 for _ in self._store.cache_dir.glob("*/*" + _CACHE_SUFFIX))
+
+    def _compute_key(self, key: tuple) -> str:
+        return sha256sum(json.dumps([get_long_version(), *key]))
+
+    def get(self, key: tuple) -> Optional[vy_ast.Module]:
+        entry = self._store.load(self._compute_key(key))
+        if entry is None:
+            return None
+        # re-emit any warnings raised while parsing, e.g. deprecated pragmas
+        replay_warnings(_decode_warnings(entry["warnings"]))
+        # note: unpickled by `load()`, so this is already a fresh copy
+        return entry["module"]
+
+    def put(self, key: tuple, module: vy_ast.Module, captured: list[CapturedWarning]) -> None:
+        entry = {"module": module, "warnings": _encode_warnings(captured)}
+        self._store.store(self._compute_key(key), entry)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+class DiskJumptableCache:
+    """
+    On-disk cache of dense selector table solutions, cf.
+    `vyper.codegen.jumptable_utils.use_jumptable_cache()`.
+
+    Finding the magics for a dense selector table is by far the most
+    expensive part of compiling a contract with `-O codesize` when the
+    contract has many external functions. The solution only depends on
+    the method ids, so it is keyed by the sorted method ids and the
+    compiler version, and is shared by all contracts with the same set of
+    external functions.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        parent: Optional[CompilationCache] = None,
+    ):
+        self._store = CompilationCache(
+            cache_dir, max_size, cache_asts=False, cache_jumptables=False, parent=parent
+        )
+
+    def __len__(self):
+        return sum(1 for _ in self._store.cache_dir.glob("*/*" + _CACHE_SUFFIX))
+
+    def _compute_key(self, method_ids: tuple[int, ...]) -> str:
+        return sha256sum(json.dumps([get_long_version(), *method_ids]))
+
+    def get(self, method_ids: tuple[int, ...]) -> Optional[tuple]:
+        entry = self._store.load(self._compute_key(method_ids))
+        if entry is None:
+            return None
+        return entry["solution"]
+
+    def put(self, method_ids: tuple[int, ...], solution: Optional[tuple]) -> None:
+        self._store.store(self._compute_key(method_ids), {"solution": solution})
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+def _ast_classes() -> list[tuple[str, str]]:
+    # the classes which a parsed module is made of
+    ret = [(cls.__module__, cls.__name__) for cls in (NodeMetadata, OptimizationLevel, Settings)]
+    for name, obj in vars(vy_ast).items():
+        if isinstance(obj, type) and issubclass(obj, vy_ast.VyperNode):
+            ret.append((vy_ast.__name__, name))
+    # `...`, e.g. in interface definitions
+    ret.append(("builtins", "Ellipsis"))
+    return ret
+
+
+def _to_primitive(value: Any) -> Any:
+    # convert `value` to builtin types (e.g. the storage layout is made of
+    # dict subclasses). raises TypeError if it contains anything else.
+    if isinstance(value, dict):
+        return {_to_primitive(k): _to_primitive(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_primitive(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_to_primitive(item) for item in value)
+    if type(value) not in _PRIMITIVE_TYPES:
+        raise TypeError(f"cannot cache {type(value)}")
+    return value
+
+
+def _encode_warnings(captured: list[CapturedWarning]) -> list[tuple[str, str]]:
+    return [(f"{category.__module__}.{category.__qualname__}", msg) for category, msg in captured]
+
+
+def _decode_warnings(encoded: list[tuple[str, str]]) -> list[CapturedWarning]:
+    ret = []
+    for name, message in encoded:
+        module, _, qualname = name.rpartition(".")
+        category = getattr(_WARNING_MODULES.get(module), qualname, None)
+        if not (isinstance(category, type) and issubclass(category, Warning)):
+            category = UserWarning
+        ret.append((category, message))
+    return ret
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -1,22 +1,25 @@
+from __future__ import annotations
+
 import base64
 from collections import deque
 from pathlib import PurePath
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
 import vyper.ast as vy_ast
 from vyper.ast.utils import ast_to_dict
-from vyper.codegen.ir_node import IRnode
 from vyper.compiler.output_bundle import SolcJSONWriter, VyperArchiveWriter
 from vyper.compiler.phases import CompilerData
 from vyper.compiler.utils import build_gas_estimates
 from vyper.evm import opcodes
 from vyper.exceptions import VyperException
-from vyper.ir import compile_ir
 from vyper.semantics.types.function import ContractFunctionT, FunctionVisibility, StateMutability
 from vyper.typing import StorageLayout
 from vyper.utils import safe_relpath
 from vyper.warnings import ContractSizeLimit, vyper_warn
 
+if TYPE_CHECKING:
+    from vyper.codegen.ir_node import IRnode
+
 
 def build_ast_dict(compiler_data: CompilerData) -> dict:
     ast_dict = {
@@ -181,18 +184,24 @@ def build_cfg_runtime_output(compiler_data: CompilerData) -> str:
 
 
 def build_ir_output(compiler_data: CompilerData) -> IRnode:
+    from vyper.codegen.ir_node import IRnode
+
     if compiler_data.show_gas_estimates:
         IRnode.repr_show_gas = True
     return compiler_data.ir_nodes
 
 
 def build_ir_runtime_output(compiler_data: CompilerData) -> IRnode:
+    from vyper.codegen.ir_node import IRnode
+
     if compiler_data.show_gas_estimates:
         IRnode.repr_show_gas = True
     return compiler_data.ir_runtime
 
 
 def _ir_to_dict(ir_node):
+    from vyper.codegen.ir_node import IRnode
+
     # Currently only supported with IRnode and not VenomIR
     if not isinstance(ir_node, IRnode):
         return
@@ -362,13 +371,16 @@ def _build_source_map_output(compiler_data, bytecode, pc_maps):
     a superset of the other formats, and the other types are included
     for legacy reasons.
     """
+    from vyper.ir import compile_ir
+
     # sort the pc maps alphabetically
     # CMC 2024-03-09 is this really necessary?
     out = {}
     for k in sorted(pc_maps.keys()):
         out[k] = pc_maps[k]
 
-    ast_map = out.pop("pc_raw_ast_map")
+    # copy, since the pc maps are cached by `compiler_data`
+    ast_map = out.pop("pc_raw_ast_map").copy()
 
     assert isinstance(ast_map, dict)  # lint
     if 0 not in ast_map:
@@ -387,14 +399,17 @@ def _build_source_map_output(compiler_data, bytecode, pc_maps):
 
 
 def build_source_map_output(compiler_data: CompilerData) -> dict:
-    bytecode, pc_maps = compile_ir.assembly_to_evm(compiler_data.assembly, compiler_metadata=None)
+    bytecode, pc_maps, _ = compiler_data.assembled
+    if not compiler_data.no_bytecode_metadata:
+        # the source map does not cover the metadata at the end of the
+        # bytecode. the last two bytes hold the length of the metadata.
+        metadata_len = int.from_bytes(bytecode[-2:], "big")
+        bytecode = bytecode[:-metadata_len]
     return _build_source_map_output(compiler_data, bytecode, pc_maps)
 
 
 def build_source_map_runtime_output(compiler_data: CompilerData) -> dict:
-    bytecode, pc_maps = compile_ir.assembly_to_evm(
-        compiler_data.assembly_runtime, compiler_metadata=None
-    )
+    bytecode, pc_maps, _ = compiler_data.assembled_runtime
     return _build_source_map_output(compiler_data, bytecode, pc_maps)
 
 
@@ -0,0 +1,121 @@
+"""
+helpers for fanning compilation jobs out over a pool of worker processes.
+
+note that the compiler relies on module-level global state (e.g. the
+global namespace and the globally anchored settings), so jobs run in
+separate processes rather than in threads.
+"""
+
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from vyper.compiler.input_bundle import FileInput, InputBundle
+from vyper.compiler.phases import CompilerData
+from vyper.compiler.settings import Settings
+from vyper.warnings import CapturedWarning, capture_warnings, replay_warnings
+
+
+def get_num_jobs(jobs: Optional[int]) -> int:
+    # None means "serial"; 0 means "one job per cpu".
+    if jobs is None:
+        return 1
+    if jobs < 0:
+        raise ValueError(f"invalid number of jobs: {jobs}")
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def make_executor(
+    jobs: int, initializer: Optional[Callable] = None, initargs: tuple = ()
+) -> ProcessPoolExecutor:
+    # prefer fork (where it is safe) so that workers inherit anything the
+    # parent has already loaded or parsed, e.g. the builtin interfaces.
+    mp_context = None
+    if sys.platform.startswith("linux"):
+        mp_context = multiprocessing.get_context("fork")
+    return ProcessPoolExecutor(
+        max_workers=jobs, mp_context=mp_context, initializer=initializer, initargs=initargs
+    )
+
+
+def assign_source_ids(
+    input_bundle: InputBundle,
+    file_inputs: Iterable[Optional[FileInput]],
+    settings: Optional[Settings],
+) -> dict[int, "JobResult"]:
+    """
+    Resolve the imports of each compilation target, in order.
+
+    Source ids are handed out by the input bundle in the order that files
+    are loaded, so they depend on the targets which were compiled before.
+    To get the same outputs (e.g. source maps) as a serial build, the
+    parent process resolves imports for all targets before fanning out.
+    This also warms up the builtin interface cache, which forked workers
+    inherit. `None` targets (e.g. archives, which have their own input
+    bundle) are skipped.
+
+    Returns the errors of the targets whose imports cannot be resolved,
+    by index. They should be reported in place of compiling the target.
+    """
+    ret = {}
+    for i, file_input in enumerate(file_inputs):
+        if file_input is None:
+            continue
+        result = JobResult()
+        # warnings of the other targets will be reported by the workers
+        with capture_warnings() as caught:
+            try:
+                _ = CompilerData(file_input, input_bundle, settings=settings).resolved_imports
+            except Exception as e:
+                result.exception = e
+        if result.exception is not None:
+            result.warnings = caught
+            ret[i] = result
+    return ret
+
+
+@dataclass
+class JobResult:
+    value: Any = None
+    exception: Optional[BaseException] = None
+    warnings: Optional[list[CapturedWarning]] = None
+
+    def unwrap(self) -> Any:
+        """
+        Re-emit warnings from the job in the current process, and return
+        the job's result (or raise its exception).
+        """
+        replay_warnings(self.warnings or [])
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+def run_job(fn: Callable, *args, **kwargs) -> JobResult:
+    """
+    Run a job in a worker process, capturing its warnings and exceptions
+    so they can be sent back to the parent process.
+    """
+    ret = JobResult()
+    with capture_warnings() as caught:
+        try:
+            ret.value = fn(*args, **kwargs)
+        except Exception as e:
+            ret.exception = _picklable_exception(e)
+    ret.warnings = caught
+    return ret
+
+
+def _picklable_exception(exc: Exception) -> Exception:
+    # note: vyper exceptions know how to pickle themselves
+    try:
+        pickle.dumps(exc)
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
@@ -1,14 +1,15 @@
+from __future__ import annotations
+
 import copy
+import json
 from functools import cached_property
 from pathlib import Path, PurePath
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import vyper.codegen.core as codegen
 from vyper import ast as vy_ast
 from vyper.ast import natspec
-from vyper.codegen import module
-from vyper.codegen.ir_node import IRnode
 from vyper.compiler.input_bundle import FileInput, FilesystemInputBundle, InputBundle, JSONInput
+from vyper.compiler.profiling import profile_phase, profiled
 from vyper.compiler.settings import (
     OptimizationLevel,
     Settings,
@@ -16,21 +17,43 @@ from vyper.compiler.settings import (
     merge_settings,
     should_run_legacy_optimizer,
 )
-from vyper.ir import compile_ir, optimizer
-from vyper.ir.compile_ir import reset_symbols
+from vyper.exceptions import CompilerPanic
 from vyper.semantics import analyze_module, set_data_positions, validate_compilation_target
 from vyper.semantics.analysis.data_positions import generate_layout_export
-from vyper.semantics.analysis.imports import resolve_imports
+from vyper.semantics.analysis.imports import ModuleCache, resolve_imports
 from vyper.semantics.types.function import ContractFunctionT
 from vyper.semantics.types.module import ModuleT
 from vyper.typing import StorageLayout
 from vyper.utils import ERC5202_PREFIX, sha256sum
-from vyper.venom import generate_assembly_experimental, generate_ir
-from vyper.warnings import VyperWarning, vyper_warn
+from vyper.warnings import VyperWarning, capture_warnings, vyper_warn
+
+if TYPE_CHECKING:
+    from vyper.codegen.ir_node import IRnode
+
+# note: codegen, venom and the assembler are imported lazily, in the
+# phases which need them, to keep the import time of the compiler (and
+# e.g. `vyper -f abi`) down.
 
 DEFAULT_CONTRACT_PATH = PurePath("VyperContract.vy")
 
 
+def enable_module_sharing(
+    input_bundle: InputBundle, module_cache: Optional[ModuleCache] = None
+) -> ModuleCache:
+    """
+    Share imported modules (and their analysis) between all compilation
+    targets which are loaded from `input_bundle`, so that modules which
+    are imported by several targets are only parsed and analyzed once.
+
+    The targets must be compiled one after the other, i.e. all outputs
+    for one target should be generated before moving on to the next one.
+    """
+    if module_cache is None:
+        module_cache = ModuleCache()
+    input_bundle._cache.module_cache = module_cache
+    return module_cache
+
+
 class CompilerData:
     """
     Object for fetching and storing compiler data for a Vyper contract.
@@ -55,6 +78,10 @@ class CompilerData:
         Assembly instructions for deployment bytecode
     assembly_runtime : list
         Assembly instructions for runtime bytecode
+    assembled : tuple[bytes, dict, dict]
+        Deployment bytecode, pc maps and symbol map
+    assembled_runtime : tuple[bytes, dict, dict]
+        Runtime bytecode, pc maps and symbol map
     bytecode : bytes
         Deployment bytecode
     bytecode_runtime : bytes
@@ -102,6 +129,8 @@ class CompilerData:
         self.original_settings = settings
         self.input_bundle = input_bundle or FilesystemInputBundle([Path(".")])
         self.expected_integrity_sum = integrity_sum
+        # whether `_parsed_module` is (being) annotated by analysis
+        self._parsed_module_annotated = False
 
     @cached_property
     def source_code(self):
@@ -115,8 +144,7 @@ class CompilerData:
     def contract_path(self):
         return self.file_input.path
 
-    @cached_property
-    def vyper_module(self):
+    def _parse(self) -> vy_ast.Module:
         is_vyi = self.contract_path.suffix == ".vyi"
 
         ast = vy_ast.parse_to_ast(
@@ -129,9 +157,27 @@ class CompilerData:
 
         return ast
 
+    @cached_property
+    @profiled("parse")
+    def _parsed_module(self) -> vy_ast.Module:
+        return self._parse()
+
+    @cached_property
+    def vyper_module(self) -> vy_ast.Module:
+        # the unannotated module (e.g. for `-f ast` output)
+        if not self._parsed_module_annotated:
+            # if analysis runs later, it will work on a copy of it
+            return self._parsed_module
+
+        # the parsed module was already handed to analysis, which annotates
+        # it in place. parse the source again (the warnings were already
+        # emitted by the first parse).
+        with profile_phase("parse"), capture_warnings():
+            return self._parse()
+
     @cached_property
     def settings(self):
-        settings = self.vyper_module.settings
+        settings = self._parsed_module.settings
 
         if self.original_settings:
             og_settings = self.original_settings
@@ -157,11 +203,27 @@ class CompilerData:
         return imports_integrity_sum
 
     @cached_property
+    @profiled("resolve_imports")
     def _resolve_imports(self):
-        # deepcopy so as to not interfere with `-f ast` output
-        vyper_module = copy.deepcopy(self.vyper_module)
+        if "vyper_module" in self.__dict__:
+            # deepcopy so as to not interfere with `-f ast` output
+            vyper_module = copy.deepcopy(self.vyper_module)
+        else:
+            # nobody else has seen the parsed module, so analysis can
+            # annotate it in place. this saves copying the whole tree.
+            vyper_module = self._parsed_module
+            self._parsed_module_annotated = True
+
+        # imported modules may be shared with other compilation targets
+        # (cf. `enable_module_sharing()`). since analysis depends on the
+        # settings, they are part of the key for the shared modules.
+        module_cache = self._module_cache
+        settings_key = None
+        if module_cache is not None:
+            settings_key = json.dumps(self.settings.as_dict(), sort_keys=True)
+
         with self.input_bundle.search_path(Path(vyper_module.resolved_path).parent):
-            imports = resolve_imports(vyper_module, self.input_bundle)
+            imports = resolve_imports(vyper_module, self.input_bundle, module_cache, settings_key)
 
         # check integrity sum
         integrity_sum = self._compute_integrity_sum(imports._integrity_sum)
@@ -186,10 +248,29 @@ class CompilerData:
     def resolved_imports(self):
         return self._resolve_imports[1]
 
+    @property
+    def _module_cache(self) -> Optional[ModuleCache]:
+        return getattr(self.input_bundle._cache, "module_cache", None)
+
     @cached_property
+    @profiled("analyze")
     def _annotate(self) -> tuple[natspec.NatspecOutput, vy_ast.Module]:
         module = self._resolve_imports[0]
-        analyze_module(module)
+        imported_modules = [
+            m
+            for m in self.resolved_imports.compiler_inputs.values()
+            if isinstance(m, vy_ast.Module)
+        ]
+        analyzed = set(id(m) for m in imported_modules if "type" in m._metadata)
+        try:
+            analyze_module(module)
+        except Exception:
+            # don't share modules which were left partially analyzed
+            if (module_cache := self._module_cache) is not None:
+                for m in imported_modules:
+                    if id(m) not in analyzed:
+                        module_cache.discard(m)
+            raise
         nspec = natspec.parse_natspec(module)
         return nspec, module
 
@@ -213,6 +294,7 @@ class CompilerData:
         return self.annotated_vyper_module
 
     @cached_property
+    @profiled("storage_layout")
     def storage_layout(self) -> StorageLayout:
         module_ast = self.compilation_target
         storage_layout = None
@@ -256,14 +338,19 @@ class CompilerData:
 
     @cached_property
     def venom_functions(self):
+        from vyper.venom import generate_ir
+
         deploy_ir, runtime_ir = self._ir_output
         deploy_venom = generate_ir(deploy_ir, self.settings)
         runtime_venom = generate_ir(runtime_ir, self.settings)
         return deploy_venom, runtime_venom
 
     @cached_property
+    @profiled("assembly")
     def assembly(self) -> list:
         if self.settings.experimental_codegen:
+            from vyper.venom import generate_assembly_experimental
+
             deploy_code, runtime_code = self.venom_functions
             assert self.settings.optimize is not None  # mypy hint
             return generate_assembly_experimental(
@@ -274,23 +361,32 @@ class CompilerData:
 
     @cached_property
     def assembly_runtime(self) -> list:
-        if self.settings.experimental_codegen:
-            _, runtime_code = self.venom_functions
-            assert self.settings.optimize is not None  # mypy hint
-            return generate_assembly_experimental(runtime_code, optimize=self.settings.optimize)
-        else:
-            return generate_assembly(self.ir_runtime, self.settings.optimize)
+        # the runtime code is embedded in the deploy code, so reuse it
+        # instead of generating the runtime assembly a second time.
+        return extract_runtime_assembly(self.assembly)
 
     @cached_property
-    def bytecode(self) -> bytes:
+    def assembled(self) -> tuple[bytes, dict, dict]:
+        """
+        The deploy bytecode, along with the pc maps and the symbol map
+        produced while assembling it.
+        """
         metadata = None
         if not self.no_bytecode_metadata:
             metadata = bytes.fromhex(self.integrity_sum)
-        return generate_bytecode(self.assembly, compiler_metadata=metadata)
+        return assemble(self.assembly, compiler_metadata=metadata)
 
     @cached_property
+    def assembled_runtime(self) -> tuple[bytes, dict, dict]:
+        return assemble(self.assembly_runtime, compiler_metadata=None)
+
+    @property
+    def bytecode(self) -> bytes:
+        return self.assembled[0]
+
+    @property
     def bytecode_runtime(self) -> bytes:
-        return generate_bytecode(self.assembly_runtime, compiler_metadata=None)
+        return self.assembled_runtime[0]
 
     @cached_property
     def blueprint_bytecode(self) -> bytes:
@@ -323,16 +419,22 @@ def generate_ir_nodes(global_ctx: ModuleT, settings: Settings) -> tuple[IRnode,
         IR to generate deployment bytecode
         IR to generate runtime bytecode
     """
+    import vyper.codegen.core as codegen
+    from vyper.codegen import module
+    from vyper.ir import optimizer
+    from vyper.ir.compile_ir import reset_symbols
+
     # make IR output the same between runs
     codegen.reset_names()
     reset_symbols()
 
-    with anchor_settings(settings):
+    with anchor_settings(settings), profile_phase("codegen"):
         ir_nodes, ir_runtime = module.generate_ir_for_module(global_ctx)
 
     if should_run_legacy_optimizer(settings):
-        ir_nodes = optimizer.optimize(ir_nodes)
-        ir_runtime = optimizer.optimize(ir_runtime)
+        with profile_phase("legacy_optimizer"):
+            ir_nodes = optimizer.optimize(ir_nodes)
+            ir_runtime = optimizer.optimize(ir_runtime)
 
     return ir_nodes, ir_runtime
 
@@ -351,6 +453,8 @@ def generate_assembly(ir_nodes: IRnode, optimize: Optional[OptimizationLevel] =
     list
         List of assembly instructions.
     """
+    from vyper.ir import compile_ir
+
     optimize = optimize or OptimizationLevel.default()
     assembly = compile_ir.compile_to_assembly(ir_nodes, optimize=optimize)
 
@@ -372,6 +476,30 @@ def _find_nested_opcode(assembly, key):
         return any(_find_nested_opcode(x, key) for x in sublists)
 
 
+def extract_runtime_assembly(assembly: list) -> list:
+    """
+    Get the runtime assembly from the deployment assembly, where it is
+    embedded as a sublist starting with a `RuntimeHeader`.
+
+    Arguments
+    ---------
+    assembly : list
+        Assembly instructions for deployment bytecode.
+
+    Returns
+    -------
+    list
+        Assembly instructions for runtime bytecode.
+    """
+    from vyper.ir.compile_ir import RuntimeHeader
+
+    for item in assembly:
+        if isinstance(item, list) and isinstance(item[0], RuntimeHeader):
+            return item[1:]
+
+    raise CompilerPanic("runtime code not found in deploy assembly")  # pragma: nocover
+
+
 def generate_bytecode(assembly: list, compiler_metadata: Optional[Any]) -> bytes:
     """
     Generate bytecode from assembly instructions.
@@ -386,4 +514,17 @@ def generate_bytecode(assembly: list, compiler_metadata: Optional[Any]) -> bytes
     bytes
         Final compiled bytecode.
     """
-    return compile_ir.assembly_to_evm(assembly, compiler_metadata=compiler_metadata)[0]
+    return assemble(assembly, compiler_metadata=compiler_metadata)[0]
+
+
+def assemble(assembly: list, compiler_metadata: Optional[Any]) -> tuple[bytes, dict, dict]:
+    """
+    Like `generate_bytecode()`, but also return the pc maps (used for the
+    source map outputs) and the symbol map.
+    """
+    from vyper.ir import compile_ir
+
+    with profile_phase("assembly_to_evm"):
+        return compile_ir.assembly_to_evm_with_symbol_map(
+            assembly, compiler_metadata=compiler_metadata
+        )
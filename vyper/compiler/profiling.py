@@ -0,0 +1,243 @@
+"""
+instrumentation for timing the phases of the compiler.
+
+phases are recorded by the active `PhaseProfiler` (cf. `use_profiler()`).
+when no profiler is active, `profile_phase()` and `profiled()` are no-ops.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+# write a phase profile to the given file (cf. `vyper --profile-phases`)
+VYPER_PROFILE = os.environ.get("VYPER_PROFILE")
+# format of the phase profile, "json" or "chrome"
+VYPER_PROFILE_FORMAT = os.environ.get("VYPER_PROFILE_FORMAT", "json")
+# also record memory allocations (slows down compilation considerably)
+VYPER_PROFILE_ALLOCATIONS = os.environ.get("VYPER_PROFILE_ALLOCATIONS", "0") == "1"
+
+PROFILE_FORMATS = ("json", "chrome")
+
+
+@dataclass
+class PhaseEvent:
+    name: str
+    category: str
+    # seconds since the profiler was started
+    start: float
+    # wall time of the phase, including and excluding nested phases
+    duration: float = 0.0
+    self_duration: float = 0.0
+    depth: int = 0
+    # bytes allocated (and not freed) during the phase, and the peak
+    # allocation during the phase, relative to its start
+    alloc_net: Optional[int] = None
+    alloc_peak: Optional[int] = None
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Frame:
+    event: PhaseEvent
+    child_duration: float = 0.0
+    mem_start: int = 0
+    mem_peak: int = 0
+
+
+class PhaseProfiler:
+    """
+    Records the wall time (and optionally, the memory allocations) of
+    each phase. Phases can be nested, e.g. a venom pass runs inside of
+    the phase which generates venom IR.
+
+    Allocations are traced using `tracemalloc`, which makes everything
+    several times slower, so they are not traced by default.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.events: list[PhaseEvent] = []
+        self._stack: list[_Frame] = []
+        self._t0 = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter()
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @property
+    def _tracing(self) -> bool:
+        return self.trace_allocations and tracemalloc.is_tracing()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, category: str = "compiler", **args) -> Iterator[PhaseEvent]:
+        start = time.perf_counter() - self._t0
+        event = PhaseEvent(name, category, start, depth=len(self._stack), args=args)
+        self.events.append(event)
+        frame = _Frame(event)
+
+        tracing = self._tracing
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if len(self._stack) > 0:
+                parent = self._stack[-1]
+                parent.mem_peak = max(parent.mem_peak, peak)
+            tracemalloc.reset_peak()
+            frame.mem_start = frame.mem_peak = current
+
+        self._stack.append(frame)
+        try:
+            yield event
+        finally:
+            self._stack.pop()
+
+            event.duration = time.perf_counter() - self._t0 - start
+            event.self_duration = event.duration - frame.child_duration
+            if len(self._stack) > 0:
+                self._stack[-1].child_duration += event.duration
+
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(frame.mem_peak, peak)
+                event.alloc_net = current - frame.mem_start
+                event.alloc_peak = peak - frame.mem_start
+                if len(self._stack) > 0:
+                    parent = self._stack[-1]
+                    parent.mem_peak = max(parent.mem_peak, peak)
+                tracemalloc.reset_peak()
+
+    def totals(self) -> dict[str, dict[str, Any]]:
+        """
+        Aggregate the events by phase name. Note that `self_duration`
+        adds up to the total time spent in phases, while `duration`
+        counts nested phases more than once. Boolean args (e.g. whether
+        a venom pass changed anything) are counted.
+        """
+        ret: dict[str, dict[str, Any]] = {}
+        for event in self.events:
+            item = ret.setdefault(
+                event.name,
+                {"category": event.category, "count": 0, "duration": 0.0, "self_duration": 0.0},
+            )
+            item["count"] += 1
+            item["duration"] += event.duration
+            item["self_duration"] += event.self_duration
+            if event.alloc_net is not None:
+                item["alloc_net"] = item.get("alloc_net", 0) + event.alloc_net
+                item["alloc_peak"] = max(item.get("alloc_peak", 0), event.alloc_peak)
+            for k, v in event.args.items():
+                if isinstance(v, bool):
+                    item[k] = item.get(k, 0) + v
+        return ret
+
+    def as_dict(self) -> dict:
+        return {"phases": [_event_to_dict(event) for event in self.events], "totals": self.totals()}
+
+    def as_chrome_trace(self) -> dict:
+        """
+        Output the events in the Chrome trace event format, which can be
+        loaded in e.g. chrome://tracing or https://ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = dict(event.args)
+            if event.alloc_net is not None:
+                args["alloc_net"] = event.alloc_net
+                args["alloc_peak"] = event.alloc_peak
+            trace_events.append(
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    # in microseconds
+                    "ts": event.start * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str, fmt: str = "json") -> None:
+        if fmt == "json":
+            report = self.as_dict()
+        elif fmt == "chrome":
+            report = self.as_chrome_trace()
+        else:
+            raise ValueError(f"invalid profile format: {fmt}")
+
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+def _event_to_dict(event: PhaseEvent) -> dict:
+    # like `dataclasses.asdict`, but without deep-copying the args
+    return {k: getattr(event, k) for k in event.__dataclass_fields__}
+
+
+_profiler: Optional[PhaseProfiler] = None
+
+
+@contextlib.contextmanager
+def use_profiler(profiler: PhaseProfiler) -> Iterator[PhaseProfiler]:
+    global _profiler
+    tmp = _profiler
+    _profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _profiler = tmp
+
+
+@contextlib.contextmanager
+def profile_phase(name: str, category: str = "compiler", **args) -> Iterator[None]:
+    """
+    Record the enclosed code as phase `name` in the active profiler.
+    """
+    if _profiler is None:
+        yield
+        return
+
+    with _profiler.phase(name, category, **args):
+        yield
+
+
+def current_phase() -> Optional[PhaseEvent]:
+    """
+    The innermost phase which is being recorded, if any.
+    """
+    if _profiler is None or len(_profiler._stack) == 0:
+        return None
+    return _profiler._stack[-1].event
+
+
+def profiled(name: str, category: str = "compiler") -> Callable:
+    """
+    Decorator version of `profile_phase()`.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile_phase(name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
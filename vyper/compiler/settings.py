@@ -9,6 +9,10 @@ VYPER_COLOR_OUTPUT = os.environ.get("VYPER_COLOR_OUTPUT", "0") == "1"
 VYPER_ERROR_CONTEXT_LINES = int(os.environ.get("VYPER_ERROR_CONTEXT_LINES", "1"))
 VYPER_ERROR_LINE_NUMBERS = os.environ.get("VYPER_ERROR_LINE_NUMBERS", "1") == "1"
 
+# sanity check the IR nodes generated by the codegen (argument counts and
+# valencies). set VYPER_CHECK_IR=0 to skip the checks for faster compilation.
+VYPER_CHECK_IR = os.environ.get("VYPER_CHECK_IR", "1") == "1"
+
 VYPER_TRACEBACK_LIMIT: Optional[int]
 
 _tb_limit_str = os.environ.get("VYPER_TRACEBACK_LIMIT")
@@ -56,6 +56,9 @@ class _BaseVyperException(Exception):
         self.annotations = None
         self.resolved_path = None
 
+        # set when the exception is unpickled, see __reduce__
+        self._formatted = None
+
         if len(items) == 1 and isinstance(items[0], tuple) and isinstance(items[0][0], int):
             # support older exceptions that don't annotate - remove this in the future!
             self.lineno, self.col_offset = items[0][:2]
@@ -166,6 +169,9 @@ class _BaseVyperException(Exception):
         return self._add_hint(self._str_helper())
 
     def _str_helper(self):
+        if getattr(self, "_formatted", None) is not None:
+            return self._formatted
+
         if not self.annotations:
             if self.lineno is not None and self.col_offset is not None:
                 return f"line {self.lineno}:{self.col_offset} {self.message}"
@@ -186,6 +192,32 @@ class _BaseVyperException(Exception):
         annotation_msg = "\n".join(annotation_list)
         return f"{self.message}\n\n{annotation_msg}"
 
+    def __copy__(self):
+        # don't go through __reduce__, a copy should keep the annotations
+        ret = type(self).__new__(type(self))
+        ret.args = self.args
+        ret.__dict__.update(self.__dict__)
+        return ret
+
+    def __reduce__(self):
+        # exceptions can be sent between processes (e.g. by parallel
+        # compilation), but annotations reference AST nodes and hints may
+        # be closures, neither of which can be (cheaply) pickled. so pickle
+        # a copy with the annotations and hint already formatted.
+        state = self.__dict__.copy()
+        state["_formatted"] = self._str_helper()
+        state["_hint"] = self.hint
+        state["annotations"] = None
+        state["prev_decl"] = None
+        return (_unpickle_exception, (type(self), state))
+
+
+def _unpickle_exception(cls, state):
+    # bypass __init__, subclasses may have different signatures
+    ret = cls.__new__(cls)
+    ret.__dict__.update(state)
+    return ret
+
 
 class VyperException(_BaseVyperException):
     pass
@@ -1,6 +1,7 @@
 import copy
 import functools
 import math
+from collections import Counter
 from dataclasses import dataclass
 
 import cbor2
@@ -809,40 +810,89 @@ def note_breakpoint(line_number_map, pc, item):
 _TERMINAL_OPS = ("JUMP", "RETURN", "REVERT", "STOP", "INVALID")
 
 
+# NOTE: the rewrites below scan the assembly once from left to right.
+# rather than deleting items in place (which is quadratic), they copy
+# the items they keep to a new list. items which are rewritten but
+# still need to be scanned are written back into the input, ahead of
+# the scan position `i`. (so `assembly[i:]` is always the part of the
+# assembly which is still to be scanned.)
+
+
+# find the next `item` in assembly[start:stop], or return `stop`.
+# the rewrites use this to skip to the next possible match (in C).
+def _find(assembly, item, start, stop):
+    try:
+        return assembly.index(item, start, stop)
+    except ValueError:
+        return stop
+
+
+# find all positions of `item` in assembly[start:stop]
+def _find_all(assembly, item, start, stop):
+    ret = []
+    i = _find(assembly, item, start, stop)
+    while i < stop:
+        ret.append(i)
+        i = _find(assembly, item, i + 1, stop)
+    return ret
+
+
+# positions of all symbols in assembly
+def _symbol_positions(assembly):
+    # (inlined is_symbol(), this is hot)
+    return [
+        i for i, item in enumerate(assembly) if isinstance(item, str) and item.startswith("_sym_")
+    ]
+
+
 def _prune_unreachable_code(assembly):
     # delete code between terminal ops and JUMPDESTS as those are
     # unreachable
     changed = False
+    n = len(assembly)
+    terminal_ops = sorted(i for op in _TERMINAL_OPS for i in _find_all(assembly, op, 0, n - 1))
+    ret = []
     i = 0
-    while i < len(assembly) - 1:
-        if assembly[i] in _TERMINAL_OPS:
-            # find the next jumpdest or sublist
-            for j in range(i + 1, len(assembly)):
-                next_is_jumpdest = (
-                    j < len(assembly) - 1
-                    and is_symbol(assembly[j])
-                    and assembly[j + 1] == "JUMPDEST"
-                )
-                next_is_list = isinstance(assembly[j], list)
-                if next_is_jumpdest or next_is_list:
-                    break
-            else:
-                # fixup an off-by-one if we made it to the end of the assembly
-                # without finding an jumpdest or sublist
-                j = len(assembly)
-            changed = j > i + 1
-            del assembly[i + 1 : j]
+    for t in terminal_ops:
+        if t < i:
+            # already deleted
+            continue
 
-        i += 1
+        ret.extend(assembly[i : t + 1])
 
+        # find the next jumpdest or sublist
+        for j in range(t + 1, n):
+            next_is_jumpdest = (
+                j < n - 1 and is_symbol(assembly[j]) and assembly[j + 1] == "JUMPDEST"
+            )
+            next_is_list = isinstance(assembly[j], list)
+            if next_is_jumpdest or next_is_list:
+                break
+        else:
+            # fixup an off-by-one if we made it to the end of the assembly
+            # without finding an jumpdest or sublist
+            j = n
+        changed = j > t + 1
+        i = j
+
+    ret.extend(assembly[i:])
+    assembly[:] = ret
     return changed
 
 
 def _prune_inefficient_jumps(assembly):
     # prune sequences `_sym_x JUMP _sym_x JUMPDEST` to `_sym_x JUMPDEST`
     changed = False
+    n = len(assembly)
+    ret = []
     i = 0
-    while i < len(assembly) - 4:
+    while i < n - 4:
+        j = _find(assembly, "JUMP", i + 1, n - 3) - 1
+        ret.extend(assembly[i:j])
+        i = j
+        if i == n - 4:
+            break
+
         if (
             is_symbol(assembly[i])
             and assembly[i + 1] == "JUMP"
@@ -851,10 +901,13 @@ def _prune_inefficient_jumps(assembly):
         ):
             # delete _sym_x JUMP
             changed = True
-            del assembly[i : i + 2]
+            i += 2
         else:
+            ret.append(assembly[i])
             i += 1
 
+    ret.extend(assembly[i:])
+    assembly[:] = ret
     return changed
 
 
@@ -862,8 +915,16 @@ def _optimize_inefficient_jumps(assembly):
     # optimize sequences `_sym_common JUMPI _sym_x JUMP _sym_common JUMPDEST`
     # to `ISZERO _sym_x JUMPI _sym_common JUMPDEST`
     changed = False
+    n = len(assembly)
+    ret = []
     i = 0
-    while i < len(assembly) - 6:
+    while i < n - 6:
+        j = _find(assembly, "JUMPI", i + 1, n - 5) - 1
+        ret.extend(assembly[i:j])
+        i = j
+        if i == n - 6:
+            break
+
         if (
             is_symbol(assembly[i])
             and assembly[i + 1] == "JUMPI"
@@ -873,13 +934,16 @@ def _optimize_inefficient_jumps(assembly):
             and assembly[i + 5] == "JUMPDEST"
         ):
             changed = True
-            assembly[i] = "ISZERO"
-            assembly[i + 1] = assembly[i + 2]
-            assembly[i + 2] = "JUMPI"
-            del assembly[i + 3 : i + 4]
+            ret.append("ISZERO")
+            # continue scanning at `_sym_x JUMPI`
+            assembly[i + 3] = "JUMPI"
+            i += 2
         else:
+            ret.append(assembly[i])
             i += 1
 
+    ret.extend(assembly[i:])
+    assembly[:] = ret
     return changed
 
 
@@ -890,31 +954,46 @@ def _merge_jumpdests(assembly):
     # (Usually a chain of JUMPs is created by a nested block,
     # or some nested if statements.)
     changed = False
-    i = 0
-    while i < len(assembly) - 3:
-        if is_symbol(assembly[i]) and assembly[i + 1] == "JUMPDEST":
-            current_symbol = assembly[i]
-            if is_symbol(assembly[i + 2]) and assembly[i + 3] == "JUMPDEST":
-                # _sym_x JUMPDEST _sym_y JUMPDEST
-                # replace all instances of _sym_x with _sym_y
-                # (except for _sym_x JUMPDEST - don't want duplicate labels)
-                new_symbol = assembly[i + 2]
-                if new_symbol != current_symbol:
-                    for j in range(len(assembly)):
-                        if assembly[j] == current_symbol and i != j:
-                            assembly[j] = new_symbol
-                            changed = True
-            elif is_symbol(assembly[i + 2]) and assembly[i + 3] == "JUMP":
-                # _sym_x JUMPDEST _sym_y JUMP
-                # replace all instances of _sym_x with _sym_y
-                # (except for _sym_x JUMPDEST - don't want duplicate labels)
-                new_symbol = assembly[i + 2]
-                for j in range(len(assembly)):
-                    if assembly[j] == current_symbol and i != j:
-                        assembly[j] = new_symbol
-                        changed = True
 
-        i += 1
+    # note that renaming only replaces symbols with other symbols, so
+    # the positions of `_sym_x JUMPDEST` sequences do not change.
+    jumpdests = [
+        i - 1
+        for i in _find_all(assembly, "JUMPDEST", 1, len(assembly) - 2)
+        if is_symbol(assembly[i - 1])
+    ]
+
+    # index of the positions of each symbol, so that renaming a symbol
+    # does not need to scan the whole assembly. (built on first use)
+    symbol_positions: dict[str, list[int]] = {}
+
+    def _rename(i, current_symbol, new_symbol):
+        # replace all instances of current_symbol with new_symbol
+        # (except for _sym_x JUMPDEST - don't want duplicate labels)
+        nonlocal changed
+        if len(symbol_positions) == 0:
+            for j in _symbol_positions(assembly):
+                symbol_positions.setdefault(assembly[j], []).append(j)
+
+        positions = symbol_positions[current_symbol]
+        for j in positions:
+            if j != i:
+                assembly[j] = new_symbol
+                changed = True
+        if new_symbol != current_symbol:
+            symbol_positions[current_symbol] = [i]
+            symbol_positions[new_symbol].extend(j for j in positions if j != i)
+
+    for i in jumpdests:
+        current_symbol = assembly[i]
+        if is_symbol(assembly[i + 2]) and assembly[i + 3] == "JUMPDEST":
+            # _sym_x JUMPDEST _sym_y JUMPDEST
+            new_symbol = assembly[i + 2]
+            if new_symbol != current_symbol:
+                _rename(i, current_symbol, new_symbol)
+        elif is_symbol(assembly[i + 2]) and assembly[i + 3] == "JUMP":
+            # _sym_x JUMPDEST _sym_y JUMP
+            _rename(i, current_symbol, assembly[i + 2])
 
     return changed
 
@@ -936,32 +1015,59 @@ _RETURNS_ZERO_OR_ONE = {
 def _merge_iszero(assembly):
     changed = False
 
+    n = len(assembly)
+    ret = []
     i = 0
     # list of opcodes that return 0 or 1
-    while i < len(assembly) - 2:
+    while i < n - 2:
+        j = _find(assembly, "ISZERO", i + 1, n - 1) - 1
+        ret.extend(assembly[i:j])
+        i = j
+        if i == n - 2:
+            break
+
+        item = assembly[i]
         if (
-            isinstance(assembly[i], str)
-            and assembly[i] in _RETURNS_ZERO_OR_ONE
-            and assembly[i + 1 : i + 3] == ["ISZERO", "ISZERO"]
+            isinstance(item, str)
+            and item in _RETURNS_ZERO_OR_ONE
+            and assembly[i + 1] == "ISZERO"
+            and assembly[i + 2] == "ISZERO"
         ):
             changed = True
             # drop the extra iszeros
-            del assembly[i + 1 : i + 3]
+            assembly[i + 2] = item
+            i += 2
         else:
+            ret.append(item)
             i += 1
+    ret.extend(assembly[i:])
+    assembly[:] = ret
+
+    n = len(assembly)
+    ret = []
     i = 0
-    while i < len(assembly) - 3:
+    while i < n - 3:
+        j = _find(assembly, "ISZERO", i, n - 3)
+        ret.extend(assembly[i:j])
+        i = j
+        if i == n - 3:
+            break
+
         # ISZERO ISZERO could map truthy to 1,
         # but it could also just be a no-op before JUMPI.
         if (
-            assembly[i : i + 2] == ["ISZERO", "ISZERO"]
+            assembly[i] == "ISZERO"
+            and assembly[i + 1] == "ISZERO"
             and is_symbol(assembly[i + 2])
             and assembly[i + 3] == "JUMPI"
         ):
             changed = True
-            del assembly[i : i + 2]
+            i += 2
         else:
+            ret.append(assembly[i])
             i += 1
+    ret.extend(assembly[i:])
+    assembly[:] = ret
 
     return changed
 
@@ -977,15 +1083,25 @@ def is_symbol_map_indicator(asm_node):
 def _prune_unused_jumpdests(assembly):
     changed = False
 
-    used_jumpdests = set()
-
-    # find all used jumpdests
-    for i in range(len(assembly) - 1):
-        if is_symbol(assembly[i]) and not is_symbol_map_indicator(assembly[i + 1]):
-            used_jumpdests.add(assembly[i])
+    n = len(assembly)
+    # positions of `_sym_x JUMPDEST`
+    labels = [i - 1 for i in _find_all(assembly, "JUMPDEST", 1, n) if is_symbol(assembly[i - 1])]
+
+    # find all used jumpdests. count all occurrences of each symbol,
+    # and subtract the ones which are not uses (i.e. labels, and a
+    # symbol at the very end)
+    reference_counts = Counter(filter(str.__instancecheck__, assembly))
+    for i in labels:
+        reference_counts[assembly[i]] -= 1
+    if n > 0 and is_symbol(assembly[-1]):
+        reference_counts[assembly[-1]] -= 1
+
+    used_jumpdests = {
+        symbol for symbol, count in reference_counts.items() if count > 0 and is_symbol(symbol)
+    }
 
-    for item in assembly:
-        if isinstance(item, list) and isinstance(item[0], DataHeader):
+    for item in filter(list.__instancecheck__, assembly):
+        if isinstance(item[0], DataHeader):
             # add symbols used in data sections as they are likely
             # used for a jumptable.
             for t in item:
@@ -993,40 +1109,57 @@ def _prune_unused_jumpdests(assembly):
                     used_jumpdests.add(t)
 
     # delete jumpdests that aren't used
+    ret = []
     i = 0
-    while i < len(assembly) - 2:
-        if is_symbol(assembly[i]) and assembly[i] not in used_jumpdests:
+    for j in labels:
+        if j >= n - 2:
+            break
+        if assembly[j] not in used_jumpdests:
             changed = True
-            del assembly[i : i + 2]
-        else:
-            i += 1
+            ret.extend(assembly[i:j])
+            i = j + 2
 
+    ret.extend(assembly[i:])
+    assembly[:] = ret
     return changed
 
 
+# all patterns in _stack_peephole_opts start with one of these
+_PEEPHOLE_OPS = frozenset(["DUP1"] + [f"SWAP{i}" for i in range(1, 17)])
+
+
 def _stack_peephole_opts(assembly):
     changed = False
+    n = len(assembly)
+    ret = []
     i = 0
-    while i < len(assembly) - 2:
-        if assembly[i : i + 3] == ["DUP1", "SWAP2", "SWAP1"]:
+    while i < n - 2:
+        item = assembly[i]
+        if not (isinstance(item, str) and item in _PEEPHOLE_OPS):
+            # fast path, none of the patterns match
+            ret.append(item)
+            i += 1
+            continue
+
+        if assembly[i] == "DUP1" and assembly[i + 1] == "SWAP2" and assembly[i + 2] == "SWAP1":
             changed = True
-            del assembly[i + 2]
-            assembly[i] = "SWAP1"
-            assembly[i + 1] = "DUP2"
+            assembly[i + 1] = "SWAP1"
+            assembly[i + 2] = "DUP2"
+            i += 1
             continue
         # usually generated by with statements that return their input like
         # (with x (...x))
-        if assembly[i : i + 3] == ["DUP1", "SWAP1", "POP"]:
+        if assembly[i] == "DUP1" and assembly[i + 1] == "SWAP1" and assembly[i + 2] == "POP":
             # DUP1 SWAP1 POP == no-op
             changed = True
-            del assembly[i : i + 3]
+            i += 3
             continue
         # usually generated by nested with statements that don't return like
         # (with x (with y ...))
-        if assembly[i : i + 3] == ["SWAP1", "POP", "POP"]:
+        if assembly[i] == "SWAP1" and assembly[i + 1] == "POP" and assembly[i + 2] == "POP":
             # SWAP1 POP POP == POP POP
             changed = True
-            del assembly[i]
+            i += 1
             continue
         if (
             isinstance(assembly[i], str)
@@ -1034,34 +1167,64 @@ def _stack_peephole_opts(assembly):
             and assembly[i] == assembly[i + 1]
         ):
             changed = True
-            del assembly[i : i + 2]
+            i += 2
         if assembly[i] == "SWAP1" and assembly[i + 1].lower() in COMMUTATIVE_OPS:
             changed = True
-            del assembly[i]
+            i += 1
         if assembly[i] == "DUP1" and assembly[i + 1] == "SWAP1":
             changed = True
-            del assembly[i + 1]
+            # delete the SWAP1
+            assembly[i + 1] = assembly[i]
+            i += 1
+        ret.append(assembly[i])
         i += 1
 
+    ret.extend(assembly[i:])
+    assembly[:] = ret
     return changed
 
 
+_ASSEMBLY_REWRITES = (
+    _prune_unreachable_code,
+    _merge_iszero,
+    _merge_jumpdests,
+    _prune_inefficient_jumps,
+    _optimize_inefficient_jumps,
+    _prune_unused_jumpdests,
+    _stack_peephole_opts,
+)
+
+
 # optimize assembly, in place
 def optimize_assembly(assembly):
     for x in assembly:
         if isinstance(x, list) and isinstance(x[0], RuntimeHeader):
             optimize_assembly(x)
 
+    # the rewrites only depend on the assembly, so a rewrite which did
+    # not change anything does not need to run again until some other
+    # rewrite changes the assembly. `version` counts the changes, and
+    # `clean` records the version at which each rewrite last found
+    # nothing to do.
+    version = 0
+    clean: dict = {}
+
     for _ in range(1024):
         changed = False
 
-        changed |= _prune_unreachable_code(assembly)
-        changed |= _merge_iszero(assembly)
-        changed |= _merge_jumpdests(assembly)
-        changed |= _prune_inefficient_jumps(assembly)
-        changed |= _optimize_inefficient_jumps(assembly)
-        changed |= _prune_unused_jumpdests(assembly)
-        changed |= _stack_peephole_opts(assembly)
+        for rewrite in _ASSEMBLY_REWRITES:
+            if clean.get(rewrite) == version:
+                continue
+
+            length = len(assembly)
+            rewrite_changed = rewrite(assembly)
+            changed |= rewrite_changed
+            # NOTE: _prune_unreachable_code can delete code without
+            # reporting a change
+            if rewrite_changed or len(assembly) != length:
+                version += 1
+            else:
+                clean[rewrite] = version
 
         if not changed:
             return
@@ -1086,13 +1249,25 @@ def adjust_pc_maps(pc_maps, ofst):
 SYMBOL_SIZE = 2  # size of a PUSH instruction for a code symbol
 
 
-def _data_to_evm(assembly, symbol_map):
-    ret = bytearray()
+# encode `x` in exactly `n` bytes, cf. PUSH_N
+def _to_bytes_n(x, n):
+    assert 0 <= x < 2 ** (8 * n), (x, n)
+    return x.to_bytes(n, "big")
+
+
+# emit PUSH<n> with a placeholder for the value of `symbol` + `ofst`
+def _emit_push_fixup(ret, fixups, symbol, ofst, n):
+    ret.append(PUSH_OFFSET + n)
+    fixups.append((len(ret), n, symbol, ofst))
+    ret.extend(bytes(n))
+
+
+def _emit_data(ret, fixups, assembly):
     assert isinstance(assembly[0], DataHeader)
     for item in assembly[1:]:
         if is_symbol(item):
-            symbol = symbol_map[item].to_bytes(SYMBOL_SIZE, "big")
-            ret.extend(symbol)
+            fixups.append((len(ret), SYMBOL_SIZE, item, 0))
+            ret.extend(bytes(SYMBOL_SIZE))
         elif isinstance(item, int):
             ret.append(item)
         elif isinstance(item, bytes):
@@ -1100,8 +1275,6 @@ def _data_to_evm(assembly, symbol_map):
         else:
             raise ValueError(f"invalid data {type(item)} {item}")
 
-    return ret
-
 
 # predict what length of an assembly [data] node will be in bytecode
 def _length_of_data(assembly):
@@ -1225,9 +1398,29 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
     data_section_lengths = []
     immutables_len = None
 
-    # go through the code, resolving symbolic locations
-    # (i.e. JUMPDEST locations) to actual code locations
+    opcodes = get_opcodes()
+
+    ret = bytearray()
+    # symbols can be used before they are defined, so we emit zeroes for
+    # them and patch them in once all symbols have been resolved.
+    # each fixup is (position in ret, size, symbol, offset).
+    fixups: list[tuple[int, int, str, int]] = []
+
+    # single pass over the code: emit bytecode, resolve symbolic locations
+    # (i.e. JUMPDEST locations) to actual code locations, and build the
+    # line number map.
+    to_skip = 0
     for i, item in enumerate(assembly):
+        if to_skip > 0:
+            to_skip -= 1
+            continue
+
+        if isinstance(item, int):
+            # fast path for PUSH immediates, which are most of the items
+            ret.append(item)
+            pc += 1
+            continue
+
         note_line_num(line_number_map, pc, item)
         if item == "DEBUG":
             continue  # skip debug
@@ -1248,7 +1441,7 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
         elif item in ("JUMPI", "JUMPDEST"):
             line_number_map["pc_jump_map"][pc] = "-"
 
-        # update pc
+        # update pc and emit the item
         if is_symbol(item):
             if is_symbol_map_indicator(assembly[i + 1]):
                 # Don't increment pc as the symbol itself doesn't go into code
@@ -1257,16 +1450,26 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
 
                 symbol_map[item] = pc
             else:
+                # push a symbol to stack
+                _emit_push_fixup(ret, fixups, item, 0, SYMBOL_SIZE)
                 pc += SYMBOL_SIZE + 1  # PUSH2 highbits lowbits
         elif is_mem_sym(item):
             # PUSH<n> item
+            _emit_push_fixup(ret, fixups, item, 0, mem_ofst_size)
             pc += mem_ofst_size + 1
         elif is_ofst(item):
-            assert is_symbol(assembly[i + 1]) or is_mem_sym(assembly[i + 1])
-            assert isinstance(assembly[i + 2], int)
+            symbol, ofst = assembly[i + 1], assembly[i + 2]
+            assert is_symbol(symbol) or is_mem_sym(symbol)
+            assert isinstance(ofst, int)
             # [_OFST, _sym_foo, bar] -> PUSH2 (foo+bar)
             # [_OFST, _mem_foo, bar] -> PUSHN (foo+bar)
-            pc -= 1
+            n = mem_ofst_size if is_mem_sym(symbol) else SYMBOL_SIZE
+            # NOTE: the symbol is noted at the pc before the PUSH, which
+            # existing source maps depend on.
+            note_line_num(line_number_map, pc - 1, symbol)
+            _emit_push_fixup(ret, fixups, symbol, ofst, n)
+            pc += n + 1
+            to_skip = 2
         elif isinstance(item, list) and isinstance(item[0], RuntimeHeader):
             # we are in initcode
             symbol_map[item[0].label] = pc
@@ -1276,6 +1479,7 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
                 line_number_map[key].update(t[key])
             immutables_len = item[0].immutables_len
             pc += len(runtime_code)
+            ret.extend(runtime_code)
             # grab lengths of data sections from the runtime
             for t in item:
                 if isinstance(t, list) and isinstance(t[0], DataHeader):
@@ -1284,8 +1488,22 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
         elif isinstance(item, list) and isinstance(item[0], DataHeader):
             symbol_map[item[0].label] = pc
             pc += _length_of_data(item)
+            _emit_data(ret, fixups, item)
         else:
             pc += 1
+            if isinstance(item, str) and (op := item.upper()) in opcodes:
+                ret.append(opcodes[op][0])
+            elif item[:4] == "PUSH":
+                ret.append(PUSH_OFFSET + int(item[4:]))
+            elif item[:3] == "DUP":
+                ret.append(DUP_OFFSET + int(item[3:]))
+            elif item[:4] == "SWAP":
+                ret.append(SWAP_OFFSET + int(item[4:]))
+            else:  # pragma: no cover
+                # unreachable
+                raise ValueError(f"Weird symbol in assembly: {type(item)} {item}")
+
+    assert pc == len(ret), (pc, len(ret))
 
     bytecode_suffix = b""
     if compiler_metadata is not None:
@@ -1312,56 +1530,9 @@ def assembly_to_evm_with_symbol_map(assembly, pc_ofst=0, compiler_metadata=None)
     if runtime_code is not None:
         symbol_map["_sym_subcode_size"] = len(runtime_code)
 
-    # TODO refactor into two functions, create symbol_map and assemble
-
-    ret = bytearray()
-
-    # now that all symbols have been resolved, generate bytecode
-    # using the symbol map
-    to_skip = 0
-    for i, item in enumerate(assembly):
-        if to_skip > 0:
-            to_skip -= 1
-            continue
-
-        if item in ("DEBUG",):
-            continue  # skippable opcodes
-
-        elif is_symbol(item):
-            # push a symbol to stack
-            if not is_symbol_map_indicator(assembly[i + 1]):
-                bytecode, _ = assembly_to_evm(PUSH_N(symbol_map[item], n=SYMBOL_SIZE))
-                ret.extend(bytecode)
-
-        elif is_mem_sym(item):
-            bytecode, _ = assembly_to_evm(PUSH_N(symbol_map[item], n=mem_ofst_size))
-            ret.extend(bytecode)
-
-        elif is_ofst(item):
-            # _OFST _sym_foo 32
-            ofst = symbol_map[assembly[i + 1]] + assembly[i + 2]
-            n = mem_ofst_size if is_mem_sym(assembly[i + 1]) else SYMBOL_SIZE
-            bytecode, _ = assembly_to_evm(PUSH_N(ofst, n))
-            ret.extend(bytecode)
-            to_skip = 2
-
-        elif isinstance(item, int):
-            ret.append(item)
-        elif isinstance(item, str) and item.upper() in get_opcodes():
-            ret.append(get_opcodes()[item.upper()][0])
-        elif item[:4] == "PUSH":
-            ret.append(PUSH_OFFSET + int(item[4:]))
-        elif item[:3] == "DUP":
-            ret.append(DUP_OFFSET + int(item[3:]))
-        elif item[:4] == "SWAP":
-            ret.append(SWAP_OFFSET + int(item[4:]))
-        elif isinstance(item, list) and isinstance(item[0], RuntimeHeader):
-            ret.extend(runtime_code)
-        elif isinstance(item, list) and isinstance(item[0], DataHeader):
-            ret.extend(_data_to_evm(item, symbol_map))
-        else:  # pragma: no cover
-            # unreachable
-            raise ValueError(f"Weird symbol in assembly: {type(item)} {item}")
+    # now that all symbols have been resolved, patch them into the bytecode
+    for pos, n, symbol, ofst in fixups:
+        ret[pos : pos + n] = _to_bytes_n(symbol_map[symbol] + ofst, n)
 
     ret.extend(bytecode_suffix)
 
@@ -209,12 +209,8 @@ def _optimize_binop(binop, args, ann, parent_op):
     def _wrap(x):
         return _wrap256(x, unsigned=unsigned)
 
-    new_ann = None
-    if ann is not None:
-        l_ann = _shorten_annotation(args[0].annotation or str(args[0]))
-        r_ann = _shorten_annotation(args[1].annotation or str(args[1]))
-        new_ann = l_ann + symb + r_ann
-        new_ann = f"{ann} ({new_ann})"
+    # the operands in their original order (`args` may get swapped below)
+    ann_args = args
 
     def finalize(new_val, new_args):
         # if the original had side effects which might not be in the
@@ -226,6 +222,15 @@ def _optimize_binop(binop, args, ann, parent_op):
         if rollback:
             return None
 
+        # only build the annotation once an optimization happens, since
+        # it is expensive (it may print the operands)
+        new_ann = None
+        if ann is not None:
+            l_ann = _shorten_annotation(ann_args[0].annotation or str(ann_args[0]))
+            r_ann = _shorten_annotation(ann_args[1].annotation or str(ann_args[1]))
+            new_ann = l_ann + symb + r_ann
+            new_ann = f"{ann} ({new_ann})"
+
         return new_val, new_args, new_ann
 
     if _is_int(args[0]) and _is_int(args[1]):
@@ -417,14 +422,24 @@ def _check_symbols(symbols, ir_node):
 
 
 def optimize(node: IRnode) -> IRnode:
-    _, ret = _optimize(node, parent=None)
+    _, ret = _optimize(node, parent=None, fixpoints={})
     return ret
 
 
-def _optimize(node: IRnode, parent: Optional[IRnode]) -> Tuple[bool, IRnode]:
+# `fixpoints` holds the nodes which are known to be fully optimized, keyed
+# by the node id and the value of the parent (which is the only context
+# `_optimize` depends on). when a node changes, the new node gets optimized
+# again, and this lets its (unchanged, already optimized) children return
+# immediately instead of traversing their whole subtree again.
+# note the nodes are kept alive by the dict, so that their ids are not reused.
+def _optimize(node: IRnode, parent: Optional[IRnode], fixpoints: dict) -> Tuple[bool, IRnode]:
+    key = (id(node), parent.value if parent is not None else None)
+    if key in fixpoints:
+        return False, node
+
     starting_symbols = node.unique_symbols
 
-    res = [_optimize(arg, node) for arg in node.args]
+    res = [_optimize(arg, node, fixpoints) for arg in node.args]
     argz: list
     if len(res) == 0:
         args_changed, argz = False, []
@@ -441,7 +456,8 @@ def _optimize(node: IRnode, parent: Optional[IRnode]) -> Tuple[bool, IRnode]:
     annotation = node.annotation
     add_gas_estimate = node.add_gas_estimate
     is_self_call = node.is_self_call
-    passthrough_metadata = node.passthrough_metadata
+    # (skip the `passthrough_metadata` property, which allocates a dict)
+    passthrough_metadata = node._passthrough_metadata
 
     changed = False
 
@@ -453,6 +469,7 @@ def _optimize(node: IRnode, parent: Optional[IRnode]) -> Tuple[bool, IRnode]:
     def finalize(val, args):
         if not changed and not args_changed:
             # skip IRnode.from_list, which may be (compile-time) expensive
+            fixpoints[key] = node
             return False, node
 
         ir_builder = [val, *args]
@@ -471,7 +488,7 @@ def _optimize(node: IRnode, parent: Optional[IRnode]) -> Tuple[bool, IRnode]:
         if should_check_symbols:
             _check_symbols(starting_symbols, ret)
 
-        _, ret = _optimize(ret, parent)
+        _, ret = _optimize(ret, parent, fixpoints)
         return True, ret
 
     if value == "seq":
@@ -485,7 +502,7 @@ def _optimize(node: IRnode, parent: Optional[IRnode]) -> Tuple[bool, IRnode]:
         # (seq x) => (x) for cleanliness and
         # to avoid blocking other optimizations
         if len(argz) == 1:
-            return True, _optimize(argz[0], parent)[1]
+            return True, _optimize(argz[0], parent, fixpoints)[1]
 
         return finalize(value, argz)
 
@@ -22,6 +22,8 @@ def set_data_positions(
     vyper_module : vy_ast.Module
         Top-level Vyper AST node that has already been annotated with type data.
     """
+    _reset_data_positions(vyper_module)
+
     if storage_layout_overrides is not None:
         # allocate code layout with no overrides
         _allocate_layout_r(vyper_module, no_storage=True)
@@ -38,6 +40,20 @@ def set_data_positions(
         _allocate_layout_r(vyper_module)
 
 
+def _reset_data_positions(vyper_module: vy_ast.Module) -> None:
+    # imported modules can be shared between compilation targets (cf.
+    # `ModuleCache`), clear any positions allocated for a previous target.
+    module_t = vyper_module._metadata["type"]
+    for m in module_t.reachable_modules:
+        for varinfo in m.variables.values():
+            varinfo.position = None
+
+        for node in _get_func_defs(m._module):
+            fn_t = node._metadata["func_type"]
+            if hasattr(fn_t, "reentrancy_key_position"):
+                del fn_t.reentrancy_key_position
+
+
 _T = TypeVar("_T")
 _K = TypeVar("_K")
 
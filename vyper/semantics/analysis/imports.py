@@ -3,7 +3,7 @@ import dataclasses as dc
 import json
 from dataclasses import asdict, dataclass
 from pathlib import Path, PurePath
-from typing import Any, Iterator, Optional
+from typing import Any, Hashable, Iterator, Optional
 
 import vyper.builtins.interfaces
 import vyper.builtins.stdlib
@@ -74,6 +74,53 @@ class _ImportGraph:
             self.pop_path(module_ast)
 
 
+# default number of modules kept by a `ModuleCache`
+DEFAULT_MODULE_CACHE_ENTRIES = 4096
+
+
+class ModuleCache:
+    """
+    Imported modules which are shared between compilation targets, so
+    that they are only parsed and analyzed once (e.g. for all the targets
+    in an input bundle, or for all the requests of a compiler server).
+
+    Semantic analysis annotates the (shared) module ASTs in place, and
+    depends on the compiler settings, so modules are kept separately for
+    each set of settings. Note that compilation targets which share
+    modules must be compiled one after the other, since per-target state
+    like storage positions is also kept on the shared modules.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MODULE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._modules: dict[Hashable, vy_ast.Module] = {}
+
+    def __len__(self):
+        return len(self._modules)
+
+    @staticmethod
+    def _key(file: FileInput, settings_key: Hashable) -> Hashable:
+        return (settings_key, file.source_id, str(file.resolved_path), file.sha256sum)
+
+    def get_module(self, file: FileInput, settings_key: Hashable) -> vy_ast.Module:
+        key = self._key(file, settings_key)
+        if key not in self._modules:
+            if len(self._modules) >= self.max_entries:
+                # dropping modules is always safe, since the modules which
+                # are still in use are referenced by their importers.
+                self._modules.clear()
+            self._modules[key] = _parse_ast(file)
+        return self._modules[key]
+
+    def discard(self, module_ast: vy_ast.Module) -> None:
+        for key, value in list(self._modules.items()):
+            if value is module_ast:
+                del self._modules[key]
+
+    def clear(self) -> None:
+        self._modules.clear()
+
+
 def try_parse_abi(file_input: FileInput) -> CompilerInput:
     try:
         s = json.loads(file_input.source_code)
@@ -89,12 +136,26 @@ class ImportAnalyzer:
     _compiler_inputs: dict[CompilerInput, vy_ast.Module]
     toplevel_module: vy_ast.Module
 
-    def __init__(self, input_bundle: InputBundle, graph: _ImportGraph, module_ast: vy_ast.Module):
+    def __init__(
+        self,
+        input_bundle: InputBundle,
+        graph: _ImportGraph,
+        module_ast: vy_ast.Module,
+        module_cache: Optional[ModuleCache] = None,
+        settings_key: Hashable = None,
+    ):
         self.input_bundle = input_bundle
         self.graph = graph
         self.toplevel_module = module_ast
         self._ast_of: dict[int, vy_ast.Module] = {}
 
+        self.module_cache = module_cache
+        self.settings_key = settings_key
+        # set if a shared module resolves differently for this compilation
+        # target (e.g. because of different search paths) than for a
+        # previous one.
+        self.has_shared_module_conflict = False
+
         self.seen = OrderedSet()
 
         # keep around compiler inputs so when we construct the output
@@ -177,6 +238,19 @@ class ImportAnalyzer:
     ) -> None:
         compiler_input, ast = self._load_import(node, level, qualified_module_name, alias)
         self._compiler_inputs[compiler_input] = ast
+
+        if (prev := node._metadata.get("import_info")) is not None:
+            # the import is in a shared module, and it has been resolved
+            # by a previous compilation target.
+            if prev.compiler_input == compiler_input and (
+                prev.parsed is ast or not isinstance(ast, vy_ast.Module)
+            ):
+                return
+            if "type" in self.graph.current_module._metadata:
+                # already analyzed with the other import, can't reuse it
+                self.has_shared_module_conflict = True
+                return
+
         node._metadata["import_info"] = ImportInfo(
             alias, qualified_module_name, compiler_input, ast
         )
@@ -260,7 +334,10 @@ class ImportAnalyzer:
         # two ASTs produced from the same source
         ast_of = self._ast_of
         if file.source_id not in ast_of:
-            ast_of[file.source_id] = _parse_ast(file)
+            if self.module_cache is not None:
+                ast_of[file.source_id] = self.module_cache.get_module(file, self.settings_key)
+            else:
+                ast_of[file.source_id] = _parse_ast(file)
 
         return ast_of[file.source_id]
 
@@ -373,7 +450,20 @@ def _load_builtin_import(level: int, module_str: str) -> tuple[CompilerInput, vy
     return file, builtin_ast
 
 
-def resolve_imports(module_ast: vy_ast.Module, input_bundle: InputBundle):
+def resolve_imports(
+    module_ast: vy_ast.Module,
+    input_bundle: InputBundle,
+    module_cache: Optional[ModuleCache] = None,
+    settings_key: Hashable = None,
+):
+    if module_cache is not None:
+        graph = _ImportGraph()
+        analyzer = ImportAnalyzer(input_bundle, graph, module_ast, module_cache, settings_key)
+        analyzer.resolve_imports()
+        if not analyzer.has_shared_module_conflict:
+            return analyzer
+        # fall back to fresh copies of all imported modules
+
     graph = _ImportGraph()
     analyzer = ImportAnalyzer(input_bundle, graph, module_ast)
     analyzer.resolve_imports()
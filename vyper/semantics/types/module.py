@@ -445,6 +445,14 @@ class ModuleT(VyperType):
             ret[info.alias] = module_info
         return ret
 
+    @cached_property
+    def reachable_modules(self) -> list["ModuleT"]:
+        # this module, and all the modules it imports (recursively)
+        ret: OrderedSet[ModuleT] = OrderedSet([self])
+        for module_info in self.imported_modules.values():
+            ret.update(module_info.module_t.reachable_modules)
+        return list(ret)
+
     def find_module_info(self, needle: "ModuleT") -> Optional["ModuleInfo"]:
         for s in self.imported_modules.values():
             if s.module_t == needle:
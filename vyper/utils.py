@@ -11,8 +11,6 @@ import traceback
 import warnings
 from typing import Generic, Iterable, Iterator, List, Set, TypeVar, Union
 
-from Crypto.Hash import keccak
-
 from vyper.exceptions import CompilerPanic, DecimalOverrideException
 
 _T = TypeVar("_T")
@@ -223,6 +221,9 @@ decimal.setcontext(DecimalContextOverride(prec=78))
 
 
 def keccak256(x):
+    # imported lazily, importing pycryptodome is slow
+    from Crypto.Hash import keccak
+
     return keccak.new(digest_bits=256, data=x).digest()
 
 
@@ -4,6 +4,7 @@
 from typing import Optional
 
 from vyper.codegen.ir_node import IRnode
+from vyper.compiler.profiling import profile_phase
 from vyper.compiler.settings import OptimizationLevel, Settings
 from vyper.evm.address_space import MEMORY, STORAGE, TRANSIENT
 from vyper.exceptions import CompilerPanic
@@ -14,6 +15,7 @@ from vyper.venom.function import IRFunction
 from vyper.venom.ir_node_to_venom import ir_node_to_venom
 from vyper.venom.passes import (
     CSE,
+    LICM,
     SCCP,
     AlgebraicOptimizationPass,
     AssignElimination,
@@ -34,6 +36,7 @@ from vyper.venom.passes import (
     SingleUseExpansion,
 )
 from vyper.venom.passes.dead_store_elimination import DeadStoreElimination
+from vyper.venom.passes.pass_manager import PassManager
 from vyper.venom.venom_to_assembly import VenomCompiler
 
 DEFAULT_OPT_LEVEL = OptimizationLevel.default()
@@ -58,60 +61,66 @@ def _run_passes(fn: IRFunction, optimize: OptimizationLevel, ac: IRAnalysesCache
     # Run passes on Venom IR
     # TODO: Add support for optimization levels
 
-    FloatAllocas(ac, fn).run_pass()
+    pm = PassManager(ac, fn)
 
-    SimplifyCFGPass(ac, fn).run_pass()
+    pm.run(FloatAllocas)
 
-    MakeSSA(ac, fn).run_pass()
-    PhiEliminationPass(ac, fn).run_pass()
+    pm.run(SimplifyCFGPass)
+
+    pm.run(MakeSSA)
+    pm.run(PhiEliminationPass)
 
     # run constant folding before mem2var to reduce some pointer arithmetic
-    AlgebraicOptimizationPass(ac, fn).run_pass()
-    SCCP(ac, fn, remove_allocas=False).run_pass()
-    SimplifyCFGPass(ac, fn).run_pass()
+    pm.run(AlgebraicOptimizationPass)
+    pm.run(SCCP, remove_allocas=False)
+    pm.run(SimplifyCFGPass)
+
+    pm.run(AssignElimination)
+    pm.run(Mem2Var)
+    pm.run(MakeSSA)
+    pm.run(PhiEliminationPass)
+    pm.run(SCCP)
 
-    AssignElimination(ac, fn).run_pass()
-    Mem2Var(ac, fn).run_pass()
-    MakeSSA(ac, fn).run_pass()
-    PhiEliminationPass(ac, fn).run_pass()
-    SCCP(ac, fn).run_pass()
+    pm.run(SimplifyCFGPass)
+    pm.run(AssignElimination)
+    pm.run(AlgebraicOptimizationPass)
+    pm.run(LoadElimination)
 
-    SimplifyCFGPass(ac, fn).run_pass()
-    AssignElimination(ac, fn).run_pass()
-    AlgebraicOptimizationPass(ac, fn).run_pass()
-    LoadElimination(ac, fn).run_pass()
+    pm.run(SCCP)
+    pm.run(AssignElimination)
+    pm.run(RevertToAssert)
 
-    SCCP(ac, fn).run_pass()
-    AssignElimination(ac, fn).run_pass()
-    RevertToAssert(ac, fn).run_pass()
+    # moving instructions out of loops makes the code bigger
+    if optimize == OptimizationLevel.GAS:
+        pm.run(LICM)
 
-    SimplifyCFGPass(ac, fn).run_pass()
-    MemMergePass(ac, fn).run_pass()
-    RemoveUnusedVariablesPass(ac, fn).run_pass()
+    pm.run(SimplifyCFGPass)
+    pm.run(MemMergePass)
+    pm.run(RemoveUnusedVariablesPass)
 
-    DeadStoreElimination(ac, fn).run_pass(addr_space=MEMORY)
-    DeadStoreElimination(ac, fn).run_pass(addr_space=STORAGE)
-    DeadStoreElimination(ac, fn).run_pass(addr_space=TRANSIENT)
-    LowerDloadPass(ac, fn).run_pass()
+    pm.run(DeadStoreElimination, addr_space=MEMORY)
+    pm.run(DeadStoreElimination, addr_space=STORAGE)
+    pm.run(DeadStoreElimination, addr_space=TRANSIENT)
+    pm.run(LowerDloadPass)
 
-    BranchOptimizationPass(ac, fn).run_pass()
+    pm.run(BranchOptimizationPass)
 
-    AlgebraicOptimizationPass(ac, fn).run_pass()
+    pm.run(AlgebraicOptimizationPass)
 
     # This improves the performance of cse
-    RemoveUnusedVariablesPass(ac, fn).run_pass()
+    pm.run(RemoveUnusedVariablesPass)
 
-    PhiEliminationPass(ac, fn).run_pass()
-    AssignElimination(ac, fn).run_pass()
-    CSE(ac, fn).run_pass()
-    AssignElimination(ac, fn).run_pass()
-    RemoveUnusedVariablesPass(ac, fn).run_pass()
-    SingleUseExpansion(ac, fn).run_pass()
+    pm.run(PhiEliminationPass)
+    pm.run(AssignElimination)
+    pm.run(CSE)
+    pm.run(AssignElimination)
+    pm.run(RemoveUnusedVariablesPass)
+    pm.run(SingleUseExpansion)
 
     if optimize == OptimizationLevel.CODESIZE:
-        ReduceLiteralsCodesize(ac, fn).run_pass()
+        pm.run(ReduceLiteralsCodesize)
 
-    DFTPass(ac, fn).run_pass()
+    pm.run(DFTPass)
 
 
 def _run_global_passes(ctx: IRContext, optimize: OptimizationLevel, ir_analyses: dict) -> None:
@@ -135,7 +144,8 @@ def run_passes_on(ctx: IRContext, optimize: OptimizationLevel) -> None:
 
 def generate_ir(ir: IRnode, settings: Settings) -> IRContext:
     # Convert "old" IR to "new" IR
-    ctx = ir_node_to_venom(ir)
+    with profile_phase("ir_node_to_venom"):
+        ctx = ir_node_to_venom(ir)
 
     optimize = settings.optimize
     assert optimize is not None  # help mypy
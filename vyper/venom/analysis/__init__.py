@@ -4,6 +4,7 @@ from .dfg import DFGAnalysis
 from .dominators import DominatorTreeAnalysis
 from .fcg import FCGAnalysis
 from .liveness import LivenessAnalysis
+from .loop import LoopAnalysis
 from .mem_alias import MemoryAliasAnalysis
 from .mem_ssa import MemSSA
 from .reachable import ReachableAnalysis
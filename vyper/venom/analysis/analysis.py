@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Type, TypeVar
+from typing import TYPE_CHECKING, Iterable, Type, TypeVar
 
 if TYPE_CHECKING:
     from vyper.venom.function import IRFunction
@@ -75,6 +75,16 @@ class IRAnalysesCache:
         if analysis is not None:
             analysis.invalidate()
 
+    def invalidate_all_except(self, preserved: Iterable[Type[IRAnalysis]]):
+        """
+        Invalidate all cached analyses, except for the `preserved` ones
+        (which may still be invalidated by the analyses they depend on).
+        """
+        preserved = set(preserved)
+        for analysis_cls in list(self.analyses_cache):
+            if analysis_cls not in preserved:
+                self.invalidate_analysis(analysis_cls)
+
     def force_analysis(self, analysis_cls: Type[IRAnalysis], *args, **kwargs):
         """
         Force a specific analysis to be run on the IR even if it has already been run,
@@ -37,7 +37,7 @@ class CFGAnalysis(IRAnalysis):
                 self._cfg_out[bb].add(next_bb)
                 self._cfg_in[next_bb].add(bb)
 
-        self._compute_dfs_post_r(self.function.entry)
+        self._compute_dfs_post(self.function.entry)
 
     def add_cfg_in(self, bb: IRBasicBlock, pred: IRBasicBlock):
         self._cfg_in[bb].add(pred)
@@ -83,15 +83,24 @@ class CFGAnalysis(IRAnalysis):
         # The function is normalized
         return True
 
-    def _compute_dfs_post_r(self, bb):
+    def _compute_dfs_post(self, bb):
+        # (iterative, since the CFG of a large function can be very deep)
         if self._reachable[bb]:
             return
         self._reachable[bb] = True
 
-        for out_bb in self._cfg_out[bb]:
-            self._compute_dfs_post_r(out_bb)
-
-        self._dfs.add(bb)
+        stack = [(bb, iter(self._cfg_out[bb]))]
+        while len(stack) > 0:
+            bb, out_bbs = stack[-1]
+            for out_bb in out_bbs:
+                if self._reachable[out_bb]:
+                    continue
+                self._reachable[out_bb] = True
+                stack.append((out_bb, iter(self._cfg_out[out_bb])))
+                break
+            else:
+                stack.pop()
+                self._dfs.add(bb)
 
     @property
     def dfs_pre_walk(self) -> Iterator[IRBasicBlock]:
@@ -118,6 +127,7 @@ class CFGAnalysis(IRAnalysis):
             DFGAnalysis,
             DominatorTreeAnalysis,
             LivenessAnalysis,
+            LoopAnalysis,
             ReachableAnalysis,
         )
 
@@ -132,4 +142,5 @@ class CFGAnalysis(IRAnalysis):
 
         self.analyses_cache.invalidate_analysis(DominatorTreeAnalysis)
         self.analyses_cache.invalidate_analysis(LivenessAnalysis)
+        self.analyses_cache.invalidate_analysis(LoopAnalysis)
         self.analyses_cache.invalidate_analysis(ReachableAnalysis)
@@ -75,18 +75,20 @@ class DFGAnalysis(IRAnalysis):
         # %16 = iszero %15
         # dfg_outputs of %15 is (%15 = add %13 %14)
         # dfg_inputs of %15 is all the instructions which *use* %15, ex. [(%16 = iszero %15), ...]
+        dfg_inputs = self._dfg_inputs
+        dfg_outputs = self._dfg_outputs
         for bb in self.function.get_basic_blocks():
             for inst in bb.instructions:
-                operands = inst.get_input_variables()
-                res = inst.get_outputs()
-
-                for op in operands:
-                    inputs = self._dfg_inputs.setdefault(op, OrderedSet())
+                for op in inst.operands:
+                    if type(op) is not IRVariable:
+                        continue
+                    inputs = dfg_inputs.get(op)
+                    if inputs is None:
+                        inputs = dfg_inputs[op] = OrderedSet()
                     inputs.add(inst)
 
-                for op in res:  # type: ignore
-                    assert isinstance(op, IRVariable)
-                    self._dfg_outputs[op] = inst
+                if inst.output is not None:
+                    dfg_outputs[inst.output] = inst
 
     def as_graph(self) -> str:
         """
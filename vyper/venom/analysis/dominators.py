@@ -1,6 +1,5 @@
 from typing import Iterator
 
-from vyper.exceptions import CompilerPanic
 from vyper.utils import OrderedSet
 from vyper.venom.analysis import CFGAnalysis, IRAnalysis
 from vyper.venom.basicblock import IRBasicBlock
@@ -11,12 +10,12 @@ class DominatorTreeAnalysis(IRAnalysis):
     """
     Dominator tree implementation. This class computes the dominator tree of a
     function and provides methods to query the tree. The tree is computed using
-    the Lengauer-Tarjan algorithm.
+    the Lengauer-Tarjan algorithm, which only keeps the immediate dominator
+    of each basic block instead of the full set of its dominators.
     """
 
     fn: IRFunction
     entry_block: IRBasicBlock
-    dominators: dict[IRBasicBlock, OrderedSet[IRBasicBlock]]
     immediate_dominators: dict[IRBasicBlock, IRBasicBlock]
     dominated: dict[IRBasicBlock, OrderedSet[IRBasicBlock]]
     dominator_frontiers: dict[IRBasicBlock, OrderedSet[IRBasicBlock]]
@@ -28,7 +27,6 @@ class DominatorTreeAnalysis(IRAnalysis):
         """
         self.fn = self.function
         self.entry_block = self.fn.entry
-        self.dominators = {}
         self.immediate_dominators = {}
         self.dominated = {}
         self.dominator_frontiers = {}
@@ -38,8 +36,8 @@ class DominatorTreeAnalysis(IRAnalysis):
         self.cfg_post_walk = list(self.cfg.dfs_post_walk)
         self.cfg_post_order = {bb: idx for idx, bb in enumerate(self.cfg_post_walk)}
 
-        self._compute_dominators()
         self._compute_idoms()
+        self._compute_dom_tree_order()
         self._compute_df()
 
     def get_all_dominated_blocks(self, bb: IRBasicBlock) -> OrderedSet[IRBasicBlock]:
@@ -58,8 +56,17 @@ class DominatorTreeAnalysis(IRAnalysis):
     def dominates(self, dom, sub):
         """
         Check if `dom` dominates `sub`.
+
+        `dom` dominates `sub` iff `sub` is in the subtree of `dom` in the
+        dominator tree, i.e. iff the (pre, post) interval of `sub` is nested
+        in the interval of `dom`.
         """
-        return dom in self.dominators[sub]
+        if dom not in self._dom_pre or sub not in self._dom_pre:
+            # unreachable blocks are not part of the dominator tree
+            return False
+        return (
+            self._dom_pre[dom] <= self._dom_pre[sub] and self._dom_post[sub] <= self._dom_post[dom]
+        )
 
     def immediate_dominator(self, bb):
         """
@@ -67,48 +74,114 @@ class DominatorTreeAnalysis(IRAnalysis):
         """
         return self.immediate_dominators.get(bb)
 
-    def _compute_dominators(self):
-        """
-        Compute dominators
+    def _compute_idoms(self):
         """
-        basic_blocks = self.cfg_post_walk
-        self.dominators = {bb: OrderedSet(basic_blocks) for bb in basic_blocks}
-        self.dominators[self.entry_block] = OrderedSet([self.entry_block])
-        changed = True
-        count = len(basic_blocks) ** 2  # TODO: find a proper bound for this
-        while changed:
-            count -= 1
-            if count < 0:
-                raise CompilerPanic("Dominators computation failed to converge")
-            changed = False
-            for bb in basic_blocks:
-                if bb == self.entry_block:
+        Compute immediate dominators, using the Lengauer-Tarjan algorithm
+        (the "simple" version, with path compression). Inside this method,
+        basic blocks are referred to by their DFS preorder number.
+        """
+        entry = self.entry_block
+
+        # number the reachable basic blocks in DFS preorder.
+        # (iterative, since the CFG of a large function can be very deep)
+        vertex = [entry]
+        dfnum = {entry: 0}
+        parent = [0]
+        stack = [(0, iter(self.cfg.cfg_out(entry)))]
+        while len(stack) > 0:
+            v, succs = stack[-1]
+            for succ in succs:
+                if succ in dfnum:
                     continue
-                preds = self.cfg.cfg_in(bb)
-                if len(preds) == 0:
+                w = len(vertex)
+                dfnum[succ] = w
+                vertex.append(succ)
+                parent.append(v)
+                stack.append((w, iter(self.cfg.cfg_out(succ))))
+                break
+            else:
+                stack.pop()
+
+        n = len(vertex)
+        semi = list(range(n))
+        idom = [0] * n
+        ancestor = [-1] * n
+        label = list(range(n))
+        bucket: list[list[int]] = [[] for _ in range(n)]
+
+        def _eval(v):
+            if ancestor[v] == -1:
+                return v
+            # compress the path to the root of the forest
+            path = []
+            u = v
+            while ancestor[ancestor[u]] != -1:
+                path.append(u)
+                u = ancestor[u]
+            for u in reversed(path):
+                a = ancestor[u]
+                if semi[label[a]] < semi[label[u]]:
+                    label[u] = label[a]
+                ancestor[u] = ancestor[a]
+            return label[v]
+
+        for w in range(n - 1, 0, -1):
+            # compute the semidominator of w
+            for pred in self.cfg.cfg_in(vertex[w]):
+                if pred not in dfnum:
+                    # unreachable predecessor
                     continue
-                new_dominators = OrderedSet.intersection(*[self.dominators[pred] for pred in preds])
-                new_dominators.add(bb)
-                if new_dominators != self.dominators[bb]:
-                    self.dominators[bb] = new_dominators
-                    changed = True
-
-    def _compute_idoms(self):
-        """
-        Compute immediate dominators
-        """
-        self.immediate_dominators = {bb: None for bb in self.cfg_post_walk}
-        self.immediate_dominators[self.entry_block] = self.entry_block
-        for bb in self.cfg_post_walk:
-            if bb == self.entry_block:
-                continue
-            doms = sorted(self.dominators[bb], key=lambda x: self.cfg_post_order[x])
-            self.immediate_dominators[bb] = doms[1]
+                u = _eval(dfnum[pred])
+                if semi[u] < semi[w]:
+                    semi[w] = semi[u]
+            bucket[semi[w]].append(w)
+
+            p = parent[w]
+            ancestor[w] = p
+            # implicitly compute the immediate dominators of the blocks
+            # whose semidominator is the parent of w
+            for v in bucket[p]:
+                u = _eval(v)
+                idom[v] = u if semi[u] < semi[v] else p
+            bucket[p] = []
+
+        for w in range(1, n):
+            if idom[w] != semi[w]:
+                idom[w] = idom[idom[w]]
+
+        self.immediate_dominators = {bb: vertex[idom[dfnum[bb]]] for bb in self.cfg_post_walk}
 
         self.dominated = {bb: OrderedSet() for bb in self.cfg_post_walk}
         for dom, target in self.immediate_dominators.items():
             self.dominated[target].add(dom)
 
+    def _compute_dom_tree_order(self):
+        """
+        Number the basic blocks in a DFS walk of the dominator tree, so
+        that `dominates()` is a constant time interval check.
+        """
+        self._dom_pre: dict[IRBasicBlock, int] = {}
+        self._dom_post: dict[IRBasicBlock, int] = {}
+        self._dom_post_walk: list[IRBasicBlock] = []
+
+        entry = self.entry_block
+        self._dom_pre[entry] = 0
+        stack = [(entry, iter(self.dominated[entry]))]
+        # (iterative, since dominator trees can be very deep)
+        while len(stack) > 0:
+            bb, children = stack[-1]
+            for child in children:
+                if child in self._dom_pre:
+                    # the entry block is in its own `dominated` set
+                    continue
+                self._dom_pre[child] = len(self._dom_pre)
+                stack.append((child, iter(self.dominated[child])))
+                break
+            else:
+                stack.pop()
+                self._dom_post[bb] = len(self._dom_post_walk)
+                self._dom_post_walk.append(bb)
+
     def _compute_df(self):
         """
         Compute dominance frontier
@@ -119,8 +192,15 @@ class DominatorTreeAnalysis(IRAnalysis):
         for bb in self.cfg_post_walk:
             if len(in_bbs := self.cfg.cfg_in(bb)) > 1:
                 for pred in in_bbs:
+                    if pred not in self.cfg_post_order:
+                        # unreachable predecessor
+                        continue
                     runner = pred
                     while runner != self.immediate_dominators[bb]:
+                        if bb in self.dominator_frontiers[runner]:
+                            # the rest of the path up to the idom has
+                            # already been walked from another predecessor
+                            break
                         self.dominator_frontiers[runner].add(bb)
                         runner = self.immediate_dominators[runner]
 
@@ -133,34 +213,12 @@ class DominatorTreeAnalysis(IRAnalysis):
             df.update(self.dominator_frontiers[bb])
         return df
 
-    def _intersect(self, bb1, bb2):
-        """
-        Find the nearest common dominator of two basic blocks.
-        """
-        dfs_order = self.cfg_post_order
-        while bb1 != bb2:
-            while dfs_order[bb1] < dfs_order[bb2]:
-                bb1 = self.immediate_dominators[bb1]
-            while dfs_order[bb1] > dfs_order[bb2]:
-                bb2 = self.immediate_dominators[bb2]
-        return bb1
-
     @property
     def dom_post_order(self) -> Iterator[IRBasicBlock]:
         """
-        Compute post-order traversal of the dominator tree.
+        Post-order traversal of the dominator tree.
         """
-        visited = set()
-
-        def visit(bb: IRBasicBlock) -> Iterator[IRBasicBlock]:
-            if bb in visited:
-                return
-            visited.add(bb)
-            for dominated_bb in self.dominated.get(bb, OrderedSet()):
-                yield from visit(dominated_bb)
-            yield bb
-
-        return visit(self.entry_block)
+        return iter(self._dom_post_walk)
 
     def as_graph(self) -> str:
         """
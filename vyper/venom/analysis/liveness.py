@@ -3,28 +3,72 @@ from collections import deque
 from vyper.exceptions import CompilerPanic
 from vyper.utils import OrderedSet
 from vyper.venom.analysis import CFGAnalysis, IRAnalysis
-from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IRVariable
+from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IROperand, IRVariable
 
 
 class LivenessAnalysis(IRAnalysis):
     """
     Compute liveness information for each instruction in the function.
+
+    The fixpoint is computed per basic block: the variables of the function
+    are numbered, and the live variables at the start and at the end of
+    each basic block are tracked as bitsets (alongside their order, which
+    the stack scheduling in `VenomCompiler` depends on). The live variables
+    at each instruction are only computed when they are requested.
     """
 
     cfg: CFGAnalysis
 
+    # variable -> the bit of the variable in the bitsets
+    _var_bits: dict[IROperand, int]
+
+    # the uses and defs of the instructions in each basic block (at the
+    # time of the analysis), in reverse order
+    _uses_defs: dict[IRBasicBlock, list[tuple[IRInstruction, list[IRVariable], list[IRVariable]]]]
+    # the transfer function of each basic block: the variables which are
+    # defined in the basic block, and the variables which are live at the
+    # start of the basic block (in order), given the variables live at the
+    # end of the basic block. cf. `_calculate_liveness()`
+    _kill: dict[IRBasicBlock, list[IRVariable]]
+    _gen: dict[IRBasicBlock, list[IRVariable]]
+    _kill_bits: dict[IRBasicBlock, int]
+    _gen_bits: dict[IRBasicBlock, int]
+    _phis: dict[IRBasicBlock, list[IRInstruction]]
+
     _out_vars: dict[IRBasicBlock, OrderedSet[IRVariable]]
-    inst_to_liveness: dict[IRInstruction, OrderedSet[IRVariable]]
+    _in_vars: dict[IRBasicBlock, OrderedSet[IRVariable]]
+    _out_bits: dict[IRBasicBlock, int]
+    _in_bits: dict[IRBasicBlock, int]
+
+    # the basic blocks which were reached by the fixpoint iteration
+    _visited: set[IRBasicBlock]
+
+    # computed on demand, cf. `live_vars_at()`
+    _inst_liveness: dict[IRInstruction, OrderedSet[IRVariable]]
 
     def analyze(self):
         self.cfg = self.analyses_cache.request_analysis(CFGAnalysis)
 
+        self._var_bits = {}
+        self._uses_defs = {}
+        self._kill = {}
+        self._gen = {}
+        self._kill_bits = {}
+        self._gen_bits = {}
+        self._phis = {}
         self._out_vars = {}
-        self.inst_to_liveness = {}
+        self._in_vars = {}
+        self._out_bits = {}
+        self._in_bits = {}
+        self._visited = set()
+        self._inst_liveness = {}
+
         for bb in self.function.get_basic_blocks():
+            self._compute_transfer(bb)
             self._out_vars[bb] = OrderedSet()
-            for inst in bb.instructions:
-                self.inst_to_liveness[inst] = OrderedSet()
+            self._in_vars[bb] = OrderedSet()
+            self._out_bits[bb] = 0
+            self._in_bits[bb] = 0
 
         worklist = deque(self.cfg.dfs_post_walk)
 
@@ -39,43 +83,111 @@ class LivenessAnalysis(IRAnalysis):
             if changed:
                 worklist.extend(self.cfg.cfg_in(bb))
 
+    def _compute_transfer(self, bb: IRBasicBlock) -> None:
+        # walk the basic block backwards, like `_calculate_inst_liveness()`,
+        # but independently of the variables live at the end of the block.
+        # a variable which is used and not defined afterwards ends up live
+        # at the start of the block. its position in the live set is
+        # determined by its first use after its last definition (if it is
+        # not live at the end of the block or is defined in the block), so
+        # keep the first uses in the order they are encountered.
+        uses_defs = []
+        kill: dict[IRVariable, None] = {}
+        first_use: dict[IRVariable, None] = {}
+        phis = []
+        for inst in reversed(bb.instructions):
+            uses = inst.get_input_variables()
+            for var in uses:
+                if var not in first_use:
+                    first_use[var] = None
+            output = inst.output
+            if output is None:
+                defs = []
+            else:
+                defs = [output]
+                kill[output] = None
+                first_use.pop(output, None)
+            uses_defs.append((inst, uses, defs))
+            if inst.opcode == "phi":
+                phis.append(inst)
+
+        phis.reverse()
+        self._uses_defs[bb] = uses_defs
+        self._kill[bb] = list(kill)
+        self._gen[bb] = list(first_use)
+        self._kill_bits[bb] = self._to_bits(kill)
+        self._gen_bits[bb] = self._to_bits(first_use)
+        self._phis[bb] = phis
+
+    def _to_bits(self, variables) -> int:
+        # number the variables on first sight
+        var_bits = self._var_bits
+        ret = 0
+        for var in variables:
+            bit = var_bits.get(var)
+            if bit is None:
+                bit = var_bits[var] = 1 << len(var_bits)
+            ret |= bit
+        return ret
+
     def _calculate_liveness(self, bb: IRBasicBlock) -> bool:
         """
-        Compute liveness of each instruction in the basic block.
-        Returns True if liveness changed
+        Compute the variables live at the start of the basic block.
+        Returns True if they changed
         """
-        orig_liveness = self.inst_to_liveness[bb.instructions[0]].copy()
-        liveness = self._out_vars[bb].copy()
-        for instruction in reversed(bb.instructions):
-            ins = instruction.get_input_variables()
-            outs = instruction.get_outputs()
-
-            if ins or outs:
-                # perf: only copy if changed
-                liveness = liveness.copy()
-                liveness.update(ins)
-                liveness.dropmany(outs)
+        # note that the order of the live variables can change even if
+        # the set does not, so they are always recomputed.
+        orig_bits = self._in_bits[bb]
+        bits = (self._out_bits[bb] & ~self._kill_bits[bb]) | self._gen_bits[bb]
 
-            self.inst_to_liveness[instruction] = liveness
+        liveness = self._out_vars[bb].copy()
+        liveness.dropmany(self._kill[bb])
+        liveness.update(self._gen[bb])
+        self._in_vars[bb] = liveness
+        self._in_bits[bb] = bits
+        self._visited.add(bb)
 
-        return orig_liveness != self.inst_to_liveness[bb.instructions[0]]
+        return bits != orig_bits
 
     def _calculate_out_vars(self, bb: IRBasicBlock) -> bool:
         """
         Compute out_vars of basic block.
         Returns True if out_vars changed
         """
-        out_vars = self._out_vars[bb].copy()
-        self._out_vars[bb] = OrderedSet()
+        orig_bits = self._out_bits[bb]
+        out_vars: OrderedSet[IRVariable] = OrderedSet()
+        bits = 0
         for out_bb in self.cfg.cfg_out(bb):
-            target_vars = self.input_vars_from(bb, out_bb)
-            self._out_vars[bb].update(target_vars)
-        return out_vars != self._out_vars[bb]
+            out_vars.update(self.input_vars_from(bb, out_bb))
+            bits |= self._input_bits_from(bb, out_bb)
+        self._out_vars[bb] = out_vars
+        self._out_bits[bb] = bits
+        return bits != orig_bits
+
+    def _calculate_inst_liveness(self, bb: IRBasicBlock) -> None:
+        """
+        Compute the liveness of each instruction in the basic block.
+        """
+        if bb not in self._visited:
+            # not reachable
+            for inst, _, _ in self._uses_defs[bb]:
+                self._inst_liveness[inst] = OrderedSet()
+            return
+
+        liveness = self._out_vars[bb].copy()
+        for inst, uses, defs in self._uses_defs[bb]:
+            if uses or defs:
+                # perf: only copy if changed
+                liveness = liveness.copy()
+                liveness.update(uses)
+                liveness.dropmany(defs)
+
+            self._inst_liveness[inst] = liveness
 
     def liveness_in_vars(self, bb):
         for inst in bb.instructions:
             if inst.opcode != "phi":
-                return self.inst_to_liveness[inst]
+                return self.live_vars_at(inst)
         return OrderedSet()
 
     def out_vars(self, bb: IRBasicBlock) -> OrderedSet[IRVariable]:
@@ -88,37 +200,50 @@ class LivenessAnalysis(IRAnalysis):
         """
         Get the variables that are live at (right before) a given instruction
         """
-        return self.inst_to_liveness[inst]
+        if inst not in self._inst_liveness:
+            self._calculate_inst_liveness(inst.parent)
+        return self._inst_liveness[inst]
+
+    def _input_bits_from(self, source: IRBasicBlock, target: IRBasicBlock) -> int:
+        # the bitset version of `input_vars_from()`
+        bits = self._in_bits[target]
+        for inst in self._phis[target]:
+            for label, var in inst.phi_operands:
+                if label == source.label:
+                    bits |= self._var_bits[var]
+                else:
+                    bits &= ~self._var_bits[var]
+        return bits
 
     # calculate the input variables into self from source
     def input_vars_from(self, source: IRBasicBlock, target: IRBasicBlock) -> OrderedSet[IRVariable]:
-        liveness = self.inst_to_liveness[target.instructions[0]].copy()
-
-        for inst in target.instructions:
-            if inst.opcode == "phi":
-                # we arbitrarily choose one of the arguments to be in the
-                # live variables set (dependent on how we traversed into this
-                # basic block). the argument will be replaced by the destination
-                # operand during instruction selection.
-                # for instance, `%56 = phi %label1 %12 %label2 %14`
-                # will arbitrarily choose either %12 or %14 to be in the liveness
-                # set, and then during instruction selection, after this instruction,
-                # %12 will be replaced by %56 in the liveness set
-
-                # bad path into this phi node
-                if source.label not in inst.operands:
-                    raise CompilerPanic(f"unreachable: {inst} from {source.label}")
-
-                for label, var in inst.phi_operands:
-                    if label == source.label:
-                        liveness.add(var)
-                    else:
-                        if var in liveness:
-                            liveness.remove(var)
+        liveness = self._in_vars[target].copy()
+
+        for inst in self._phis[target]:
+            # we arbitrarily choose one of the arguments to be in the
+            # live variables set (dependent on how we traversed into this
+            # basic block). the argument will be replaced by the destination
+            # operand during instruction selection.
+            # for instance, `%56 = phi %label1 %12 %label2 %14`
+            # will arbitrarily choose either %12 or %14 to be in the liveness
+            # set, and then during instruction selection, after this instruction,
+            # %12 will be replaced by %56 in the liveness set
+
+            # bad path into this phi node
+            if source.label not in inst.operands:
+                raise CompilerPanic(f"unreachable: {inst} from {source.label}")
+
+            for label, var in inst.phi_operands:
+                if label == source.label:
+                    liveness.add(var)
+                else:
+                    if var in liveness:
+                        liveness.remove(var)
 
         return liveness
 
     def invalidate(self):
         # delete properties so they can't accidentally be used
         del self._out_vars
-        del self.inst_to_liveness
+        del self._in_vars
+        del self._inst_liveness
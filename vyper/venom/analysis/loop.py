@@ -0,0 +1,136 @@
+from typing import Optional
+
+from vyper.utils import OrderedSet
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, IRAnalysis
+from vyper.venom.basicblock import IRBasicBlock
+
+
+class NaturalLoop:
+    """
+    A natural loop: the basic blocks which can reach one of the back edges
+    to `header` (the `latches`) without going through `header`.
+    """
+
+    header: IRBasicBlock
+    blocks: OrderedSet[IRBasicBlock]
+    latches: OrderedSet[IRBasicBlock]
+    # the unique predecessor of the header outside of the loop, if it
+    # only jumps to the header (i.e. it is executed exactly once each
+    # time the loop is entered)
+    preheader: Optional[IRBasicBlock]
+    # the innermost loop containing this loop
+    parent: Optional["NaturalLoop"]
+    children: list["NaturalLoop"]
+    # 1 for the outermost loops
+    depth: int
+
+    def __init__(self, header: IRBasicBlock):
+        self.header = header
+        self.blocks = OrderedSet([header])
+        self.latches = OrderedSet()
+        self.preheader = None
+        self.parent = None
+        self.children = []
+        self.depth = 1
+
+    def __contains__(self, bb: IRBasicBlock) -> bool:
+        return bb in self.blocks
+
+    def __repr__(self) -> str:
+        return f"NaturalLoop({self.header.label}, depth={self.depth}, blocks={len(self.blocks)})"
+
+
+class LoopAnalysis(IRAnalysis):
+    """
+    Find the natural loops of the function, i.e. the loops whose header
+    dominates all their basic blocks (which is the case for all the loops
+    emitted for `repeat`). The back edges to the same header are merged
+    into a single loop. Irreducible control flow is not reported.
+    """
+
+    cfg: CFGAnalysis
+    dom: DominatorTreeAnalysis
+
+    # innermost loops first, i.e. each loop comes before its parent
+    loops: list[NaturalLoop]
+    # basic block -> the innermost loop containing it
+    _innermost: dict[IRBasicBlock, NaturalLoop]
+
+    def analyze(self):
+        self.cfg = self.analyses_cache.request_analysis(CFGAnalysis)
+        self.dom = self.analyses_cache.request_analysis(DominatorTreeAnalysis)
+
+        loops: dict[IRBasicBlock, NaturalLoop] = {}
+        for bb in self.cfg.dfs_post_walk:
+            for succ in self.cfg.cfg_out(bb):
+                if not self.dom.dominates(succ, bb):
+                    continue
+                # back edge bb -> succ
+                if succ not in loops:
+                    loops[succ] = NaturalLoop(succ)
+                loop = loops[succ]
+                loop.latches.add(bb)
+                self._add_loop_blocks(loop, bb)
+
+        # the loops of a function are either disjoint or nested, so a loop
+        # is nested in the smallest bigger loop which contains its header
+        self.loops = sorted(loops.values(), key=lambda loop: len(loop.blocks), reverse=True)
+        self._innermost = {}
+        for loop in self.loops:
+            parent = self._innermost.get(loop.header)
+            if parent is not None:
+                loop.parent = parent
+                loop.depth = parent.depth + 1
+                parent.children.append(loop)
+            for bb in loop.blocks:
+                self._innermost[bb] = loop
+            loop.preheader = self._find_preheader(loop)
+        self.loops.reverse()
+
+    def _add_loop_blocks(self, loop: NaturalLoop, latch: IRBasicBlock) -> None:
+        # walk the CFG backwards from the latch, up to the header
+        worklist = [latch]
+        while len(worklist) > 0:
+            bb = worklist.pop()
+            if bb in loop.blocks:
+                continue
+            loop.blocks.add(bb)
+            for pred in self.cfg.cfg_in(bb):
+                if self.cfg.is_reachable(pred):
+                    worklist.append(pred)
+
+    def _find_preheader(self, loop: NaturalLoop) -> Optional[IRBasicBlock]:
+        preds = [
+            pred
+            for pred in self.cfg.cfg_in(loop.header)
+            if pred not in loop.blocks and self.cfg.is_reachable(pred)
+        ]
+        if len(preds) != 1:
+            return None
+        (pred,) = preds
+        if len(self.cfg.cfg_out(pred)) != 1:
+            return None
+        return pred
+
+    def get_loop(self, bb: IRBasicBlock) -> Optional[NaturalLoop]:
+        """
+        Return the innermost loop containing `bb`, if any.
+        """
+        return self._innermost.get(bb)
+
+    def loop_depth(self, bb: IRBasicBlock) -> int:
+        """
+        Return the number of loops containing `bb` (0 if it is not in a loop).
+        """
+        loop = self._innermost.get(bb)
+        if loop is None:
+            return 0
+        return loop.depth
+
+    def is_loop_header(self, bb: IRBasicBlock) -> bool:
+        loop = self._innermost.get(bb)
+        return loop is not None and loop.header == bb
+
+    def invalidate(self):
+        del self.loops
+        del self._innermost
@@ -1,5 +1,7 @@
+import bisect
 import dataclasses as dc
-from typing import Optional
+from collections.abc import Mapping
+from typing import Iterator, Optional
 
 from vyper.evm.address_space import MEMORY, STORAGE, TRANSIENT, AddrSpace
 from vyper.utils import OrderedSet
@@ -8,6 +10,121 @@ from vyper.venom.basicblock import IRInstruction
 from vyper.venom.memory_location import MemoryLocation, get_read_location, get_write_location
 
 
+class _LocationIndex:
+    """
+    Index of memory locations, for finding all the locations which may
+    overlap a given location without comparing against every location.
+
+    Locations with a known offset are kept sorted by offset; locations with
+    an unknown offset (which may overlap anything) are kept in a separate
+    bucket. Locations with size zero never overlap anything, so they are
+    only recorded in `ids`.
+    """
+
+    def __init__(self):
+        # location -> insertion order
+        self.ids: dict[MemoryLocation, int] = {}
+        # (offset, id, location), sorted, for known offset and known size
+        self._known: list[tuple[int, int, MemoryLocation]] = []
+        # (offset, id, location), sorted, for known offset and unknown size
+        self._unknown_size: list[tuple[int, int, MemoryLocation]] = []
+        self._unknown_offset: list[MemoryLocation] = []
+        # max size in `_known`, bounds how far back an overlapping
+        # location can start.
+        self._max_size = 0
+
+    def __contains__(self, loc: MemoryLocation) -> bool:
+        return loc in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[MemoryLocation]:
+        return iter(self.ids)
+
+    def add(self, loc: MemoryLocation) -> None:
+        if loc in self.ids:
+            return
+        loc_id = len(self.ids)
+        self.ids[loc] = loc_id
+
+        if loc.size == 0:
+            return
+        if loc.offset is None:
+            self._unknown_offset.append(loc)
+        elif loc.size is None:
+            bisect.insort(self._unknown_size, (loc.offset, loc_id, loc))
+        else:
+            bisect.insort(self._known, (loc.offset, loc_id, loc))
+            self._max_size = max(self._max_size, loc.size)
+
+    def overlapping(self, loc: MemoryLocation) -> list[MemoryLocation]:
+        """
+        All the locations in the index which may overlap `loc`
+        (according to `MemoryLocation.may_overlap`), in insertion order.
+        """
+        if loc.size == 0:
+            return []
+
+        if loc.offset is None:
+            return [x for x in self.ids if x.size != 0]
+
+        # narrow down the candidates using the index, then filter them
+        # with may_overlap so the answers are exactly the same.
+        candidates = list(self._unknown_offset)
+
+        if loc.size is None:
+            # anything which ends after `loc` starts
+            candidates.extend(x for (_, _, x) in self._unknown_size)
+            lo = bisect.bisect_right(self._known, (loc.offset - self._max_size, _INF))
+            candidates.extend(x for (_, _, x) in self._known[lo:])
+        else:
+            # anything which starts before `loc` ends, and ends after
+            # `loc` starts
+            end = loc.offset + loc.size
+            hi = bisect.bisect_left(self._unknown_size, (end, -1))
+            candidates.extend(x for (_, _, x) in self._unknown_size[:hi])
+            lo = bisect.bisect_right(self._known, (loc.offset - self._max_size, _INF))
+            hi = bisect.bisect_left(self._known, (end, -1))
+            candidates.extend(x for (_, _, x) in self._known[lo:hi])
+
+        ret = [x for x in candidates if MemoryLocation.may_overlap(loc, x)]
+        ret.sort(key=self.ids.__getitem__)
+        return ret
+
+
+# larger than any location id, for bisecting on offsets only
+_INF = float("inf")
+
+
+class _AliasSets(Mapping):
+    """
+    Read-only view of the alias sets: maps each location which the alias
+    analysis has seen to the set of seen locations which it may alias.
+    Alias sets are computed on demand from the location index.
+    """
+
+    def __init__(self, analysis: "MemoryAliasAnalysisAbstract"):
+        self._analysis = analysis
+
+    def __getitem__(self, loc: MemoryLocation) -> OrderedSet[MemoryLocation]:
+        analysis = self._analysis
+        if loc not in analysis._index:
+            raise KeyError(loc)
+        ret: OrderedSet[MemoryLocation] = OrderedSet(analysis._index.overlapping(loc))
+        ret.update(analysis._links.get(loc, ()))
+        return ret
+
+    def __contains__(self, loc: object) -> bool:
+        return loc in self._analysis._index
+
+    def __iter__(self) -> Iterator[MemoryLocation]:
+        return iter(self._analysis._index)
+
+    def __len__(self) -> int:
+        return len(self._analysis._index)
+
+
 class MemoryAliasAnalysisAbstract(IRAnalysis):
     """
     Analyzes memory operations to determine which locations may alias.
@@ -21,8 +138,14 @@ class MemoryAliasAnalysisAbstract(IRAnalysis):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.cfg = self.analyses_cache.request_analysis(CFGAnalysis)
 
+        # Index of all the memory locations seen so far
+        self._index = _LocationIndex()
+        # Aliasing relationships which do not follow from may_overlap
+        # (see `mark_volatile`)
+        self._links: dict[MemoryLocation, OrderedSet[MemoryLocation]] = {}
+
         # Map from memory locations to sets of potentially aliasing locations
-        self.alias_sets: dict[MemoryLocation, OrderedSet[MemoryLocation]] = {}
+        self.alias_sets = _AliasSets(self)
 
         # Analyze all memory operations
         for bb in self.function.get_basic_blocks():
@@ -43,14 +166,11 @@ class MemoryAliasAnalysisAbstract(IRAnalysis):
 
     def _analyze_mem_location(self, loc: MemoryLocation):
         """Analyze a memory location to determine aliasing"""
-        if loc not in self.alias_sets:
-            self.alias_sets[loc] = OrderedSet()
+        self._index.add(loc)
 
-        # Check for aliasing with existing locations
-        for other_loc in self.alias_sets:
-            if MemoryLocation.may_overlap(loc, other_loc):
-                self.alias_sets[loc].add(other_loc)
-                self.alias_sets[other_loc].add(loc)
+    def _link(self, loc1: MemoryLocation, loc2: MemoryLocation):
+        self._links.setdefault(loc1, OrderedSet()).add(loc2)
+        self._links.setdefault(loc2, OrderedSet()).add(loc1)
 
     def may_alias(self, loc1: MemoryLocation, loc2: MemoryLocation) -> bool:
         """
@@ -59,33 +179,24 @@ class MemoryAliasAnalysisAbstract(IRAnalysis):
         if loc1.is_volatile or loc2.is_volatile:
             return MemoryLocation.may_overlap(loc1, loc2)
 
-        if loc1 in self.alias_sets and loc2 in self.alias_sets:
-            return loc2 in self.alias_sets[loc1]
+        # (non-volatile locations are only ever linked through may_overlap,
+        # so there is no need to compute the alias set)
+        self._analyze_mem_location(loc1)
+        self._analyze_mem_location(loc2)
 
-        result = MemoryLocation.may_overlap(loc1, loc2)
-
-        if loc1 not in self.alias_sets:
-            self._analyze_mem_location(loc1)
-        if loc2 not in self.alias_sets:
-            self._analyze_mem_location(loc2)
-
-        return result
+        return MemoryLocation.may_overlap(loc1, loc2)
 
     def mark_volatile(self, loc: MemoryLocation) -> MemoryLocation:
         volatile_loc = dc.replace(loc, is_volatile=True)
 
-        if loc in self.alias_sets:
-            self.alias_sets[volatile_loc] = OrderedSet([volatile_loc])
-
-            # new and old locations are aliased
-            self.alias_sets[volatile_loc].add(loc)
-            self.alias_sets[loc].add(volatile_loc)
+        if loc in self._index:
+            self._index.add(volatile_loc)
 
-            # copy aliasing relationships
-            for other_loc in self.alias_sets[loc]:
-                if other_loc != loc and other_loc != volatile_loc:
-                    self.alias_sets[volatile_loc].add(other_loc)
-                    self.alias_sets[other_loc].add(volatile_loc)
+            # new and old locations are aliased (even if they are empty).
+            # the volatile location has the same offset and size, so it
+            # aliases everything else which `loc` aliases.
+            self._link(volatile_loc, volatile_loc)
+            self._link(volatile_loc, loc)
 
         return volatile_loc
 
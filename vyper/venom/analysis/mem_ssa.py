@@ -216,15 +216,19 @@ class MemSSAAbstract(IRAnalysis):
             for frontier in self.dom.dominator_frontiers[block]:
                 if frontier not in self.memory_phis:
                     phi = MemoryPhi(self.next_id, frontier)
-                    # Add operands from each predecessor block
-                    for pred in self.cfg.cfg_in(frontier):
-                        reaching_def = self.get_exit_def(pred)
-                        if reaching_def:
-                            phi.operands.append((reaching_def, pred))
                     self.next_id += 1
                     self.memory_phis[frontier] = phi
                     worklist.append(frontier)
 
+        # Add operands from each predecessor block. (only once all the phi
+        # nodes are in place, since the def exiting a predecessor may be a
+        # phi node which is inserted later)
+        for frontier, phi in self.memory_phis.items():
+            for pred in self.cfg.cfg_in(frontier):
+                reaching_def = self.get_exit_def(pred)
+                if reaching_def:
+                    phi.operands.append((reaching_def, pred))
+
     def _connect_uses_to_defs(self):
         """Connect memory uses to their reaching definitions"""
 
@@ -99,6 +99,35 @@ COMMUTATIVE_INSTRUCTIONS = frozenset(["add", "mul", "smul", "or", "xor", "and",
 
 COMPARATOR_INSTRUCTIONS = ("gt", "lt", "sgt", "slt")
 
+# properties of opcodes, cf. `_OPCODE_FLAGS`
+FLAG_VOLATILE = 1 << 0
+FLAG_BB_TERMINATOR = 1 << 1
+FLAG_NO_OUTPUT = 1 << 2
+FLAG_COMMUTATIVE = 1 << 3
+FLAG_COMPARATOR = 1 << 4
+FLAG_PSEUDO = 1 << 5
+
+
+def _compute_opcode_flags() -> dict[str, int]:
+    ret: dict[str, int] = {}
+    for opcodes, flag in (
+        (VOLATILE_INSTRUCTIONS, FLAG_VOLATILE),
+        (BB_TERMINATORS, FLAG_BB_TERMINATOR),
+        (NO_OUTPUT_INSTRUCTIONS, FLAG_NO_OUTPUT),
+        (COMMUTATIVE_INSTRUCTIONS, FLAG_COMMUTATIVE),
+        (COMPARATOR_INSTRUCTIONS, FLAG_COMPARATOR),
+        (("phi", "param"), FLAG_PSEUDO),
+    ):
+        for opcode in opcodes:
+            ret[opcode] = ret.get(opcode, 0) | flag
+    return ret
+
+
+# the flags are looked up once per opcode, rather than testing membership
+# in each of the sets above.
+_OPCODE_FLAGS = _compute_opcode_flags()
+
+
 ir_printer = ContextVar("ir_printer", default=None)
 
 
@@ -117,6 +146,8 @@ class IRDebugInfo:
     instructions with source code information when printing IR.
     """
 
+    __slots__ = ("line_no", "src")
+
     line_no: int
     src: str
 
@@ -133,26 +164,31 @@ class IROperand:
     """
     IROperand represents an IR operand. An operand is anything that can be
     operated by instructions. It can be a literal, a variable, or a label.
+
+    Operands are immutable. They are hashed very often (as keys of the
+    analyses), so the hash is computed once, when the operand is created.
     """
 
+    __slots__ = ("value", "_hash")
+
     value: Any
-    _hash: Optional[int] = None
+    _hash: int
 
     def __init__(self, value: Any) -> None:
         self.value = value
-        self._hash = None
+        self._hash = hash(value)
 
     @property
     def name(self) -> str:
         return self.value
 
     def __hash__(self) -> int:
-        if self._hash is None:
-            self._hash = hash(self.value)
         return self._hash
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, type(self)):
+        if self is other:
+            return True
+        if type(other) is not type(self):
             return False
         return self.value == other.value
 
@@ -165,6 +201,8 @@ class IRLiteral(IROperand):
     IRLiteral represents a literal in IR
     """
 
+    __slots__ = ()
+
     value: int
 
     def __init__(self, value: int) -> None:
@@ -174,6 +212,8 @@ class IRLiteral(IROperand):
     def __repr__(self) -> str:
         if abs(self.value) < 1024:
             return str(self.value)
+        if self.value < 0:
+            return f"-0x{-self.value:x}"
         return f"0x{self.value:x}"
 
 
@@ -182,7 +222,9 @@ class IRVariable(IROperand):
     IRVariable represents a variable in IR. A variable is a string that starts with a %.
     """
 
-    _name: str
+    __slots__ = ()
+
+    value: str
 
     def __init__(self, name: str) -> None:
         assert isinstance(name, str)
@@ -201,9 +243,11 @@ class IRLabel(IROperand):
     IRLabel represents a label in IR. A label is a string that starts with a %.
     """
 
+    __slots__ = ("is_symbol",)
+
     # is_symbol is used to indicate if the label came from upstream
     # (like a function name, try to preserve it in optimization passes)
-    is_symbol: bool = False
+    is_symbol: bool
     value: str
 
     def __init__(self, value: str, is_symbol: bool = False) -> None:
@@ -231,6 +275,8 @@ class IRInstruction:
     Convention: the rightmost value is the top of the stack.
     """
 
+    __slots__ = ("opcode", "operands", "output", "parent", "annotation", "ast_source", "error_msg")
+
     opcode: str
     operands: list[IROperand]
     output: Optional[IRVariable]
@@ -246,7 +292,10 @@ class IRInstruction:
         output: Optional[IRVariable] = None,
     ):
         assert isinstance(opcode, str), "opcode must be an str"
-        assert isinstance(operands, list | Iterator), "operands must be a list"
+        # (check for list first, the isinstance check for Iterator is slow)
+        assert isinstance(operands, list) or isinstance(
+            operands, Iterator
+        ), "operands must be a list"
         self.opcode = opcode
         self.operands = list(operands)  # in case we get an iterator
         self.output = output
@@ -256,23 +305,23 @@ class IRInstruction:
 
     @property
     def is_volatile(self) -> bool:
-        return self.opcode in VOLATILE_INSTRUCTIONS
+        return _OPCODE_FLAGS.get(self.opcode, 0) & FLAG_VOLATILE != 0
 
     @property
     def is_commutative(self) -> bool:
-        return self.opcode in COMMUTATIVE_INSTRUCTIONS
+        return _OPCODE_FLAGS.get(self.opcode, 0) & FLAG_COMMUTATIVE != 0
 
     @property
     def is_comparator(self) -> bool:
-        return self.opcode in COMPARATOR_INSTRUCTIONS
+        return _OPCODE_FLAGS.get(self.opcode, 0) & FLAG_COMPARATOR != 0
 
     @property
     def flippable(self) -> bool:
-        return self.is_commutative or self.is_comparator
+        return _OPCODE_FLAGS.get(self.opcode, 0) & (FLAG_COMMUTATIVE | FLAG_COMPARATOR) != 0
 
     @property
     def is_bb_terminator(self) -> bool:
-        return self.opcode in BB_TERMINATORS
+        return _OPCODE_FLAGS.get(self.opcode, 0) & FLAG_BB_TERMINATOR != 0
 
     @property
     def is_phi(self) -> bool:
@@ -288,7 +337,7 @@ class IRInstruction:
         Check if instruction is pseudo, i.e. not an actual instruction but
         a construct for intermediate representation like phi and param.
         """
-        return self.is_phi or self.is_param
+        return _OPCODE_FLAGS.get(self.opcode, 0) & FLAG_PSEUDO != 0
 
     def get_read_effects(self) -> effects.Effects:
         return effects.reads.get(self.opcode, effects.EMPTY)
@@ -296,23 +345,23 @@ class IRInstruction:
     def get_write_effects(self) -> effects.Effects:
         return effects.writes.get(self.opcode, effects.EMPTY)
 
-    def get_label_operands(self) -> Iterator[IRLabel]:
+    def get_label_operands(self) -> list[IRLabel]:
         """
         Get all labels in instruction.
         """
-        return (op for op in self.operands if isinstance(op, IRLabel))
+        return [op for op in self.operands if type(op) is IRLabel]
 
-    def get_non_label_operands(self) -> Iterator[IROperand]:
+    def get_non_label_operands(self) -> list[IROperand]:
         """
         Get input operands for instruction which are not labels
         """
-        return (op for op in self.operands if not isinstance(op, IRLabel))
+        return [op for op in self.operands if type(op) is not IRLabel]
 
-    def get_input_variables(self) -> Iterator[IRVariable]:
+    def get_input_variables(self) -> list[IRVariable]:
         """
         Get all input operands for instruction.
         """
-        return (op for op in self.operands if isinstance(op, IRVariable))
+        return [op for op in self.operands if type(op) is IRVariable]
 
     def get_outputs(self) -> list[IROperand]:
         """
@@ -473,6 +522,9 @@ class IRBasicBlock:
     used to branch to other basic blocks.
     """
 
+    # (basic blocks are used as keys of weak dicts, cf. CFGAnalysis)
+    __slots__ = ("label", "parent", "instructions", "__weakref__")
+
     label: IRLabel
     parent: IRFunction
     instructions: list[IRInstruction]
@@ -38,6 +38,8 @@ class IRContext:
     data_segment: list[DataSection]
     last_label: int
     last_variable: int
+    _variables: dict[str, IRVariable]
+    _labels: dict[tuple[str, bool], IRLabel]
 
     def __init__(self) -> None:
         self.functions = {}
@@ -47,6 +49,8 @@ class IRContext:
         self.data_segment = []
         self.last_label = 0
         self.last_variable = 0
+        self._variables = {}
+        self._labels = {}
 
     def get_basic_blocks(self) -> Iterator[IRBasicBlock]:
         for fn in self.functions.values():
@@ -61,7 +65,7 @@ class IRContext:
         del self.functions[fn.name]
 
     def create_function(self, name: str) -> IRFunction:
-        label = IRLabel(name, True)
+        label = self.get_label(name, True)
         assert label not in self.functions, f"duplicate function {label}"
         fn = IRFunction(label, self)
         self.add_function(fn)
@@ -88,6 +92,28 @@ class IRContext:
     def get_last_variable(self) -> str:
         return f"%{self.last_variable}"
 
+    def get_variable(self, name: str) -> IRVariable:
+        """
+        Get the variable with the given name. The variables are interned,
+        i.e. all the uses of a variable share the same object.
+        """
+        if not name.startswith("%"):
+            name = f"%{name}"
+        ret = self._variables.get(name)
+        if ret is None:
+            ret = self._variables[name] = IRVariable(name)
+        return ret
+
+    def get_label(self, name: str, is_symbol: bool = False) -> IRLabel:
+        """
+        Get the label with the given name, interned like `get_variable()`.
+        """
+        key = (name, is_symbol)
+        ret = self._labels.get(key)
+        if ret is None:
+            ret = self._labels[key] = IRLabel(name, is_symbol)
+        return ret
+
     def append_data_section(self, name: IRLabel) -> None:
         self.data_segment.append(DataSection(name))
 
@@ -1,3 +1,4 @@
+import functools
 from enum import Flag, auto
 
 
@@ -15,7 +16,14 @@ class Effects(Flag):
     def __iter__(self):
         # python3.10 doesn't have an iter implementation. we can
         # remove this once we drop python3.10 support.
-        return (m for m in self.__class__.__members__.values() if m in self)
+        return iter(_members(self))
+
+
+# the passes iterate over the effects of each instruction, so cache the
+# members of each combination of effects.
+@functools.lru_cache(maxsize=None)
+def _members(effects: Effects) -> tuple[Effects, ...]:
+    return tuple(m for m in Effects.__members__.values() if m in effects)
 
 
 EMPTY = Effects(0)
@@ -101,6 +101,25 @@ class IRFunction:
     def code_size_cost(self) -> int:
         return sum(bb.code_size_cost for bb in self.get_basic_blocks())
 
+    def snapshot(self) -> list:
+        """
+        Cheap snapshot of the structure of the function, which compares
+        equal to a later snapshot iff the function has not been changed
+        in between (i.e. no basic block, instruction, opcode, operand or
+        output has been added, removed, reordered or replaced).
+        Note that this relies on operands not being mutated in place.
+        """
+        ret: list = []
+        for bb in self._basic_block_dict.values():
+            ret.append(bb)
+            ret.append(bb.label)
+            for inst in bb.instructions:
+                ret.append(inst)
+                ret.append(inst.opcode)
+                ret.append(inst.output)
+                ret.extend(inst.operands)
+        return ret
+
     def get_next_variable(self) -> IRVariable:
         self.last_variable += 1
         return IRVariable(f"%{self.last_variable}")
@@ -168,8 +168,8 @@ def _append_return_args(fn: IRFunction, ofst: int = 0, size: int = 0):
     if bb.is_terminated:
         bb = IRBasicBlock(fn.ctx.get_next_label("exit_to"), fn)
         fn.append_basic_block(bb)
-    ret_ofst = IRVariable("ret_ofst")
-    ret_size = IRVariable("ret_size")
+    ret_ofst = fn.ctx.get_variable("ret_ofst")
+    ret_size = fn.ctx.get_variable("ret_size")
     bb.append_instruction("store", ofst, ret=ret_ofst)
     bb.append_instruction("store", size, ret=ret_size)
 
@@ -227,7 +227,7 @@ def _handle_self_call(fn: IRFunction, ir: IRnode, symbols: SymbolTable) -> Optio
     if len(converted_args) > 1:
         return_buf = converted_args[0]
 
-    stack_args: list[IROperand] = [IRLabel(str(target_label))]
+    stack_args: list[IROperand] = [fn.ctx.get_label(str(target_label))]
 
     if return_buf is not None:
         if not ENABLE_NEW_CALL_CONV or not returns_word:
@@ -407,7 +407,7 @@ def _convert_ir_bb(fn, ir, symbols):
         return _convert_ir_simple_node(fn, ir, symbols)
     elif ir.value == "return":
         fn.get_basic_block().append_instruction(
-            "return", IRVariable("ret_size"), IRVariable("ret_ofst")
+            "return", ctx.get_variable("ret_size"), ctx.get_variable("ret_ofst")
         )
     elif ir.value == "deploy":
         ctx.ctor_mem_size = ir.args[0].value
@@ -511,11 +511,11 @@ def _convert_ir_bb(fn, ir, symbols):
         return _convert_ir_bb(fn, ir.args[2], with_symbols)  # body
 
     elif ir.value == "goto":
-        _append_jmp(fn, IRLabel(ir.args[0].value))
+        _append_jmp(fn, ctx.get_label(ir.args[0].value))
     elif ir.value == "djump":
         args = [_convert_ir_bb(fn, ir.args[0], symbols)]
         for target in ir.args[1:]:
-            args.append(IRLabel(target.value))
+            args.append(ctx.get_label(target.value))
         fn.get_basic_block().append_instruction("djmp", *args)
         _new_block(fn)
     elif ir.value == "set":
@@ -523,9 +523,9 @@ def _convert_ir_bb(fn, ir, symbols):
         arg_1 = _convert_ir_bb(fn, ir.args[1], symbols)
         fn.get_basic_block().append_instruction("store", arg_1, ret=symbols[sym.value])
     elif ir.value == "symbol":
-        return IRLabel(ir.args[0].value, True)
+        return ctx.get_label(ir.args[0].value, True)
     elif ir.value == "data":
-        label = IRLabel(ir.args[0].value, True)
+        label = ctx.get_label(ir.args[0].value, True)
         ctx.append_data_section(label)
         for c in ir.args[1:]:
             if isinstance(c.value, bytes):
@@ -535,7 +535,7 @@ def _convert_ir_bb(fn, ir, symbols):
                 assert isinstance(data, IRLabel)  # help mypy
                 ctx.append_data_item(data)
     elif ir.value == "label":
-        label = IRLabel(ir.args[0].value, True)
+        label = ctx.get_label(ir.args[0].value, True)
         bb = fn.get_basic_block()
         if not bb.is_terminated:
             bb.append_instruction("jmp", label)
@@ -555,7 +555,7 @@ def _convert_ir_bb(fn, ir, symbols):
         _append_return_args(fn, *var_list)
         bb = fn.get_basic_block()
 
-        label = IRLabel(ir.args[0].value)
+        label = ctx.get_label(ir.args[0].value)
         if label.value == "return_pc":
             label = symbols.get("return_pc")
             # return label should be top of stack
@@ -1,3 +1,4 @@
+import functools
 import json
 
 from lark import Lark, Transformer
@@ -18,7 +19,7 @@ VENOM_GRAMMAR = """
     %import common.DIGIT
     %import common.HEXDIGIT
     %import common.LETTER
-    %import common.WS
+    %import common.WS_INLINE
     %import common.INT
     %import common.SIGNED_INT
     %import common.ESCAPED_STRING
@@ -26,19 +27,24 @@ VENOM_GRAMMAR = """
     # Allow multiple comment styles
     COMMENT: ";" /[^\\n]*/ | "//" /[^\\n]*/ | "#" /[^\\n]*/
 
-    start: function* data_segment?
+    # newlines are significant, they terminate statements. a newline
+    # token also swallows any following blank lines, indentation and
+    # comments
+    _NL: (/\\r?\\n[\\t ]*/ | COMMENT)+
+
+    start: _NL? function* data_segment?
 
     # TODO: consider making entry block implicit, e.g.
     # `"{" instruction+ block* "}"`
-    function: "function" LABEL_IDENT "{" block* "}"
+    function: "function" LABEL_IDENT "{" _NL? block* "}" _NL?
 
-    data_segment: "data" "readonly" "{" data_section* "}"
-    data_section: "dbsection" LABEL_IDENT ":" data_item+
-    data_item: "db" (HEXSTR | LABEL)
+    data_segment: "data" "readonly" "{" _NL? data_section* "}" _NL?
+    data_section: "dbsection" LABEL_IDENT ":" _NL? data_item+
+    data_item: "db" (HEXSTR | LABEL) _NL?
 
-    block: LABEL_IDENT ":" "\\n" statement*
+    block: BLOCK_LABEL _NL statement*
 
-    statement: (instruction | assignment) "\\n"
+    statement: (instruction | assignment) _NL
     assignment: VAR_IDENT "=" expr
     expr: instruction | operand
     instruction: OPCODE operands_list?
@@ -47,7 +53,7 @@ VENOM_GRAMMAR = """
 
     operand: VAR_IDENT | CONST | LABEL
 
-    CONST: SIGNED_INT | "0x" HEXDIGIT+
+    CONST: "-"? "0x" HEXDIGIT+ | SIGNED_INT
     OPCODE: CNAME
     VAR_IDENT: "%" (DIGIT|LETTER|"_"|":")+
 
@@ -55,17 +61,19 @@ VENOM_GRAMMAR = """
     # (especially for machine-generated labels)
     LABEL_IDENT: (NAME | ESCAPED_STRING)
     LABEL: "@" LABEL_IDENT
+    # a block label is a separate token (including the colon), so
+    # that the (LALR) parser can tell it apart from an opcode at the
+    # start of a statement
+    BLOCK_LABEL.2: LABEL_IDENT WS_INLINE? ":"
 
     DOUBLE_QUOTE: "\\""
     NAME: (DIGIT|LETTER|"_")+
     HEXSTR: "x" DOUBLE_QUOTE (HEXDIGIT|"_")+ DOUBLE_QUOTE
 
-    %ignore WS
+    %ignore WS_INLINE
     %ignore COMMENT
     """
 
-VENOM_PARSER = Lark(VENOM_GRAMMAR)
-
 
 def _set_last_var(fn: IRFunction):
     for bb in fn.get_basic_blocks():
@@ -94,7 +102,8 @@ def _unescape(s: str):
     """
     if s.startswith('"'):
         return json.loads(s)
-    return s
+    # (convert lark tokens to plain strings)
+    return str(s)
 
 
 class _TypedItem:
@@ -106,6 +115,17 @@ class _DataSegment(_TypedItem):
     pass
 
 
+def _intern_operands(ctx: IRContext, inst: IRInstruction) -> None:
+    # share the variables and labels between all their uses
+    for i, op in enumerate(inst.operands):
+        if isinstance(op, IRVariable):
+            inst.operands[i] = ctx.get_variable(op.value)
+        elif isinstance(op, IRLabel):
+            inst.operands[i] = ctx.get_label(op.value, op.is_symbol)
+    if inst.output is not None:
+        inst.output = ctx.get_variable(inst.output.value)
+
+
 class VenomTransformer(Transformer):
     def start(self, children) -> IRContext:
         ctx = IRContext()
@@ -120,11 +140,12 @@ class VenomTransformer(Transformer):
             fn._basic_block_dict.clear()
 
             for block_name, instructions in blocks:
-                bb = IRBasicBlock(IRLabel(block_name, True), fn)
+                bb = IRBasicBlock(ctx.get_label(block_name, True), fn)
                 fn.append_basic_block(bb)
 
                 for instruction in instructions:
                     assert isinstance(instruction, IRInstruction)  # help mypy
+                    _intern_operands(ctx, instruction)
                     bb.insert_instruction(instruction)
 
             _set_last_var(fn)
@@ -205,6 +226,10 @@ class VenomTransformer(Transformer):
     def LABEL_IDENT(self, label) -> str:
         return _unescape(label)
 
+    def BLOCK_LABEL(self, label) -> str:
+        # strip the trailing colon
+        return _unescape(label[:-1].rstrip())
+
     def LABEL(self, label) -> IRLabel:
         label = _unescape(label[1:])
         return IRLabel(label, True)
@@ -213,7 +238,7 @@ class VenomTransformer(Transformer):
         return IRVariable(var_ident[1:])
 
     def CONST(self, val) -> IRLiteral:
-        if str(val).startswith("0x"):
+        if "0x" in val:
             return IRLiteral(int(val, 16))
         return IRLiteral(int(val))
 
@@ -224,8 +249,15 @@ class VenomTransformer(Transformer):
         return val.value
 
 
+@functools.lru_cache(maxsize=None)
+def _get_parser() -> Lark:
+    # built on first use, since building the parser tables is slow.
+    # the transformer is applied while parsing, without building a
+    # parse tree first (only supported by the LALR parser).
+    return Lark(VENOM_GRAMMAR, parser="lalr", transformer=VenomTransformer())
+
+
 def parse_venom(source: str) -> IRContext:
-    tree = VENOM_PARSER.parse(source)
-    ctx = VenomTransformer().transform(tree)
+    ctx = _get_parser().parse(source)
     assert isinstance(ctx, IRContext)  # help mypy
     return ctx
@@ -8,6 +8,7 @@ from .float_allocas import FloatAllocas
 from .function_inliner import FunctionInlinerPass
 from .literals_codesize import ReduceLiteralsCodesize
 from .load_elimination import LoadElimination
+from .loop_invariant_code_motion import LICM
 from .lower_dload import LowerDloadPass
 from .make_ssa import MakeSSA
 from .mem2var import Mem2Var
@@ -1,6 +1,5 @@
 from vyper.utils import SizeLimits, int_bounds, int_log2, is_power_of_two, wrap256
-from vyper.venom.analysis.dfg import DFGAnalysis
-from vyper.venom.analysis.liveness import LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import (
     COMPARATOR_INSTRUCTIONS,
     IRInstruction,
@@ -32,6 +31,8 @@ class AlgebraicOptimizationPass(IRPass):
     dfg: DFGAnalysis
     updater: InstUpdater
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.updater = InstUpdater(self.dfg)
@@ -41,8 +42,6 @@ class AlgebraicOptimizationPass(IRPass):
         self._optimize_iszero_chains()
         self._algebraic_opt()
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _optimize_iszero_chains(self) -> None:
         fn = self.function
         for bb in fn.get_basic_blocks():
@@ -1,4 +1,4 @@
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRVariable
 from vyper.venom.passes.base_pass import InstUpdater, IRPass
 
@@ -13,6 +13,8 @@ class AssignElimination(IRPass):
     # TODO: consider renaming `store` instruction, since it is confusing
     # with LoadElimination
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.updater = InstUpdater(self.dfg)
@@ -22,8 +24,6 @@ class AssignElimination(IRPass):
                 continue
             self._process_store(inst, var, inst.operands[0])
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _process_store(self, inst, var: IRVariable, new_var: IRVariable):
         """
         Process store instruction. If the variable is only used by a load instruction,
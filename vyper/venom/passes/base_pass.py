@@ -1,4 +1,8 @@
-from vyper.venom.analysis import IRAnalysesCache
+import functools
+from typing import Optional
+
+from vyper.compiler.profiling import current_phase, profiled
+from vyper.venom.analysis import IRAnalysesCache, IRAnalysis
 from vyper.venom.context import IRContext
 from vyper.venom.function import IRFunction
 from vyper.venom.passes.machinery.inst_updater import InstUpdater
@@ -7,16 +11,37 @@ from vyper.venom.passes.machinery.inst_updater import InstUpdater
 class IRPass:
     """
     Base class for all Venom IR passes.
+
+    If a run of the pass changes the function, all cached analyses except
+    for the ones listed in `preserved_analyses` are invalidated after the
+    run. A pass which keeps an analysis up to date (e.g. the DFG using
+    `InstUpdater`), or which cannot affect it, should list it there.
     """
 
     function: IRFunction
     analyses_cache: IRAnalysesCache
     updater: InstUpdater  # optional, does not need to be instantiated
 
+    preserved_analyses: tuple[type[IRAnalysis], ...] = ()
+
+    # whether the last run of the pass changed the function
+    changed: bool = False
+    # snapshot of the function after the last run of the pass
+    snapshot: Optional[list] = None
+    # snapshot of the function before the next run of the pass, if it is
+    # known (cf. `PassManager`). saves taking another snapshot.
+    snapshot_before: Optional[list] = None
+
     def __init__(self, analyses_cache: IRAnalysesCache, function: IRFunction):
         self.function = function
         self.analyses_cache = analyses_cache
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "run_pass" in cls.__dict__:
+            cls.run_pass = _track_changes(cls.run_pass)
+        _profile_run_pass(cls)
+
     def run_pass(self, *args, **kwargs):
         raise NotImplementedError(f"Not implemented! {self.__class__}.run_pass()")
 
@@ -33,5 +58,38 @@ class IRGlobalPass:
         self.analyses_caches = analyses_caches
         self.ctx = ctx
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _profile_run_pass(cls)
+
     def run_pass(self, *args, **kwargs):
         raise NotImplementedError(f"Not implemented! {self.__class__}.run_pass()")
+
+
+def _track_changes(run_pass):
+    @functools.wraps(run_pass)
+    def wrapper(self, *args, **kwargs):
+        before = self.snapshot_before
+        self.snapshot_before = None
+        if before is None:
+            before = self.function.snapshot()
+
+        ret = run_pass(self, *args, **kwargs)
+
+        self.snapshot = self.function.snapshot()
+        self.changed = self.snapshot != before
+        if self.changed:
+            self.analyses_cache.invalidate_all_except(self.preserved_analyses)
+
+        event = current_phase()
+        if event is not None:
+            event.args["changed"] = self.changed
+        return ret
+
+    return wrapper
+
+
+def _profile_run_pass(cls):
+    # record each run of a pass as a phase (cf. `vyper --profile-phases`)
+    if "run_pass" in cls.__dict__:
+        cls.run_pass = profiled(cls.__name__, category="venom_pass")(cls.run_pass)
@@ -63,6 +63,3 @@ class BranchOptimizationPass(IRPass):
         self.updater = InstUpdater(self.dfg)
 
         self._optimize_branches()
-
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-        self.analyses_cache.invalidate_analysis(CFGAnalysis)
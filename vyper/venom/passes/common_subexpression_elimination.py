@@ -1,3 +1,4 @@
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.analysis.available_expression import (
     NONIDEMPOTENT_INSTRUCTIONS,
     AvailableExpressionAnalysis,
@@ -43,6 +44,8 @@ SMALL_EXPRESSION = 1
 class CSE(IRPass):
     expression_analysis: AvailableExpressionAnalysis
 
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.expression_analysis = self.analyses_cache.request_analysis(AvailableExpressionAnalysis)
 
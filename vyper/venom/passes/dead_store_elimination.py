@@ -1,6 +1,6 @@
 from vyper.evm.address_space import MEMORY, STORAGE, TRANSIENT, AddrSpace
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import CFGAnalysis, DFGAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.analysis.mem_ssa import MemoryDef, mem_ssa_type_factory
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction
 from vyper.venom.effects import NON_MEMORY_EFFECTS, NON_STORAGE_EFFECTS, NON_TRANSIENT_EFFECTS
@@ -12,6 +12,8 @@ class DeadStoreElimination(IRPass):
     This pass eliminates dead stores using Memory SSA analysis.
     """
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self, /, addr_space: AddrSpace):
         mem_ssa_type = mem_ssa_type_factory(addr_space)
         if addr_space == MEMORY:
@@ -31,8 +33,6 @@ class DeadStoreElimination(IRPass):
             if self._is_dead_store(mem_def):
                 self.updater.nop(mem_def.store_inst, annotation="[dead store elimination]")
 
-        self.analyses_cache.invalidate_analysis(mem_ssa_type)
-
     def _has_uses(self, inst: IRInstruction):
         """
         Checks if the instruction's output is used in the DFG.
@@ -2,7 +2,7 @@ from collections import defaultdict
 
 import vyper.venom.effects as effects
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction
 from vyper.venom.function import IRFunction
 from vyper.venom.passes.base_pass import IRPass
@@ -17,6 +17,8 @@ class DFTPass(IRPass):
     # "effect dependency analysis"
     eda: dict[IRInstruction, OrderedSet[IRInstruction]]
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self) -> None:
         self.data_offspring = {}
         self.visited_instructions: OrderedSet[IRInstruction] = OrderedSet()
@@ -26,8 +28,6 @@ class DFTPass(IRPass):
         for bb in self.function.get_basic_blocks():
             self._process_basic_block(bb)
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _process_basic_block(self, bb: IRBasicBlock) -> None:
         self._calculate_dependency_graphs(bb)
         self.instructions = list(bb.pseudo_instructions)
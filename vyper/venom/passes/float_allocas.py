@@ -1,3 +1,4 @@
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.passes.base_pass import IRPass
 
 
@@ -11,6 +12,8 @@ class FloatAllocas(IRPass):
     guaranteed to be traversed first.
     """
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         entry_bb = self.function.entry
         assert entry_bb.is_terminated, entry_bb
@@ -240,7 +240,7 @@ class FunctionInlinerPass(IRGlobalPass):
         return clone
 
     def _clone_basic_block(self, bb: IRBasicBlock, prefix: str) -> IRBasicBlock:
-        new_bb_label = IRLabel(f"{prefix}{bb.label.value}")
+        new_bb_label = self.ctx.get_label(f"{prefix}{bb.label.value}")
         new_bb = IRBasicBlock(new_bb_label, bb.parent)
         new_bb.instructions = [self._clone_instruction(inst, prefix) for inst in bb.instructions]
         for inst in new_bb.instructions:
@@ -254,19 +254,19 @@ class FunctionInlinerPass(IRGlobalPass):
             if isinstance(op, IRLabel):
                 if func.has_basic_block(op.name):
                     # it is a valid label inside of this function
-                    label = IRLabel(f"{prefix}{op.name}")
+                    label = self.ctx.get_label(f"{prefix}{op.name}")
                 else:
                     # otherwise it is something else (like a data label)
                     label = op
                 ops.append(label)
             elif isinstance(op, IRVariable):
-                ops.append(IRVariable(f"{prefix}{op.plain_name}"))
+                ops.append(self.ctx.get_variable(f"{prefix}{op.plain_name}"))
             else:
                 ops.append(op)
 
         output = None
         if inst.output:
-            output = IRVariable(f"{prefix}{inst.output.plain_name}")
+            output = self.ctx.get_variable(f"{prefix}{inst.output.plain_name}")
 
         clone = IRInstruction(inst.opcode, ops, output)
         clone.parent = inst.parent
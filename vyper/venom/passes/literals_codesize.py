@@ -1,4 +1,5 @@
 from vyper.utils import evm_not
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRLiteral
 from vyper.venom.passes.base_pass import IRPass
 
@@ -12,6 +13,8 @@ SHL_THRESHOLD = 3
 
 
 class ReduceLiteralsCodesize(IRPass):
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         for bb in self.function.get_basic_blocks():
             self._process_bb(bb)
@@ -43,7 +46,7 @@ class ReduceLiteralsCodesize(IRPass):
                 assert not_benefit > 0  # implied by previous conditions
                 # transform things like 0xffff...01 to (not 0xfe)
                 inst.opcode = "not"
-                op.value = evm_not(val)
+                inst.operands = [IRLiteral(evm_not(val))]
                 continue
             else:
                 assert shl_benefit > 0  # implied by previous conditions
@@ -1,7 +1,16 @@
 from typing import Optional
 
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
-from vyper.venom.basicblock import IRLiteral
+from vyper.evm.address_space import CALLDATA, DATA, MEMORY, STORAGE, TRANSIENT, AddrSpace
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
+from vyper.venom.analysis.mem_ssa import (
+    MemoryAccess,
+    MemoryDef,
+    MemoryPhi,
+    MemoryUse,
+    MemSSAAbstract,
+    mem_ssa_type_factory,
+)
+from vyper.venom.basicblock import IRBasicBlock, IRLiteral, IROperand
 from vyper.venom.effects import Effects
 from vyper.venom.passes.base_pass import InstUpdater, IRPass
 
@@ -19,23 +28,46 @@ def _conflict(store_opcode: str, k1: IRLiteral, k2: IRLiteral):
 class LoadElimination(IRPass):
     """
     Eliminate sloads, mloads and tloads
+
+    Inside a basic block, the values known to be at each pointer are
+    tracked in a lattice, which is flushed by conflicting writes. Across
+    basic blocks, a load can also reuse the value loaded from (or stored
+    to) the same pointer in a dominating basic block, if the memory SSA
+    of the address space shows that nothing which may alias the pointer
+    is written in between.
     """
 
     # should this be renamed to EffectsElimination?
 
     updater: InstUpdater
+    dom: DominatorTreeAnalysis
+
+    # the memory SSA of the address space being processed (None if it is
+    # read-only, or if there are no loads to eliminate)
+    mem_ssa: Optional[MemSSAAbstract]
+
+    # the values at each pointer which were loaded or stored in the
+    # basic blocks dominating the current instruction, with the memory
+    # state at that point: ptr -> (value, memory state)
+    _available: dict[IROperand, tuple[IROperand, Optional[MemoryAccess]]]
+    # the entries of `_available` overwritten in the current basic block,
+    # to restore them when leaving its subtree of the dominator tree
+    _undo: list[tuple[IROperand, Optional[tuple[IROperand, Optional[MemoryAccess]]]]]
+
+    # the values known at each pointer in the current basic block
+    _lattice: dict[IROperand, IROperand]
+
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
 
     def run_pass(self):
         self.updater = InstUpdater(self.analyses_cache.request_analysis(DFGAnalysis))
+        self.dom = self.analyses_cache.request_analysis(DominatorTreeAnalysis)
 
-        for bb in self.function.get_basic_blocks():
-            self._process_bb(bb, Effects.MEMORY, "mload", "mstore")
-            self._process_bb(bb, Effects.TRANSIENT, "tload", "tstore")
-            self._process_bb(bb, Effects.STORAGE, "sload", "sstore")
-            self._process_bb(bb, None, "dload", None)
-            self._process_bb(bb, None, "calldataload", None)
-
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
+        self._process(MEMORY, Effects.MEMORY)
+        self._process(TRANSIENT, Effects.TRANSIENT)
+        self._process(STORAGE, Effects.STORAGE)
+        self._process(DATA, None)
+        self._process(CALLDATA, None)
 
     def equivalent(self, op1, op2):
         return op1 == op2
@@ -45,10 +77,59 @@ class LoadElimination(IRPass):
             return op
         return None
 
-    def _process_bb(self, bb, eff, load_opcode, store_opcode):
-        # not really a lattice even though it is not really inter-basic block;
-        # we may generalize in the future
+    def _process(self, addr_space: AddrSpace, eff: Optional[Effects]):
+        load_opcode, store_opcode = addr_space.load_op, addr_space.store_op
+        if store_opcode is None:
+            # read-only address space, its values never change
+            self.mem_ssa = None
+        elif not any(
+            inst.opcode == load_opcode
+            for bb in self.function.get_basic_blocks()
+            for inst in bb.instructions
+        ):
+            # no loads to eliminate, only redundant stores (which are found
+            # without the memory SSA)
+            self.mem_ssa = None
+        else:
+            self.mem_ssa = self.analyses_cache.request_analysis(mem_ssa_type_factory(addr_space))
+
+        self._available = {}
+
+        # walk the dominator tree, so that the values available from the
+        # dominators of a basic block are in `_available` when the basic
+        # block is processed. `undo` restores `_available` when leaving a
+        # subtree. (iterative, since dominator trees can be very deep)
+        entry = self.dom.entry_block
+        visited = {entry}
+        undo = self._process_bb(entry, eff, load_opcode, store_opcode)
+        stack = [(entry, iter(self.dom.dominated[entry]), undo)]
+        while len(stack) > 0:
+            bb, children, undo = stack[-1]
+            for child in children:
+                if child in visited:
+                    # the entry block is in its own `dominated` set
+                    continue
+                visited.add(child)
+                child_undo = self._process_bb(child, eff, load_opcode, store_opcode)
+                stack.append((child, iter(self.dom.dominated[child]), child_undo))
+                break
+            else:
+                stack.pop()
+                for ptr, prev in reversed(undo):
+                    if prev is None:
+                        del self._available[ptr]
+                    else:
+                        self._available[ptr] = prev
+
+        # unreachable basic blocks, which are not in the dominator tree
+        for bb in self.function.get_basic_blocks():
+            if bb not in visited:
+                self._available = {}
+                self._process_bb(bb, eff, load_opcode, store_opcode)
+
+    def _process_bb(self, bb: IRBasicBlock, eff, load_opcode, store_opcode) -> list:
         self._lattice = {}
+        self._undo = []
 
         for inst in bb.instructions:
             if inst.opcode == store_opcode:
@@ -60,15 +141,76 @@ class LoadElimination(IRPass):
             elif inst.opcode == load_opcode:
                 self._handle_load(inst)
 
+        return self._undo
+
+    def _make_available(self, ptr, val, state: Optional[MemoryAccess]):
+        self._undo.append((ptr, self._available.get(ptr)))
+        self._available[ptr] = (val, state)
+
+    def _get_dominating_value(self, inst, ptr) -> Optional[IROperand]:
+        entry = self._available.get(ptr)
+        if entry is None:
+            return None
+        val, state = entry
+
+        if self.mem_ssa is None:
+            return val
+
+        use = self.mem_ssa.get_memory_use(inst)
+        if use is None or state is None:
+            return None
+        if self._is_clobbered(use, state):
+            return None
+        return val
+
+    def _is_clobbered(self, use: MemoryUse, state: MemoryAccess) -> bool:
+        """
+        Check if the location read by `use` may be written between the
+        memory state `state` (which dominates `use`) and `use`.
+        """
+        assert self.mem_ssa is not None  # help mypy
+
+        # walk up the memory defs on all the paths from `use` to `state`.
+        # (in a loop, the defs on the path around the loop are walked
+        # before coming back to the phi of the loop header.)
+        visited: set[Optional[MemoryAccess]] = set()
+        worklist = [use.reaching_def]
+        while len(worklist) > 0:
+            current = worklist.pop()
+            if current == state or current in visited:
+                continue
+            visited.add(current)
+
+            if isinstance(current, MemoryPhi):
+                worklist.extend(access for access, _ in current.operands)
+            elif isinstance(current, MemoryDef):
+                if self.mem_ssa.memalias.may_alias(use.loc, current.loc):
+                    return True
+                worklist.append(current.reaching_def)
+            else:
+                # live on entry (i.e. `state` is not on this path, which
+                # comes from an unreachable basic block)
+                return True
+
+        return False
+
     def _handle_load(self, inst):
         (ptr,) = inst.operands
 
         existing_value = self._lattice.get(ptr)
+        if existing_value is None:
+            existing_value = self._get_dominating_value(inst, ptr)
 
         assert inst.output is not None  # help mypy
 
         # "cache" the value for future load instructions
         self._lattice[ptr] = inst.output
+        if self.mem_ssa is None:
+            self._make_available(ptr, inst.output, None)
+        else:
+            use = self.mem_ssa.get_memory_use(inst)
+            if use is not None:
+                self._make_available(ptr, inst.output, use.reaching_def)
 
         if existing_value is not None:
             self.updater.store(inst, existing_value)
@@ -77,6 +219,13 @@ class LoadElimination(IRPass):
         # mstore [val, ptr]
         val, ptr = inst.operands
 
+        # the value is available after the store, whether or not the
+        # store is eliminated
+        if self.mem_ssa is not None:
+            mem_def = self.mem_ssa.get_memory_def(inst)
+            if mem_def is not None:
+                self._make_available(ptr, val, mem_def)
+
         known_ptr: Optional[IRLiteral] = self.get_literal(ptr)
         if known_ptr is None:
             # it's a variable. assign this ptr in the lattice and flush
@@ -0,0 +1,439 @@
+from typing import Optional
+
+from vyper.utils import OrderedSet
+from vyper.venom import effects
+from vyper.venom.analysis import (
+    CFGAnalysis,
+    DFGAnalysis,
+    DominatorTreeAnalysis,
+    LivenessAnalysis,
+    LoopAnalysis,
+    ReachableAnalysis,
+)
+from vyper.venom.analysis.loop import NaturalLoop
+from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IRLiteral, IROperand, IRVariable
+from vyper.venom.passes.base_pass import IRPass
+from vyper.venom.passes.sccp.eval import ARITHMETIC_OPS, eval_arith
+from vyper.venom.stack_model import MAX_STACK_DEPTH
+
+# instructions which are not volatile, but which still cannot be moved
+# out of a loop
+_UNHOISTABLE_INSTRUCTIONS = frozenset(["phi", "alloca", "palloca", "calloca", "gas"])
+
+# the values moved out of a loop stay on the stack during the whole loop,
+# so the number of instructions moved out of a loop is limited by the
+# number of variables already live in the loop. the stack scheduler needs
+# to reach all the live variables, and the operands it is currently
+# pushing on top of them
+MAX_LIVE_VARS = MAX_STACK_DEPTH - 2
+
+
+class LICM(IRPass):
+    """
+    Loop-invariant code motion: move the instructions of a loop whose
+    result does not change between iterations to the preheader of the
+    loop, so that they are executed once instead of on each iteration.
+
+    An instruction is invariant if its operands are invariant, and it does
+    not read anything which the loop writes to (according to its effects).
+    Only instructions which write nothing but MSIZE (e.g. `mload`) are
+    moved, and only if the loop does not read MSIZE. Inner loops are
+    processed first, so instructions can be moved out of several loops.
+    To keep the stack manageable, fewer instructions are moved out of
+    loops with many live variables (cf. `MAX_LIVE_VARS`).
+
+    Instructions without effects are moved even if they are not executed
+    on every iteration, since they are cheap and cannot fail. Instructions
+    which read (or expand) memory, storage etc. are only moved out of the
+    basic blocks which are executed each time the loop is entered, i.e.
+    which dominate all the latches and exits of the loop. For the loops
+    whose header is also their exit (e.g. `repeat`, which can run zero
+    times), the condition of the header is first checked before the loop
+    (cf. `_add_guard`), so that the body is executed at least once.
+
+    Requires SSA form. Loops without a preheader are skipped.
+    """
+
+    cfg: CFGAnalysis
+    dfg: DFGAnalysis
+    dom: DominatorTreeAnalysis
+    loops: LoopAnalysis
+
+    # the reachable basic blocks, in reverse postorder
+    _rpo: list[IRBasicBlock]
+    # the maximum number of live variables in each basic block of a loop,
+    # before any instruction is moved
+    _max_live: dict[IRBasicBlock, int]
+    # the number of values moved out of the loops nested in each loop,
+    # which are now live in the loop
+    _hoisted_live: dict[NaturalLoop, int]
+    # the headers of the loops whose condition is checked before the loop
+    _guarded: set[IRBasicBlock]
+
+    preserved_analyses = (
+        CFGAnalysis,
+        DFGAnalysis,
+        DominatorTreeAnalysis,
+        LoopAnalysis,
+        ReachableAnalysis,
+    )
+
+    def run_pass(self):
+        self._request_analyses()
+
+        self._guarded = set()
+        self._guard_loops()
+
+        # the liveness is only computed once. (the values moved out of
+        # the nested loops are accounted for separately)
+        liveness = self.analyses_cache.request_analysis(LivenessAnalysis)
+        self._max_live = {}
+        for loop in self.loops.loops:
+            for bb in loop.blocks:
+                if bb not in self._max_live:
+                    self._max_live[bb] = max(
+                        len(liveness.live_vars_at(inst)) for inst in bb.instructions
+                    )
+        self._hoisted_live = {loop: 0 for loop in self.loops.loops}
+
+        # innermost loops first
+        for loop in self.loops.loops:
+            if loop.preheader is not None:
+                self._process_loop(loop, loop.preheader)
+
+    def _request_analyses(self) -> None:
+        self.cfg = self.analyses_cache.request_analysis(CFGAnalysis)
+        self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
+        self.dom = self.analyses_cache.request_analysis(DominatorTreeAnalysis)
+        self.loops = self.analyses_cache.request_analysis(LoopAnalysis)
+
+        # in reverse postorder, the definition of a variable comes before
+        # its uses (except in phis)
+        self._rpo = list(self.cfg.dfs_post_walk)
+        self._rpo.reverse()
+
+    def _guard_loops(self) -> None:
+        # the CFG changes with each guard, so the analyses are recomputed
+        # and the (new) loops are visited again
+        visited: set[IRBasicBlock] = set()
+        while True:
+            for loop in self.loops.loops:
+                if loop.header in visited:
+                    continue
+                visited.add(loop.header)
+                if loop.preheader is None:
+                    continue
+                first_cond = self._first_condition(loop, loop.preheader)
+                if first_cond is not None:
+                    # no need for a guard if the condition is known
+                    if first_cond != 0:
+                        self._guarded.add(loop.header)
+                    continue
+                if not self._needs_guard(loop):
+                    continue
+                if self._add_guard(loop, loop.preheader):
+                    self._guarded.add(loop.header)
+                    self.analyses_cache.invalidate_analysis(CFGAnalysis)
+                    self._request_analyses()
+                    break
+            else:
+                return
+
+    def _process_loop(self, loop: NaturalLoop, preheader: IRBasicBlock) -> None:
+        max_live = max(self._max_live[bb] for bb in loop.blocks) + self._hoisted_live[loop]
+        budget = MAX_LIVE_VARS - max_live
+        hoisted = self._find_invariants(loop, self._safe_blocks(loop), budget)
+        if len(hoisted) == 0:
+            return
+
+        hoisted_set = set(hoisted)
+        for bb in loop.blocks:
+            if any(inst in hoisted_set for inst in bb.instructions):
+                bb.instructions = [inst for inst in bb.instructions if inst not in hoisted_set]
+
+        # right before the jump to the header
+        for inst in hoisted:
+            inst.parent = preheader
+        preheader.instructions[-1:-1] = hoisted
+
+        # the values still used in the loop are now live in all the loops
+        # containing it
+        live = 0
+        for inst in hoisted:
+            assert inst.output is not None  # help mypy
+            if any(use.parent in loop for use in self.dfg.get_uses(inst.output)):
+                live += 1
+        parent = loop.parent
+        while parent is not None:
+            self._hoisted_live[parent] += live
+            parent = parent.parent
+
+    def _exiting_blocks(self, loop: NaturalLoop) -> list[IRBasicBlock]:
+        return [bb for bb in loop.blocks if any(succ not in loop for succ in self.cfg.cfg_out(bb))]
+
+    def _safe_blocks(self, loop: NaturalLoop, guarded: bool = False) -> set[IRBasicBlock]:
+        """
+        The basic blocks of the loop which are executed each time the
+        loop is entered (if `guarded`, assuming that the loop does not
+        exit through its header on the first iteration).
+        """
+        guarded = guarded or loop.header in self._guarded
+        targets = list(loop.latches)
+        for bb in self._exiting_blocks(loop):
+            if not (guarded and bb == loop.header):
+                targets.append(bb)
+        return {
+            bb for bb in loop.blocks if all(self.dom.dominates(bb, target) for target in targets)
+        }
+
+    def _needs_guard(self, loop: NaturalLoop) -> bool:
+        # whether the guard would allow more instructions to be moved
+        if loop.header not in self._exiting_blocks(loop):
+            return False
+        safe = self._safe_blocks(loop, guarded=True)
+        return any(
+            inst.parent != loop.header and _is_speculative(inst)
+            for inst in self._find_invariants(loop, safe)
+        )
+
+    def _find_invariants(
+        self, loop: NaturalLoop, safe: set[IRBasicBlock], budget: Optional[int] = None
+    ) -> list[IRInstruction]:
+        """
+        The instructions of the loop which can be moved to its preheader,
+        in order.
+        """
+        loop_reads = effects.EMPTY
+        loop_writes = effects.EMPTY
+        for bb in loop.blocks:
+            for inst in bb.instructions:
+                loop_reads |= inst.get_read_effects()
+                loop_writes |= inst.get_write_effects()
+
+        ret: list[IRInstruction] = []
+        invariant: set[IRVariable] = set()
+        for bb in self._rpo:
+            if bb not in loop:
+                continue
+            for inst in bb.instructions:
+                if budget is not None and len(ret) >= budget:
+                    return ret
+                if _is_speculative(inst) and bb not in safe:
+                    continue
+                if self._is_hoistable(inst, loop, invariant, loop_reads, loop_writes):
+                    assert inst.output is not None  # help mypy
+                    invariant.add(inst.output)
+                    ret.append(inst)
+        return ret
+
+    def _is_hoistable(
+        self,
+        inst: IRInstruction,
+        loop: NaturalLoop,
+        invariant: set[IRVariable],
+        loop_reads: effects.Effects,
+        loop_writes: effects.Effects,
+    ) -> bool:
+        if inst.output is None or inst.is_volatile or inst.opcode in _UNHOISTABLE_INSTRUCTIONS:
+            return False
+
+        if inst.get_read_effects() & loop_writes:
+            return False
+
+        write_effects = inst.get_write_effects()
+        if write_effects & ~effects.MSIZE:
+            return False
+        if write_effects and effects.MSIZE in loop_reads:
+            return False
+
+        for op in inst.operands:
+            if not isinstance(op, IRVariable):
+                continue
+            producer = self.dfg.get_producing_instruction(op)
+            if producer is None:
+                return False
+            if producer.parent in loop and op not in invariant:
+                return False
+
+        # the operands of a phi must not be live past the phi (cf. the
+        # phi handling in `LivenessAnalysis`), which they would be if they
+        # were defined outside of the loop
+        if any(use.opcode == "phi" for use in self.dfg.get_uses(inst.output)):
+            return False
+
+        return True
+
+    def _first_condition(self, loop: NaturalLoop, preheader: IRBasicBlock) -> Optional[int]:
+        """
+        The condition of the header on the first iteration, if it is a
+        constant (e.g. for `range(n)` with a literal `n`).
+        """
+        term = loop.header.instructions[-1]
+        if term.opcode != "jnz":
+            return None
+
+        values: dict[IROperand, IRLiteral] = {}
+        for inst in loop.header.instructions[:-1]:
+            assert inst.output is not None  # help mypy
+            if inst.opcode == "phi":
+                op = self._constant(dict(inst.phi_operands)[preheader.label])
+            elif inst.opcode in ARITHMETIC_OPS:
+                ops = [values.get(op, self._constant(op)) for op in inst.operands]
+                if not all(isinstance(op, IRLiteral) for op in ops):
+                    continue
+                op = IRLiteral(eval_arith(inst.opcode, ops))  # type: ignore
+            else:
+                continue
+            if isinstance(op, IRLiteral):
+                values[inst.output] = op
+
+        cond = values.get(term.operands[0], term.operands[0])
+        if not isinstance(cond, IRLiteral):
+            return None
+        return cond.value
+
+    def _constant(self, op: IROperand) -> IROperand:
+        # look through the assignments of literals
+        if isinstance(op, IRVariable):
+            producer = self.dfg.get_producing_instruction(op)
+            if producer is not None and producer.opcode == "store":
+                return self._constant(producer.operands[0])
+        return op
+
+    def _add_guard(self, loop: NaturalLoop, preheader: IRBasicBlock) -> bool:
+        """
+        Check the condition of the header in the preheader, which jumps
+        directly to the exit of the loop if the loop is not executed, and
+        otherwise to a new (empty) preheader:
+
+            preheader:                  preheader:
+                jmp @header                 %c' = <condition>
+            header:                         jnz %c', @new_preheader, @exit
+                %c = <condition>  -->   new_preheader:
+                jnz %c, @body, @exit        jmp @header
+                                        header:
+                                            ...
+
+        The header must only compute the condition (without any effects).
+        The values defined in the header which are used after the loop
+        get a phi in the exit. Returns False if the loop has another shape.
+        """
+        header = loop.header
+        term = header.instructions[-1]
+        exits = [bb for bb in self.cfg.cfg_out(header) if bb not in loop]
+        if term.opcode != "jnz" or len(self.cfg.cfg_out(header)) != 2 or len(exits) != 1:
+            return False
+        (exit_bb,) = exits
+        if not self.dom.dominates(header, exit_bb):
+            return False
+
+        for inst in header.instructions[:-1]:
+            if inst.opcode != "phi" and not _is_pure(inst):
+                return False
+
+        # the uses of the values of the header after the loop, which are
+        # replaced by the phis in the exit. they must all come after the
+        # exit, otherwise the values would need more phis
+        after_exit = self._reachable_from(exit_bb)
+        exit_phis: dict[IRVariable, list[tuple[IRInstruction, Optional[IRBasicBlock]]]] = {}
+        for inst in header.instructions:
+            if inst.output is None:
+                continue
+            for use in self.dfg.get_uses(inst.output):
+                for bb in _use_blocks(use, inst.output):
+                    if bb in loop:
+                        continue
+                    if self.dom.dominates(exit_bb, bb):
+                        use_pred = bb if use.opcode == "phi" else None
+                        exit_phis.setdefault(inst.output, []).append((use, use_pred))
+                    elif bb in after_exit:
+                        return False
+
+        fn = self.function
+        new_preheader = IRBasicBlock(fn.ctx.get_next_label("preheader"), fn)
+        fn.append_basic_block(new_preheader)
+        new_preheader.append_instruction("jmp", header.label)
+
+        # the values of the header on the first iteration
+        first: dict[IROperand, IROperand] = {}
+        guard = []
+        for inst in header.instructions:
+            if inst.opcode == "phi":
+                assert inst.output is not None  # help mypy
+                first[inst.output] = dict(inst.phi_operands)[preheader.label]
+                inst.replace_label_operands({preheader.label: new_preheader.label})
+                continue
+            new_inst = inst.copy()
+            new_inst.replace_operands(first)
+            if inst.output is not None:
+                new_inst.output = fn.get_next_variable()
+                first[inst.output] = new_inst.output
+            guard.append(new_inst)
+
+        (body_label,) = [label for label in term.get_label_operands() if label != exit_bb.label]
+        guard[-1].replace_label_operands({body_label: new_preheader.label})
+
+        preheader.instructions.pop()
+        for inst in guard:
+            preheader.insert_instruction(inst)
+
+        # the exit is now also reached from the preheader
+        for inst in exit_bb.instructions:
+            if inst.opcode != "phi":
+                break
+            op = dict(inst.phi_operands)[header.label]
+            inst.operands.extend([preheader.label, first.get(op, op)])
+
+        for var, uses in exit_phis.items():
+            new_var = fn.get_next_variable()
+            operands: list[IROperand] = []
+            for pred in self.cfg.cfg_in(exit_bb):
+                operands.extend([pred.label, var])
+            operands.extend([preheader.label, first[var]])
+            exit_bb.insert_instruction(IRInstruction("phi", operands, new_var), 0)
+
+            for use, use_pred in uses:
+                if use_pred is None:
+                    use.replace_operands({var: new_var})
+                    continue
+                for i in range(0, len(use.operands), 2):
+                    if use.operands[i] == use_pred.label and use.operands[i + 1] == var:
+                        use.operands[i + 1] = new_var
+
+        return True
+
+    def _reachable_from(self, bb: IRBasicBlock) -> OrderedSet[IRBasicBlock]:
+        ret: OrderedSet[IRBasicBlock] = OrderedSet()
+        worklist = [bb]
+        while len(worklist) > 0:
+            bb = worklist.pop()
+            if bb in ret:
+                continue
+            ret.add(bb)
+            worklist.extend(self.cfg.cfg_out(bb))
+        return ret
+
+
+def _is_pure(inst: IRInstruction) -> bool:
+    return (
+        inst.output is not None
+        and not inst.is_volatile
+        and inst.opcode not in _UNHOISTABLE_INSTRUCTIONS
+        and not inst.get_read_effects()
+        and not inst.get_write_effects()
+    )
+
+
+def _is_speculative(inst: IRInstruction) -> bool:
+    # whether executing the instruction once more than before could
+    # cost more than a few gas (e.g. a cold `sload`, or expanding memory)
+    return bool(inst.get_read_effects() or inst.get_write_effects())
+
+
+def _use_blocks(use: IRInstruction, var: IRVariable) -> list[IRBasicBlock]:
+    # the basic blocks where `var` is used by `use` (for a phi, the
+    # predecessors from which `var` comes)
+    if use.opcode != "phi":
+        return [use.parent]
+    fn = use.parent.parent
+    return [fn.get_basic_block(label.name) for label, op in use.phi_operands if op == var]
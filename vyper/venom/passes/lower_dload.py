@@ -1,5 +1,5 @@
 from vyper.utils import MemoryPositions
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IRLabel, IRLiteral
 from vyper.venom.passes.base_pass import IRPass
 
@@ -9,11 +9,11 @@ class LowerDloadPass(IRPass):
     Lower dload and dloadbytes instructions
     """
 
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         for bb in self.function.get_basic_blocks():
             self._handle_bb(bb)
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-        self.analyses_cache.invalidate_analysis(DFGAnalysis)
 
     def _handle_bb(self, bb: IRBasicBlock):
         fn = bb.parent
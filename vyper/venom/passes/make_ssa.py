@@ -1,5 +1,10 @@
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, LivenessAnalysis
+from vyper.venom.analysis import (
+    CFGAnalysis,
+    DominatorTreeAnalysis,
+    LivenessAnalysis,
+    ReachableAnalysis,
+)
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IROperand, IRVariable
 from vyper.venom.passes.base_pass import IRPass
 
@@ -14,6 +19,8 @@ class MakeSSA(IRPass):
     liveness: LivenessAnalysis
     defs: dict[IRVariable, OrderedSet[IRBasicBlock]]
 
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         fn = self.function
 
@@ -29,9 +36,6 @@ class MakeSSA(IRPass):
         self._rename_vars(fn.entry)
         self._remove_degenerate_phis(fn.entry)
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-        self.analyses_cache.invalidate_analysis(DFGAnalysis)
-
     def _add_phi_nodes(self):
         """
         Add phi nodes to the function.
@@ -1,5 +1,5 @@
 from vyper.utils import all2
-from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRInstruction, IRVariable
 from vyper.venom.function import IRFunction
 from vyper.venom.ir_node_to_venom import ENABLE_NEW_CALL_CONV
@@ -14,6 +14,8 @@ class Mem2Var(IRPass):
 
     function: IRFunction
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.analyses_cache.request_analysis(CFGAnalysis)
         dfg = self.analyses_cache.request_analysis(DFGAnalysis)
@@ -26,8 +28,6 @@ class Mem2Var(IRPass):
             elif inst.opcode == "palloca":
                 self._process_palloca_var(dfg, inst, var)
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _mk_varname(self, varname: str, alloca_id: int):
         varname = varname.removeprefix("%")
         varname = f"alloca_{alloca_id}_{varname}_{self.var_name_count}"
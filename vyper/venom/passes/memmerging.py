@@ -3,7 +3,7 @@ from dataclasses import dataclass
 
 from vyper.evm.opcodes import version_check
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IRLiteral, IROperand, IRVariable
 from vyper.venom.effects import Effects
 from vyper.venom.passes.base_pass import InstUpdater, IRPass
@@ -101,6 +101,8 @@ class MemMergePass(IRPass):
     # this represents the available loads, which have not been invalidated.
     _loads: dict[IRVariable, int]
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.updater = InstUpdater(self.dfg)
@@ -115,8 +117,6 @@ class MemMergePass(IRPass):
                 # mcopy is available
                 self._handle_bb(bb, "mload", "mcopy")
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _flush_copies(
         self, bb: IRBasicBlock, copies: list[_Copy], copy_opcode: str, load_opcode: str
     ):
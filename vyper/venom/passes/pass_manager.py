@@ -0,0 +1,79 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from vyper.compiler.profiling import profile_phase
+from vyper.venom.analysis import IRAnalysesCache
+from vyper.venom.function import IRFunction
+from vyper.venom.passes.base_pass import IRPass
+
+
+@dataclass
+class PassStats:
+    runs: int = 0
+    # runs which changed the function
+    changes: int = 0
+    # runs which were skipped, since they could not change anything
+    skips: int = 0
+    # total wall time of the runs, in seconds
+    time: float = 0.0
+
+
+class PassManager:
+    """
+    Runs passes on a function, sharing an analyses cache between them.
+
+    Keeps track of which runs changed the function. Passes are assumed
+    to be deterministic, so a pass which did not change the function is
+    skipped when it is run again (with the same arguments) on the very
+    same function, e.g. the third run of `SCCP` when nothing changed
+    since the second one.
+    """
+
+    def __init__(self, analyses_cache: IRAnalysesCache, function: IRFunction):
+        self.analyses_cache = analyses_cache
+        self.function = function
+        self.stats: dict[str, PassStats] = {}
+
+        # snapshot of the function after the last pass
+        self._snapshot: Optional[list] = None
+        # (pass, args) -> snapshot of the function after a run of the
+        # pass which did not change the function
+        self._fixpoints: dict[tuple, list] = {}
+
+    def run(self, pass_cls: type[IRPass], *args, **kwargs) -> bool:
+        """
+        Run a pass on the function, unless it is known to be a no-op.
+        Returns whether the pass changed the function.
+        """
+        name = pass_cls.__name__
+        stats = self.stats.setdefault(name, PassStats())
+
+        if self._snapshot is None:
+            self._snapshot = self.function.snapshot()
+
+        key = (pass_cls, args, tuple(sorted(kwargs.items())))
+        fixpoint = self._fixpoints.get(key)
+        if fixpoint is not None and fixpoint == self._snapshot:
+            stats.skips += 1
+            with profile_phase(name, category="venom_pass", skipped=True):
+                pass
+            return False
+
+        pass_obj = pass_cls(self.analyses_cache, self.function)
+        pass_obj.snapshot_before = self._snapshot
+
+        t0 = time.perf_counter()
+        pass_obj.run_pass(*args, **kwargs)
+        stats.time += time.perf_counter() - t0
+        stats.runs += 1
+
+        assert pass_obj.snapshot is not None
+        self._snapshot = pass_obj.snapshot
+        if pass_obj.changed:
+            stats.changes += 1
+            self._fixpoints.pop(key, None)
+        else:
+            self._fixpoints[key] = self._snapshot
+
+        return pass_obj.changed
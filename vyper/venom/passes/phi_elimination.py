@@ -1,4 +1,4 @@
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRInstruction, IRVariable
 from vyper.venom.passes.base_pass import InstUpdater, IRPass
 
@@ -6,6 +6,8 @@ from vyper.venom.passes.base_pass import InstUpdater, IRPass
 class PhiEliminationPass(IRPass):
     phi_to_origins: dict[IRInstruction, set[IRInstruction]]
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.updater = InstUpdater(self.dfg)
@@ -20,8 +22,6 @@ class PhiEliminationPass(IRPass):
         for bb in self.function.get_basic_blocks():
             bb.ensure_well_formed()
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _process_phi(self, inst: IRInstruction):
         srcs = self.phi_to_origins[inst]
 
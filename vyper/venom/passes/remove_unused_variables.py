@@ -2,7 +2,7 @@ from collections import defaultdict
 
 from vyper.utils import OrderedSet, uniq
 from vyper.venom import effects
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis, ReachableAnalysis
+from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRBasicBlock, IRInstruction
 from vyper.venom.passes.base_pass import IRPass
 
@@ -16,6 +16,8 @@ class RemoveUnusedVariablesPass(IRPass):
     work_list: OrderedSet[IRInstruction]
     _msizes: dict[IRBasicBlock, list]
 
+    preserved_analyses = (CFGAnalysis, DFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.reachable = self.analyses_cache.request_analysis(ReachableAnalysis).reachable
@@ -49,8 +51,6 @@ class RemoveUnusedVariablesPass(IRPass):
         for bb in self.function.get_basic_blocks():
             bb.clear_nops()
 
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def has_msize(self, bb):
         return len(self._msizes[bb]) > 0
 
@@ -5,7 +5,13 @@ from typing import Union
 
 from vyper.exceptions import CompilerPanic, StaticAssertionException
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import CFGAnalysis, DFGAnalysis, IRAnalysesCache, LivenessAnalysis
+from vyper.venom.analysis import (
+    CFGAnalysis,
+    DFGAnalysis,
+    DominatorTreeAnalysis,
+    IRAnalysesCache,
+    ReachableAnalysis,
+)
 from vyper.venom.basicblock import (
     IRBasicBlock,
     IRInstruction,
@@ -58,17 +64,16 @@ class SCCP(IRPass):
 
     cfg_dirty: bool
 
-    def __init__(
-        self, analyses_cache: IRAnalysesCache, function: IRFunction, /, remove_allocas=True
-    ):
-        super().__init__(analyses_cache, function)
-        self.remove_allocas = remove_allocas
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
 
+    def __init__(self, analyses_cache: IRAnalysesCache, function: IRFunction):
+        super().__init__(analyses_cache, function)
         self.lattice = {}
         self.work_list: list[WorkListItem] = []
 
-    def run_pass(self):
+    def run_pass(self, /, remove_allocas=True):
         self.fn = self.function
+        self.remove_allocas = remove_allocas
         self.dfg = self.analyses_cache.request_analysis(DFGAnalysis)
         self.cfg = self.analyses_cache.request_analysis(CFGAnalysis)
         self.cfg_dirty = False
@@ -77,8 +82,6 @@ class SCCP(IRPass):
         self._propagate_constants()
         if self.cfg_dirty:
             self.analyses_cache.invalidate_analysis(CFGAnalysis)
-        self.analyses_cache.invalidate_analysis(DFGAnalysis)
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
 
     def _calculate_sccp(self, entry: IRBasicBlock):
         """
@@ -1,6 +1,6 @@
 from vyper.exceptions import CompilerPanic
 from vyper.utils import OrderedSet
-from vyper.venom.analysis import CFGAnalysis, DFGAnalysis
+from vyper.venom.analysis import CFGAnalysis
 from vyper.venom.basicblock import IRBasicBlock, IRLabel
 from vyper.venom.passes.base_pass import IRPass
 
@@ -37,6 +37,12 @@ class SimplifyCFGPass(IRPass):
         assert b.label in jump_inst.operands, f"{b.label} {jump_inst.operands}"
         jump_inst.operands[jump_inst.operands.index(b.label)] = next_bb.label
 
+        # the phi operands coming from b now come from a
+        for inst in next_bb.instructions:
+            if inst.opcode != "phi":
+                break
+            inst.operands[inst.operands.index(b.label)] = a.label
+
         self._schedule_label_replacement(b.label, next_bb.label)
 
         # Update CFG
@@ -47,6 +53,11 @@ class SimplifyCFGPass(IRPass):
 
         self.function.remove_basic_block(b)
 
+    def _has_phi_from(self, bb: IRBasicBlock, pred: IRBasicBlock) -> bool:
+        # if `pred` already jumps to `bb`, the phis of `bb` cannot tell
+        # apart another edge from `pred`
+        return pred in self.cfg.cfg_in(bb) and any(inst.opcode == "phi" for inst in bb.instructions)
+
     def _collapse_chained_blocks_r(self, bb: IRBasicBlock):
         """
         DFS into the cfg and collapse blocks with a single predecessor to the predecessor
@@ -63,6 +74,7 @@ class SimplifyCFGPass(IRPass):
                     len(self.cfg.cfg_in(next_bb)) == 1
                     and len(self.cfg.cfg_out(next_bb)) == 1
                     and len(next_bb.instructions) == 1
+                    and not self._has_phi_from(self.cfg.cfg_out(next_bb).first(), bb)
                 ):
                     self._merge_jump(bb, next_bb)
                     self._collapse_chained_blocks_r(bb)
@@ -124,7 +136,7 @@ class SimplifyCFGPass(IRPass):
 
             # note: make a copy of the iterator, since it can be
             # modified inside the loop
-            labels = list(inst.get_label_operands())
+            labels = inst.get_label_operands()
             for label in labels:
                 if label not in cfg_in_labels:
                     needs_sort = True
@@ -158,6 +170,3 @@ class SimplifyCFGPass(IRPass):
                 break
         else:
             raise CompilerPanic("Too many iterations collapsing chained blocks")
-
-        self.analyses_cache.invalidate_analysis(CFGAnalysis)
-        self.analyses_cache.invalidate_analysis(DFGAnalysis)
@@ -1,4 +1,4 @@
-from vyper.venom.analysis import DFGAnalysis, LivenessAnalysis
+from vyper.venom.analysis import CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis
 from vyper.venom.basicblock import IRInstruction, IRLiteral, IRVariable
 from vyper.venom.passes.base_pass import IRPass
 
@@ -19,13 +19,12 @@ class SingleUseExpansion(IRPass):
     This pass is in some sense the "inverse" of AssignElimination.
     """
 
+    preserved_analyses = (CFGAnalysis, DominatorTreeAnalysis, ReachableAnalysis)
+
     def run_pass(self):
         for bb in self.function.get_basic_blocks():
             self._process_bb(bb)
 
-        self.analyses_cache.invalidate_analysis(DFGAnalysis)
-        self.analyses_cache.invalidate_analysis(LivenessAnalysis)
-
     def _process_bb(self, bb):
         i = 0
         while i < len(bb.instructions):
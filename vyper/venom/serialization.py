@@ -0,0 +1,148 @@
+"""
+Binary serialization of venom IR.
+
+This is a faster alternative to printing an `IRContext` and parsing it
+back with `parse_venom()`, e.g. to save venom IR for later experiments
+with the optimizer. It stores the same information as the text format,
+i.e. the functions, basic blocks, instructions and the data segment.
+
+The context is converted to nested tuples of ints, strings and bytes,
+which are then pickled and compressed. Loading only allows these primitive
+types, so loading an untrusted file cannot execute code.
+"""
+
+import io
+import pickle
+import zlib
+
+from vyper.venom.basicblock import IRBasicBlock, IRInstruction, IRLabel, IRLiteral, IRVariable
+from vyper.venom.context import DataItem, DataSection, IRContext
+
+_MAGIC = b"\x00venom"
+# bump when the layout of the serialized data changes
+_FORMAT_VERSION = 1
+
+
+def is_serialized_venom(data: bytes) -> bool:
+    return data.startswith(_MAGIC)
+
+
+# operands are encoded as int (literal), str (variable) or
+# tuple (label value, is_symbol)
+def _encode_operand(op):
+    if isinstance(op, IRLiteral):
+        return op.value
+    if isinstance(op, IRVariable):
+        return op.value
+    assert isinstance(op, IRLabel), op
+    return (str(op.value), op.is_symbol)
+
+
+def _decode_operand(ctx, op):
+    if isinstance(op, int):
+        return IRLiteral(op)
+    if isinstance(op, str):
+        return ctx.get_variable(op)
+    return ctx.get_label(*op)
+
+
+def dump_venom(ctx: IRContext) -> bytes:
+    """
+    Serialize `ctx` to bytes, cf. `load_venom()`.
+    """
+    functions = []
+    for fn in ctx.get_functions():
+        bbs = []
+        for bb in fn.get_basic_blocks():
+            insts = []
+            for inst in bb.instructions:
+                output = inst.output.value if inst.output is not None else None
+                operands = [_encode_operand(op) for op in inst.operands]
+                insts.append((inst.opcode, output, operands))
+            bbs.append((str(bb.label.value), bb.label.is_symbol, insts))
+        functions.append((str(fn.name.value), fn.last_variable, bbs))
+
+    data_segment = []
+    for section in ctx.data_segment:
+        items = [
+            _encode_operand(item.data) if isinstance(item.data, IRLabel) else item.data
+            for item in section.data_items
+        ]
+        data_segment.append((_encode_operand(section.label), items))
+
+    entry = None
+    if ctx.entry_function is not None:
+        entry = str(ctx.entry_function.name.value)
+    payload = (
+        functions,
+        data_segment,
+        entry,
+        ctx.last_label,
+        ctx.last_variable,
+        ctx.ctor_mem_size,
+        ctx.immutables_len,
+    )
+    header = _MAGIC + _FORMAT_VERSION.to_bytes(1, "big")
+    return header + zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class _Unpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        # the payload consists of builtin types only
+        raise pickle.UnpicklingError(f"invalid venom data: {module}.{name}")
+
+
+def load_venom(data: bytes) -> IRContext:
+    """
+    Deserialize an `IRContext` which was serialized with `dump_venom()`.
+    """
+    if not is_serialized_venom(data):
+        raise ValueError("not serialized venom IR")
+    version = data[len(_MAGIC)]
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"unsupported venom format version {version}")
+
+    payload = _Unpickler(io.BytesIO(zlib.decompress(data[len(_MAGIC) + 1 :]))).load()
+    (
+        functions,
+        data_segment,
+        entry,
+        last_label,
+        last_variable,
+        ctor_mem_size,
+        immutables_len,
+    ) = payload
+
+    ctx = IRContext()
+    for fn_name, fn_last_variable, bbs in functions:
+        fn = ctx.create_function(fn_name)
+        fn.clear_basic_blocks()
+        fn.last_variable = fn_last_variable
+
+        for label, is_symbol, insts in bbs:
+            bb = IRBasicBlock(ctx.get_label(label, is_symbol), fn)
+            fn.append_basic_block(bb)
+            instructions = bb.instructions
+            for opcode, output, operands in insts:
+                inst = IRInstruction(opcode, [_decode_operand(ctx, op) for op in operands])
+                if output is not None:
+                    inst.output = ctx.get_variable(output)
+                inst.parent = bb
+                instructions.append(inst)
+
+    for label, items in data_segment:
+        section = DataSection(_decode_operand(ctx, label))
+        for item in items:
+            if not isinstance(item, bytes):
+                item = _decode_operand(ctx, item)
+            section.data_items.append(DataItem(item))
+        ctx.data_segment.append(section)
+
+    if entry is not None:
+        ctx.entry_function = ctx.get_function(ctx.get_label(entry, True))
+    ctx.last_label = last_label
+    ctx.last_variable = last_variable
+    ctx.ctor_mem_size = ctor_mem_size
+    ctx.immutables_len = immutables_len
+
+    return ctx
@@ -23,7 +23,7 @@ from vyper.venom.basicblock import (
 )
 from vyper.venom.context import IRContext, IRFunction
 from vyper.venom.passes import NormalizationPass
-from vyper.venom.stack_model import StackModel
+from vyper.venom.stack_model import MAX_STACK_DEPTH, StackModel
 
 DEBUG_SHOW_COST = False
 if DEBUG_SHOW_COST:
@@ -164,7 +164,7 @@ class VenomCompiler:
 
                 assert self.cfg.is_normalized(), "Non-normalized CFG!"
 
-                self._generate_evm_for_basicblock_r(asm, fn.entry, StackModel())
+                self._generate_evm_for_function(asm, fn)
 
             # TODO make this property on IRFunction
             asm.extend(["_sym__ctor_exit", "JUMPDEST"])
@@ -209,13 +209,17 @@ class VenomCompiler:
     ) -> int:
         if dry_run:
             assert len(assembly) == 0, "Dry run should not work on assembly"
-            stack = stack.copy()
 
         if len(stack_ops) == 0:
             return 0
 
         assert len(stack_ops) == len(set(stack_ops))  # precondition
 
+        # on a dry run, reorder `stack` in place and restore it afterwards
+        # instead of working on a copy of it. `undo` records the previous
+        # contents of every stack slot which gets modified.
+        undo: list[tuple[int, IROperand]] = []
+
         cost = 0
         for i, op in enumerate(stack_ops):
             final_stack_depth = -(len(stack_ops) - i - 1)
@@ -228,6 +232,12 @@ class VenomCompiler:
                 continue
 
             to_swap = stack.peek(final_stack_depth)
+            if dry_run:
+                undo.append((final_stack_depth, to_swap))
+                undo.append((depth, stack.peek(depth)))
+                if depth != 0 and final_stack_depth != 0:
+                    undo.append((0, stack.peek(0)))
+
             if self.dfg.are_equivalent(op, to_swap):
                 # perform a "virtual" swap
                 stack.poke(final_stack_depth, op)
@@ -239,6 +249,9 @@ class VenomCompiler:
 
         assert stack._stack[-len(stack_ops) :] == stack_ops, (stack, stack_ops)
 
+        for depth, op in reversed(undo):
+            stack.poke(depth, op)
+
         return cost
 
     def _emit_input_operands(
@@ -323,11 +336,32 @@ class VenomCompiler:
                 self.swap(asm, stack, depth)
             self.pop(asm, stack)
 
-    def _generate_evm_for_basicblock_r(
+    def _generate_evm_for_function(self, asm: list, fn: IRFunction) -> None:
+        # depth-first traversal of the CFG, in the same order as a recursive
+        # traversal, but with an explicit worklist so that large functions
+        # do not run into the recursion limit.
+        worklist: list[tuple[IRBasicBlock, StackModel]] = [(fn.entry, StackModel())]
+        while len(worklist) > 0:
+            basicblock, stack = worklist.pop()
+            if basicblock in self.visited_basicblocks:
+                continue
+
+            self._generate_evm_for_basicblock(asm, basicblock, stack)
+
+            # every successor starts with the output stack of this block.
+            # the successors are popped off the worklist in cfg_out order,
+            # so the last one can take the stack without copying it.
+            out_bbs = [
+                bb for bb in self.cfg.cfg_out(basicblock) if bb not in self.visited_basicblocks
+            ]
+            for i, bb in enumerate(reversed(out_bbs)):
+                if i > 0:
+                    stack = stack.copy()
+                worklist.append((bb, stack))
+
+    def _generate_evm_for_basicblock(
         self, asm: list, basicblock: IRBasicBlock, stack: StackModel
     ) -> None:
-        if basicblock in self.visited_basicblocks:
-            return
         self.visited_basicblocks.add(basicblock)
 
         if DEBUG_SHOW_COST:
@@ -363,9 +397,6 @@ class VenomCompiler:
 
         ref.extend(asm)
 
-        for bb in self.cfg.cfg_out(basicblock):
-            self._generate_evm_for_basicblock_r(ref, bb, stack.copy())
-
     # pop values from stack at entry to bb
     # note this produces the same result(!) no matter which basic block
     # we enter from in the CFG.
@@ -401,7 +432,7 @@ class VenomCompiler:
         # Step 1: Apply instruction special stack manipulations
 
         if opcode in ["jmp", "djmp", "jnz", "invoke"]:
-            operands = list(inst.get_non_label_operands())
+            operands = inst.get_non_label_operands()
 
         elif opcode in ("alloca", "palloca", "calloca"):
             assert len(inst.operands) == 3, inst
@@ -432,7 +463,7 @@ class VenomCompiler:
 
         if opcode == "phi":
             ret = inst.get_outputs()[0]
-            phis = list(inst.get_input_variables())
+            phis = inst.get_input_variables()
             depth = stack.get_phi_depth(phis)
             # collapse the arguments to the phi node in the stack.
             # example, for `%56 = %label1 %13 %label2 %14`, we will
@@ -658,13 +689,13 @@ class VenomCompiler:
 
 def _evm_swap_for(depth: int) -> str:
     swap_idx = -depth
-    if not (1 <= swap_idx <= 16):
+    if not (1 <= swap_idx <= MAX_STACK_DEPTH):
         raise StackTooDeep(f"Unsupported swap depth {swap_idx}")
     return f"SWAP{swap_idx}"
 
 
 def _evm_dup_for(depth: int) -> str:
     dup_idx = 1 - depth
-    if not (1 <= dup_idx <= 16):
+    if not (1 <= dup_idx <= MAX_STACK_DEPTH):
         raise StackTooDeep(f"Unsupported dup depth {dup_idx}")
     return f"DUP{dup_idx}"
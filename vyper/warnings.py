@@ -1,6 +1,6 @@
 import contextlib
 import warnings
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from vyper.exceptions import _BaseVyperException
 
@@ -44,6 +44,37 @@ def set_warnings_filter(warnings_control: Optional[str]):
     warnings.simplefilter(warnings_filter, category=VyperWarning)  # type: ignore[arg-type]
 
 
+# a warning which has been captured so that it can be re-emitted later,
+# potentially in a different process. note: the warning is stored as
+# (category, formatted message) since the warning object itself may hold
+# references to AST nodes.
+CapturedWarning = tuple[Any, str]
+
+
+@contextlib.contextmanager
+def capture_warnings() -> Iterator[list[CapturedWarning]]:
+    """
+    Record all warnings emitted within the context manager, regardless of
+    the current warnings filter. The captured warnings can be emitted later
+    (subject to the warnings filter at that point) with `replay_warnings()`.
+    """
+    ret: list[CapturedWarning] = []
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            yield ret
+        finally:
+            ret.extend((type(w.message), str(w.message)) for w in caught)
+
+
+def replay_warnings(captured: list[CapturedWarning]) -> None:
+    for category, message in captured:
+        if issubclass(category, VyperWarning):
+            warnings.warn(category(message), stacklevel=2)
+        else:
+            warnings.warn(message, category, stacklevel=2)
+
+
 class ContractSizeLimit(VyperWarning):
     """
     Warn if past the EIP-170 size limit